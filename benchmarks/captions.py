@@ -0,0 +1,104 @@
+"""
+Caption rendering probe, run in fresh interpreters by benchmarks/run.py.
+
+Types long Gemini-style answers into an offscreen window two ways: the old
+way (QLabel.setText(text + ch) per character on 28/80/120 ms steps) and with
+CaptionLabel following a simulated playback position on its single timer.
+
+    python benchmarks/captions.py <chars> <legacy|paced> <first update> <updates>
+
+measures one window of updates, resuming from the caption state the earlier
+windows left, prints one JSON line and exits without Qt teardown. Each
+process makes a bounded number of Qt calls, so a binding that leaks a
+reference per call (PySide6 6.12.0 leaks None's on CPython < 3.12) cannot
+run it out of references however long the caption is.
+"""
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QApplication, QLabel, QVBoxLayout, QWidget
+
+from ui.caption_label import CaptionLabel
+
+SENTENCE = ("Black holes form when massive stars collapse, and their gravity is so strong "
+            "that not even light can escape once it crosses the event horizon. ")
+SPOKEN_CHARS_PER_S = 15.0  # gTTS speaks roughly this fast
+
+
+def _window(label):
+    window = QWidget()
+    window.setFixedSize(440, 540)
+    layout = QVBoxLayout(window)
+    layout.addWidget(label, alignment=Qt.AlignCenter)
+    label.setMaximumWidth(408)
+    window.show()
+    return window
+
+
+def legacy(app, text: str, first: int, count: int) -> dict:
+    """The old typing animation: one setText of the whole prefix per character"""
+    label = QLabel(text[:first])
+    label.setWordWrap(True)
+    label.setStyleSheet("color: white; background: rgba(60, 0, 100, 130); border-radius: 10px; "
+                        "font-size: 14px; font-weight: bold; padding: 8px 20px; margin-top: 10px;")
+    window = _window(label)
+    app.processEvents()
+    updates = []
+    cpu = time.process_time()
+    for ch in text[first:first + count]:
+        start = time.perf_counter()
+        label.setText(label.text() + ch)
+        app.processEvents()
+        updates.append(time.perf_counter() - start)
+    cpu = time.process_time() - cpu
+    window.close()
+    return {"updates": updates, "cpu_s": cpu, "done": first + count >= len(text)}
+
+
+def paced(app, text: str, first: int, count: int) -> dict:
+    """CaptionLabel following a playback clock, one tick per 33 ms of simulated audio"""
+    label = CaptionLabel("")
+    window = _window(label)
+    duration = len(text) / SPOKEN_CHARS_PER_S
+    clock = {"now": 0.0}
+    label.progress_source = lambda since: min(1.0, clock["now"] / duration)
+    label.show_caption(text, paced=True)
+    label.timer.stop()  # ticks are driven by hand against the simulated clock
+    app.processEvents()
+    if first:
+        # Replay the previous window's last two ticks, unmeasured: the first
+        # paints of a fresh window are cold and would pollute the tail
+        for tick in (first - 2, first - 1):
+            clock["now"] = max(0, tick) * label.TICK_MS / 1000
+            label._tick()
+            app.processEvents()
+        clock["now"] += label.TICK_MS / 1000
+    updates = []
+    cpu = time.process_time()
+    while len(updates) < count and (label.text() != text or label._revealed < len(text)):
+        start = time.perf_counter()
+        label._tick()
+        app.processEvents()
+        updates.append(time.perf_counter() - start)
+        clock["now"] += label.TICK_MS / 1000
+    cpu = time.process_time() - cpu
+    done = label.text() == text and label._revealed >= len(text)
+    window.close()
+    return {"updates": updates, "cpu_s": cpu, "done": done}
+
+
+def main(chars: int, mode: str, first: int, count: int):
+    app = QApplication(sys.argv)
+    text = (SENTENCE * (chars // len(SENTENCE) + 1))[:chars]
+    print(json.dumps({"legacy": legacy, "paced": paced}[mode](app, text, first, count)), flush=True)
+    os._exit(0)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]), sys.argv[2], int(sys.argv[3]), int(sys.argv[4]))
@@ -0,0 +1,79 @@
+"""
+Labelled command corpora: the routing and app-index benchmarks score against
+them and tests/ checks every entry.
+"""
+
+# (command, expected intent, expected target)
+GOLDEN_INTENTS = [
+    ("open chrome", "launch", "chrome"),
+    ("please open google chrome", "launch", "chrome"),
+    ("launch vs code", "launch", "vs code"),
+    ("start the calculator", "launch", "calculator"),
+    ("open youtube", "launch", "youtube"),
+    ("close notepad", "close", "notepad"),
+    ("firefox band karo", "close", "firefox"),
+    ("stop", "stop", None),
+    ("who are you", "identity", None),
+    ("tum kaun ho", "identity", None),
+    ("restart the story from the beginning", None, None),
+    ("what is the basic idea of gravity", None, None),
+    ("tell me about the time machine movie", None, None),
+    ("search for cats on youtube", "search", "youtube"),
+    ("please look up the weather in delhi", "search", None),
+    ("i want to search lofi music on youtube", "search", "youtube"),
+    ("explain how binary search works", None, None),
+    ("what is search engine optimization", None, None),
+    ("what is the time complexity of binary search", None, None),
+    ("chrome kholo", "launch", "chrome"),
+    ("okay smriti stop", "stop", None),
+    ("what does exit velocity mean", None, None),
+    ("how do i run a marathon", None, None),
+    ("should i start a business", None, None),
+]
+
+# (command, keyword kind): full transcripts, as the listener sees them
+GOLDEN_KEYWORDS = [
+    ("stop", "stop"),
+    ("ruko ruko", "stop"),
+    ("close", "shutdown"),
+    ("close yourself", "shutdown"),
+    ("shut down smriti", "shutdown"),
+    ("band karo", "shutdown"),
+    ("goodbye", "shutdown"),
+    ("close notepad", None),
+    ("close spotify", None),
+    ("please close the zoom window", None),
+    ("firefox band karo", None),
+    ("exit chrome", None),
+    ("tell me about the closing ceremony", None),
+]
+
+# (command, answered locally?)
+GOLDEN_SKILLS = [
+    ("what is 5 plus 7", True),
+    ("what time is it in tokyo", True),
+    ("convert 5 km to miles", True),
+    ("what is today's date", True),
+    ("how many cpu cores do i have", True),
+    ("tell me about the time machine movie", False),
+    ("write a poem about rain", False),
+    ("who is the prime minister of india", False),
+    # near misses that share a skill's words but are questions for Gemini
+    ("what is the date of diwali this year", False),
+    ("what day is christmas", False),
+    ("what day was i born", False),
+    ("what is the difference between 5g and 4g", False),
+    ("what is the time complexity of quicksort", False),
+    ("what is the time signature of this song", False),
+    ("explain the operating system", False),
+    ("who won 3 - 1 yesterday", False),
+]
+
+
+# Command-line tools on a typical $PATH, as (name, directory)
+PATH_TOOLS = [("zic", "/usr/sbin"), ("reboot", "/usr/sbin"), ("poweroff", "/usr/sbin"), ("halt", "/usr/sbin"),
+              ("sum", "/usr/bin"), ("cut", "/usr/bin"), ("test", "/usr/bin"), ("yes", "/usr/bin"),
+              ("decode", "/usr/bin"), ("sort", "/usr/bin"), ("top", "/usr/bin"), ("make", "/usr/bin")]
+# Spoken after "open"/"run"/"start" but not an installed app: each must find nothing
+NOT_APPS = ["music", "zoom", "code", "reboot", "poweroff", "halt", "yes", "a test", "the test",
+            "the weather", "my homework", "a song", "the door", "some music", "a timer", "the news"]
@@ -0,0 +1,192 @@
+"""
+Local stand-ins for the microphone, the Gemini API and gTTS.
+
+Nothing here touches the network or audio hardware: the microphone is a
+scripted PCM source, Gemini is a small HTTP server speaking the REST
+generateContent / streamGenerateContent protocol, and speech synthesis and
+playback take a fixed, scaled amount of time.
+"""
+import json
+import math
+import queue
+import random
+import threading
+import time
+from array import array
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import speech_recognition as sr
+
+from core.speech_backends import SpeechBackend, RecognitionResult
+
+SAMPLE_RATE = 16000
+FRAME_MS = 30
+
+
+class ScriptedMicSource:
+    """
+    CaptureEngine source that plays low noise, plus a tone burst for every
+    say() call. realtime=True paces frames like a real microphone.
+    """
+
+    def __init__(self, sample_rate: int = SAMPLE_RATE, frame_ms: int = FRAME_MS, realtime: bool = True):
+        self.sample_rate = sample_rate
+        self.frame_samples = sample_rate * frame_ms // 1000
+        self.realtime = realtime
+        self._pending = queue.Queue()
+        self._tone_left = 0
+        self._phase = 0
+        self._closed = False
+        rng = random.Random(7)
+        self._silence = array("h", (rng.randint(-20, 20) for _ in range(self.frame_samples))).tobytes()
+
+    def say(self, seconds: float):
+        """Queue one utterance of speech-level audio"""
+        self._pending.put(int(seconds * 1000 / (self.frame_samples * 1000 / self.sample_rate)))
+
+    def _tone_frame(self) -> bytes:
+        step = 2 * math.pi * 220 / self.sample_rate
+        frame = array("h", (int(3000 * math.sin((self._phase + i) * step)) for i in range(self.frame_samples)))
+        self._phase += self.frame_samples
+        return frame.tobytes()
+
+    def read(self) -> bytes:
+        if self._closed:
+            return b""
+        if self.realtime:
+            time.sleep(self.frame_samples / self.sample_rate)
+        if self._tone_left == 0 and not self._pending.empty():
+            self._tone_left = self._pending.get()
+        if self._tone_left > 0:
+            self._tone_left -= 1
+            return self._tone_frame()
+        return self._silence
+
+    def close(self):
+        self._closed = True
+
+
+class ScriptedBackend(SpeechBackend):
+    """Recognizer that returns the scripted transcripts in order"""
+
+    name = "scripted"
+
+    def __init__(self, latency_s: float = 0.05):
+        self.latency_s = latency_s
+        self.transcripts = queue.Queue()
+
+    def expect(self, text: str):
+        self.transcripts.put(text)
+
+    def recognize(self, audio: sr.AudioData) -> RecognitionResult:
+        start = time.perf_counter()
+        time.sleep(self.latency_s)
+        try:
+            text = self.transcripts.get_nowait()
+        except queue.Empty:
+            raise sr.UnknownValueError()
+        return RecognitionResult(text, 0.95, self.name, time.perf_counter() - start)
+
+
+class GeminiStub:
+    """
+    HTTP server answering generateContent and streamGenerateContent like the
+    Gemini REST API. The reply is two sentences derived from the prompt;
+    first_token_s and chunk_s shape the latency.
+    """
+
+    def __init__(self, first_token_s: float = 0.3, chunk_s: float = 0.1):
+        self.first_token_s = first_token_s
+        self.chunk_s = chunk_s
+        self.requests = 0
+        self.connections = set()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                stub.requests += 1
+                stub.connections.add(self.client_address)
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                chunks = stub.reply_chunks(body)
+                time.sleep(stub.first_token_s)
+                if "streamGenerateContent" in self.path:
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Transfer-Encoding", "chunked")
+                    self.end_headers()
+                    for i, text in enumerate(chunks):
+                        if i:
+                            time.sleep(stub.chunk_s)
+                        piece = ("[" if i == 0 else ",") + json.dumps(stub.candidate(text))
+                        self._write_chunk(piece.encode())
+                    self._write_chunk(b"]")
+                    self._write_chunk(b"")
+                else:
+                    time.sleep(stub.chunk_s * (len(chunks) - 1))
+                    out = json.dumps(stub.candidate("".join(chunks))).encode()
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(out)))
+                    self.end_headers()
+                    self.wfile.write(out)
+
+            def _write_chunk(self, data: bytes):
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+                self.wfile.flush()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, name="gemini-stub", daemon=True).start()
+
+    @property
+    def endpoint(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_port}"
+
+    @staticmethod
+    def reply_chunks(body: dict):
+        try:
+            prompt = body["contents"][-1]["parts"][0]["text"]
+        except (KeyError, IndexError, TypeError):
+            prompt = "that"
+        return [f"Here is a short answer about {prompt}. ", "It comes from the local stub server."]
+
+    @staticmethod
+    def candidate(text: str) -> dict:
+        return {"candidates": [{"content": {"role": "model", "parts": [{"text": text}]}, "finishReason": 1}]}
+
+    def close(self):
+        self.server.shutdown()
+
+
+class FakeTTS:
+    """Drop-in for gTTS: waits synth_s per call and writes bytes sized to the speech duration"""
+
+    synth_s = 0.08
+    seconds_per_word = 0.04  # 10x faster than real speech keeps benchmarks short
+    bytes_per_second = 16000
+
+    def __init__(self, text: str, lang: str = "en", tld: str = "com", slow: bool = False):
+        self.text = text
+
+    def write_to_fp(self, fp):
+        time.sleep(self.synth_s)
+        duration = len(self.text.split()) * self.seconds_per_word
+        fp.write(b"\0" * max(1, int(duration * self.bytes_per_second)))
+
+
+def fake_play(mp3_source, utterance):
+    """Replacement for VoiceResponder._play: 'plays' for the duration FakeTTS encoded"""
+    try:
+        utterance.trace.mark("first_audio")
+        duration = len(mp3_source) / FakeTTS.bytes_per_second if hasattr(mp3_source, "__len__") \
+            else len(mp3_source.getbuffer()) / FakeTTS.bytes_per_second
+        ends_at = time.perf_counter() + duration
+        while time.perf_counter() < ends_at and not utterance.cancelled:
+            time.sleep(0.005)
+    finally:
+        mp3_source.close()
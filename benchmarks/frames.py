@@ -0,0 +1,99 @@
+"""
+Frame-time probe for the CircularIndicator, run in a fresh interpreter by
+benchmarks/run.py.
+
+Renders `frames` animation ticks into an offscreen image twice: drawing the
+gradients each time, then blitting the cached frames. Then runs the shown
+widget for a few seconds per animation mode and counts timer wakeups,
+repaints and CPU time. Prints one JSON line, then exits without Qt teardown.
+"""
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QEvent, QObject, QRectF, Qt, QTimer
+from PySide6.QtGui import QImage, QPainter
+from PySide6.QtWidgets import QApplication
+
+from ui.circular_indicator import CircularIndicator, STATE_IDLE, STATE_LISTENING
+
+
+class _Counter(QObject):
+    def __init__(self):
+        super().__init__()
+        self.paints = 0
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint:
+            self.paints += 1
+        return False
+
+
+def run_mode(app, seconds: float, state: str = STATE_IDLE, rates: dict = None, hidden: bool = False) -> dict:
+    """Timer wakeups, repaints and CPU time (ms), each per second, of one on-screen indicator"""
+    indicator = CircularIndicator()
+    if rates:
+        indicator.FRAME_RATES = rates
+    indicator.state_source = lambda: state
+    # Stand-in mic level: a slow wobble, like someone talking
+    indicator.level_sources = {STATE_LISTENING: lambda: (time.monotonic() * 3) % 1.0}
+    counter = _Counter()
+    indicator.installEventFilter(counter)
+    ticks = []
+    indicator.timer.timeout.connect(lambda: ticks.append(1))
+    indicator.show()
+    if hidden:
+        indicator.showMinimized()
+    app.processEvents()
+    counter.paints, ticks[:] = 0, []
+    cpu = time.process_time()
+    QTimer.singleShot(int(seconds * 1000), app.quit)
+    app.exec()
+    cpu = time.process_time() - cpu
+    indicator.close()
+    return {"wakeups": round(len(ticks) / seconds, 1), "repaints": round(counter.paints / seconds, 1),
+            "cpu_ms": round(cpu / seconds * 1000, 2)}
+
+
+def main(frames: int):
+    app = QApplication(sys.argv)
+    indicator = CircularIndicator()
+    indicator.set_active(False)
+    target = QImage(indicator.size(), QImage.Format_ARGB32_Premultiplied)
+    rect = QRectF(indicator.rect())
+    phases = [(i * 2.5) % 360.0 for i in range(frames)]
+
+    def frame_times(draw):
+        times = []
+        for phase in phases:
+            start = time.perf_counter()
+            target.fill(Qt.transparent)
+            painter = QPainter(target)
+            draw(painter, phase)
+            painter.end()
+            times.append(time.perf_counter() - start)
+        return times
+
+    direct = frame_times(lambda painter, phase: indicator.draw_orb(painter, rect, phase))
+    for phase in phases:  # fill the cache first; steady state is what runs for hours
+        indicator.frame(phase)
+    cached = frame_times(lambda painter, phase: painter.drawPixmap(0, 0, indicator.frame(phase)))
+    # The old indicator: a fixed 60 FPS timer whatever the state
+    fixed = {state: 60 for state in CircularIndicator.FRAME_RATES}
+    modes = {
+        "fixed_60fps": run_mode(app, 2.0, rates=fixed),
+        "idle": run_mode(app, 2.0),
+        "listening": run_mode(app, 2.0, STATE_LISTENING),
+        "minimized": run_mode(app, 2.0, hidden=True),
+    }
+    print(json.dumps({"direct": direct, "cached": cached, "cached_frames": len(indicator._frames),
+                      "modes": modes}), flush=True)
+    os._exit(0)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 144)
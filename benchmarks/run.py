@@ -0,0 +1,780 @@
+"""
+End-to-end benchmarks for the listen -> brain -> speak loop.
+
+    python -m benchmarks.run                       # full run, writes benchmarks/results/<commit>.json
+    python -m benchmarks.run --quick               # fewer rounds
+    python -m benchmarks.run --baseline old.json   # exit 1 when a metric regressed beyond --tolerance
+    python -m benchmarks.run --output r.json       # write the results somewhere else
+
+The microphone, Gemini and gTTS are replaced by the stand-ins in
+benchmarks/fakes.py before any Smriti module is imported, so results only
+depend on Smriti's own code and are comparable across commits.
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import wave
+
+from benchmarks.corpora import GOLDEN_INTENTS, GOLDEN_KEYWORDS, GOLDEN_SKILLS, NOT_APPS, PATH_TOOLS
+from benchmarks.fakes import FRAME_MS, GeminiStub, ScriptedMicSource, ScriptedBackend, FakeTTS, fake_play
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (command, kind): kind is how the brain should answer it
+CONVERSATION = [
+    ("who are you", "intent"),
+    ("what is 12 times 7", "skill"),
+    ("open notepad", "intent"),
+    ("tell me a fun fact about space", "cloud"),
+    ("convert 10 km to miles", "skill"),
+    ("explain photosynthesis simply", "cloud"),
+    ("close notepad", "intent"),
+    ("what time is it", "skill"),
+    ("who wrote the ramayana", "cloud"),
+    ("what is the capital of japan", "cloud"),
+]
+
+
+def percentiles(values) -> dict:
+    if not values:
+        return {"count": 0}
+    ordered = sorted(values)
+    pick = lambda pct: round(ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))] * 1000, 2)
+    return {"count": len(ordered), "mean_ms": round(statistics.fmean(ordered) * 1000, 2),
+            "p50_ms": pick(50), "p95_ms": pick(95), "p99_ms": pick(99), "max_ms": pick(100)}
+
+
+def rss_mb() -> dict:
+    """Current and peak resident memory (Linux /proc; peak only elsewhere)"""
+    out = {}
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith(("VmRSS", "VmHWM")):
+                    key, value = line.split(":")
+                    out["rss_mb" if key == "VmRSS" else "peak_rss_mb"] = round(int(value.split()[0]) / 1024, 1)
+    except OSError:
+        import resource
+        out["peak_rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    return out
+
+
+class ThreadSampler:
+    """Samples threading.active_count() while a scenario runs"""
+
+    def __init__(self, interval: float = 0.02):
+        self.interval = interval
+        self.samples = []
+        self._running = False
+
+    def __enter__(self):
+        self._running = True
+        self.samples = [threading.active_count()]
+        threading.Thread(target=self._loop, name="bench-thread-sampler", daemon=True).start()
+        return self
+
+    def _loop(self):
+        while self._running:
+            self.samples.append(threading.active_count())
+            time.sleep(self.interval)
+
+    def __exit__(self, *exc):
+        self._running = False
+
+    def report(self) -> dict:
+        return {"threads_peak": max(self.samples), "threads_end": threading.active_count()}
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return "unknown"
+
+
+def install_fakes(stub: GeminiStub, workdir: str):
+    """Environment first: every Smriti module reads its configuration at import"""
+    os.environ.update({
+        "SMRITI_GEMINI_API_KEY": "benchmark",
+        "SMRITI_GEMINI_ENDPOINT": stub.endpoint,
+        "SMRITI_CACHE_DIR": workdir,
+        "SMRITI_TRACE": "jsonl",
+        "SMRITI_TRACE_FILE": os.path.join(workdir, "traces.jsonl"),
+        "SMRITI_QUIET": "1",
+        "SDL_AUDIODRIVER": "dummy",
+        "QT_QPA_PLATFORM": "offscreen",
+    })
+    import core.voice_response as voice_response
+    import core.brain as brain
+
+    voice_response.gTTS = FakeTTS
+    voice_response._responder._play = fake_play
+    # Launching real programs is not part of the benchmark
+    brain.open_application = lambda name: f"Opening {name}."
+    brain.open_website = lambda name: f"Opening {name} website."
+    brain.close_application = lambda name: f"Closing {name}."
+
+
+def bench_startup(launches: int, workdir: str) -> dict:
+    """Fresh interpreters: spawn -> first window paint, and spawn -> all services loaded"""
+    to_window, to_ready = [], []
+    env = dict(os.environ, SMRITI_CACHE_DIR=workdir)
+    for _ in range(launches):
+        spawned = time.time()
+        out = subprocess.run([sys.executable, os.path.join(ROOT, "benchmarks", "startup.py")],
+                             cwd=ROOT, env=env, capture_output=True, text=True, timeout=120)
+        marks = json.loads(out.stdout.strip().splitlines()[-1])
+        to_window.append(marks["window"] - spawned)
+        to_ready.append(marks["ready"] - spawned)
+    return {"time_to_window": percentiles(to_window), "time_to_ready": percentiles(to_ready)}
+
+
+def bench_indicator(frames: int) -> dict:
+    """Orb frame time in a fresh interpreter: gradients every tick vs the cached frames"""
+    out = subprocess.run([sys.executable, os.path.join(ROOT, "benchmarks", "frames.py"), str(frames)],
+                         cwd=ROOT, capture_output=True, text=True, timeout=120)
+    samples = json.loads(out.stdout.strip().splitlines()[-1])
+    return {
+        "frames": frames,
+        "direct": percentiles(samples["direct"]),
+        "cached": percentiles(samples["cached"]),
+        "cached_frames": samples["cached_frames"],
+        "per_second": samples["modes"],
+    }
+
+
+# Updates measured per probe process (see benchmarks/captions.py)
+_CAPTION_WINDOW = {"legacy": 200, "paced": 40}
+
+
+def bench_captions(lengths) -> dict:
+    """Long answers typed into the caption: per-character setText vs the playback-paced renderer"""
+    results = {}
+    for chars in lengths:
+        results[f"{chars}_chars"] = {}
+        for name, window in _CAPTION_WINDOW.items():
+            updates, cpu_s, first, done = [], 0.0, 0, False
+            while not done:
+                out = subprocess.run([sys.executable, os.path.join(ROOT, "benchmarks", "captions.py"),
+                                      str(chars), name, str(first), str(window)],
+                                     cwd=ROOT, capture_output=True, text=True, timeout=300)
+                samples = json.loads(out.stdout.strip().splitlines()[-1])
+                updates += samples["updates"]
+                cpu_s += samples["cpu_s"]
+                first += window
+                done = samples["done"]
+            results[f"{chars}_chars"][name] = {"update": percentiles(updates), "cpu_ms": round(cpu_s * 1000, 1)}
+    return results
+
+
+_APP_WORDS = ["nova", "pixel", "quantum", "cedar", "harbor", "lumen", "vertex", "atlas", "ember", "fjord",
+              "glyph", "kinetic", "mosaic", "nimbus", "orchid", "prism", "quill", "raven", "sierra", "tundra",
+              "photo", "sound", "crystal", "phoenix", "chroma", "cipher", "shadow", "thunder", "whisper", "zephyr"]
+_APP_KINDS = ["editor", "studio", "player", "viewer", "manager", "browser", "calculator", "terminal",
+              "recorder", "mixer", "writer", "designer", "scanner", "tracker", "launcher", "monitor"]
+
+
+def _misspell(name: str, rng) -> str:
+    i = rng.randrange(1, len(name) - 1)
+    return name[:i] + name[i + 1:] if rng.random() < 0.5 else name[:i] + name[i + 1] + name[i] + name[i + 2:]
+
+
+def _sound_alike(name: str) -> str:
+    for a, b in (("ph", "f"), ("c", "k"), ("qu", "kw"), ("y", "i"), ("th", "t")):
+        name = name.replace(a, b)
+    return name
+
+
+def bench_app_index(apps: int, queries: int) -> dict:
+    """
+    Installed-app lookup on a synthetic catalog plus $PATH tools: exact,
+    misspelled and sound-alike names must match, names of nothing installed must not
+    """
+    import random
+    from core.app_index import AppIndex, AppEntry, KIND_DESKTOP, KIND_PATH
+
+    rng = random.Random(11)
+    names = []
+    for first in _APP_WORDS:
+        for second in _APP_WORDS:
+            for kind in _APP_KINDS:
+                if first != second:
+                    names.append(f"{first.title()} {second.title()} {kind.title()}")
+    rng.shuffle(names)
+    names = names[:apps]
+    index = AppIndex(path=os.devnull, roots=[])
+    start = time.perf_counter()
+    tools = [AppEntry(tool, [f"{directory}/{tool}"], KIND_PATH, f"{directory}/{tool}") for tool, directory in PATH_TOOLS]
+    index.set_entries([AppEntry(name, [name.lower().replace(" ", "-")], KIND_DESKTOP, "") for name in names] + tools)
+    build_s = time.perf_counter() - start
+
+    results = {"apps": len(names), "build_ms": round(build_s * 1000, 1)}
+    variants = {"exact": lambda n: n.lower(), "misspelled": lambda n: _misspell(n.lower(), rng),
+                "sound_alike": lambda n: _sound_alike(n.lower())}
+    for kind, variant in variants.items():
+        times, correct = [], 0
+        for name in rng.sample(names, queries):
+            spoken = variant(name)
+            start = time.perf_counter()
+            match = index.find(spoken)
+            times.append(time.perf_counter() - start)
+            correct += match is not None and match.name == name
+        results[kind] = dict(percentiles(times), accuracy=round(correct / queries, 3))
+
+    times, rejected = [], 0
+    for spoken in NOT_APPS:
+        start = time.perf_counter()
+        match = index.find(spoken)
+        times.append(time.perf_counter() - start)
+        rejected += match is None
+    results["not_installed"] = dict(percentiles(times), accuracy=round(rejected / len(NOT_APPS), 3))
+    return results
+
+
+def bench_routing(rounds: int) -> dict:
+    from core.intent_router import route
+    from core.keyword_spotter import command_keyword
+    from core.local_skills import answer_locally
+
+    correct = 0
+    for command, name, target in GOLDEN_INTENTS:
+        intent = route(command)
+        got = (intent.name, intent.target) if intent else (None, None)
+        correct += got == (name, target)
+    skill_correct = sum(bool(answer_locally(c, count=False)) == local for c, local in GOLDEN_SKILLS)
+    keyword_correct = sum((command_keyword(c) or (None,))[0] == kind for c, kind in GOLDEN_KEYWORDS)
+
+    commands = [c for c, _, _ in GOLDEN_INTENTS]
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for command in commands:
+            route(command)
+    route_us = (time.perf_counter() - start) / (rounds * len(commands)) * 1e6
+
+    skill_commands = [c for c, _ in GOLDEN_SKILLS]
+    start = time.perf_counter()
+    for _ in range(max(1, rounds // 10)):
+        for command in skill_commands:
+            answer_locally(command, count=False)
+    skill_us = (time.perf_counter() - start) / (max(1, rounds // 10) * len(skill_commands)) * 1e6
+    return {
+        "intent_accuracy": round(correct / len(GOLDEN_INTENTS), 3),
+        "skill_accuracy": round(skill_correct / len(GOLDEN_SKILLS), 3),
+        "keyword_accuracy": round(keyword_correct / len(GOLDEN_KEYWORDS), 3),
+        "route_us": round(route_us, 2),
+        "local_skill_us": round(skill_us, 2),
+    }
+
+
+def bench_audio(utterances: int) -> dict:
+    """VAD segmentation on scripted audio and echo cancellation on synthetic echo"""
+    from core.audio_capture import CaptureEngine
+    import numpy as np
+    from core.echo_canceller import NLMSFilter
+
+    source = ScriptedMicSource(realtime=False)
+    engine = CaptureEngine(source)
+    # 0.6 s of speech followed by 1 s of quiet, well past the VAD's end-of-speech pause
+    frames = int(1600 / FRAME_MS)
+    for _ in range(frames):
+        engine.process_frame(source.read())  # the room before anyone speaks seeds the noise floor
+    for _ in range(utterances):
+        source.say(0.6)
+        for _ in range(frames):
+            engine.process_frame(source.read())
+    start = time.perf_counter()
+    for _ in range(200):
+        engine.process_frame(source.read())
+    vad_us = (time.perf_counter() - start) / 200 * 1e6
+
+    # Steady background noise (RMS 250) for 30 s with three short utterances on top
+    rng = np.random.default_rng(3)
+    noisy = CaptureEngine(ScriptedMicSource(realtime=False))
+    frame_samples = noisy.source.frame_samples
+    tone = 3000 * np.sin(2 * np.pi * 220 * np.arange(frame_samples) / 16000)
+    speech_frames = {int(at / FRAME_MS * 1000) + i for at in (10, 18, 26) for i in range(int(600 / FRAME_MS))}
+    for n in range(int(30_000 / FRAME_MS)):
+        frame = rng.normal(0, 250, frame_samples) + (tone if n in speech_frames else 0)
+        noisy.process_frame(np.clip(frame, -32768, 32767).astype(np.int16).tobytes())
+    noisy_segments = list(noisy.segments.queue)
+
+    far = rng.normal(0, 3000, 16000 * 3)
+    # Decaying room response, echo about 10 dB below the loudspeaker signal
+    room = np.exp(-np.arange(256) / 40.0) * rng.normal(0, 0.05, 256)
+    echo = np.convolve(far, room)[: far.size] + rng.normal(0, 30, far.size)  # plus a quiet room
+    nlms = NLMSFilter()
+    block = 480
+    residual = []
+    start = time.perf_counter()
+    for i in range(0, far.size - block + 1, block):
+        residual.append(nlms.process(echo[i:i + block], far[i:i + block]))
+    aec_us = (time.perf_counter() - start) / (far.size // block) * 1e6
+    tail = slice(far.size // 2, None)
+    erle = 10 * np.log10(np.mean(echo[tail] ** 2) / (np.mean(np.concatenate(residual)[tail] ** 2) + 1e-9))
+    return {
+        "vad_segments": engine.segments.qsize(),
+        "vad_expected": utterances,
+        "vad_frame_us": round(vad_us, 2),
+        "vad_noisy_segments": len(noisy_segments),
+        "vad_noisy_expected": 3,
+        # Three 0.6 s utterances plus pre-roll and end-of-speech pause: about 4 s in all
+        "vad_noisy_audio_ms": round(sum(segment.duration for segment in noisy_segments) * 1000),
+        "aec_block_us": round(aec_us, 2),
+        "aec_erle_db": round(float(erle), 1),
+    }
+
+
+SPEECH_FIXTURES = os.path.join(ROOT, "benchmarks", "fixtures", "speech")
+
+
+def word_error_rate(reference: str, hypothesis: str):
+    """(word edits, reference words): Levenshtein distance over lowercase words"""
+    ref = re.findall(r"[a-z0-9']+", reference.lower())
+    hyp = re.findall(r"[a-z0-9']+", hypothesis.lower())
+    row = list(range(len(hyp) + 1))
+    for i, word in enumerate(ref, 1):
+        previous, row[0] = row[0], i
+        for j, other in enumerate(hyp, 1):
+            previous, row[j] = row[j], min(row[j] + 1, row[j - 1] + 1, previous + (word != other))
+    return row[-1], len(ref)
+
+
+def _load_clip(path: str):
+    import numpy as np
+
+    with wave.open(path, "rb") as clip:
+        return np.frombuffer(clip.readframes(clip.getnframes()), dtype=np.int16), clip.getframerate()
+
+
+def _with_noise(samples, snr_db: float, rng):
+    import numpy as np
+
+    power = np.mean(samples.astype(np.float64) ** 2)
+    noise = rng.normal(0, (power / 10 ** (snr_db / 10)) ** 0.5, samples.size)
+    return np.clip(samples + noise, -32768, 32767).astype(np.int16)
+
+
+def bench_recognition() -> dict:
+    """WER and latency of each speech backend and policy on the WAV fixtures, clean and at 10 dB SNR"""
+    import numpy as np
+    import speech_recognition as sr
+    from speech_recognition import AudioData
+    from core.speech_backends import GoogleBackend, VoskBackend, RecognitionRouter, POLICIES
+
+    with open(os.path.join(SPEECH_FIXTURES, "transcripts.json"), encoding="utf-8") as f:
+        transcripts = json.load(f)
+    clips = {name: _load_clip(os.path.join(SPEECH_FIXTURES, f"{name}.wav")) for name in transcripts
+             if os.path.exists(os.path.join(SPEECH_FIXTURES, f"{name}.wav"))}
+    if not clips:
+        return {"skipped": "no recordings; run python -m benchmarks.speech_fixtures"}
+    rng = np.random.default_rng(5)
+    conditions = {
+        "clean": {name: AudioData(pcm.tobytes(), rate, 2) for name, (pcm, rate) in clips.items()},
+        "snr_10db": {name: AudioData(_with_noise(pcm, 10, rng).tobytes(), rate, 2)
+                     for name, (pcm, rate) in clips.items()},
+    }
+
+    def score(recognizer) -> dict:
+        results = {}
+        for condition, audio in conditions.items():
+            edits = words = failures = 0
+            latencies = []
+            for name, clip in audio.items():
+                start = time.perf_counter()
+                try:
+                    text = recognizer.recognize(clip).text
+                except (sr.UnknownValueError, sr.RequestError):
+                    text = ""
+                    failures += 1
+                latencies.append(time.perf_counter() - start)
+                e, w = word_error_rate(transcripts[name], text)
+                edits, words = edits + e, words + w
+            results[condition] = dict(percentiles(latencies), wer=round(edits / max(1, words), 3),
+                                      failures=failures)
+        return results
+
+    backends = {"local": VoskBackend(), "remote": GoogleBackend(sr.Recognizer(), language="en-IN")}
+    available = {}
+    probe = next(iter(conditions["clean"].values()))
+    for role, backend in backends.items():
+        if not backend.available():
+            continue
+        try:
+            backend.recognize(probe)
+            available[role] = backend
+        except sr.UnknownValueError:
+            available[role] = backend  # reachable, just didn't understand the probe
+        except Exception:
+            pass
+    results = {"clips": len(clips)}
+    for role, backend in backends.items():
+        results[backend.name] = score(backend) if role in available else {"skipped": "backend unavailable"}
+    if len(available) == 2:
+        for policy in POLICIES:
+            results[policy] = score(RecognitionRouter(available["local"], available["remote"], policy))
+    return results
+
+
+def bench_interrupt() -> dict:
+    """
+    Stop/shutdown fixtures replayed through the capture engine and the keyword
+    spotter, in audio time: speech onset -> keyword spotted, against speech
+    onset -> end of the utterance (the earliest the full recognizer could act).
+    """
+    import numpy as np
+    from core.audio_capture import CaptureEngine
+    from core.keyword_spotter import KeywordSpotter, match_keyword
+    from core.speech_backends import VoskBackend
+
+    with open(os.path.join(SPEECH_FIXTURES, "transcripts.json"), encoding="utf-8") as f:
+        transcripts = json.load(f)
+    clips = {name: _load_clip(os.path.join(SPEECH_FIXTURES, f"{name}.wav")) for name, text in transcripts.items()
+             if match_keyword(text) and os.path.exists(os.path.join(SPEECH_FIXTURES, f"{name}.wav"))}
+    if not clips:
+        return {"skipped": "no recordings; run python -m benchmarks.speech_fixtures"}
+    model = VoskBackend().get_model()
+    if model is None:
+        return {"skipped": "offline model unavailable"}
+
+    class Source:
+        """Frame geometry for CaptureEngine; frames are pushed by hand"""
+
+        def __init__(self, rate):
+            self.sample_rate = rate
+            self.frame_samples = rate * FRAME_MS // 1000
+
+    rng = np.random.default_rng(9)
+    spotted, utterance_end, missed = [], [], 0
+    started = time.perf_counter()
+    frames_fed = 0
+    for pcm, rate in clips.values():
+        engine = CaptureEngine(Source(rate))
+        clock = {"now": 0.0}
+        hits = []
+        spotter = KeywordSpotter(model, rate, lambda kind, phrase: hits.append(clock["now"]),
+                                 clock=lambda: clock["now"])
+        onsets = []
+
+        def mark_onset(frame, speech):
+            if speech and not onsets:
+                onsets.append(clock["now"])
+
+        engine.frame_listeners += [mark_onset, spotter.feed]
+        # A quiet room before and after the words, as when talking over Smriti
+        room = lambda seconds: rng.normal(0, 20, int(rate * seconds)).astype(np.int16)
+        audio = np.concatenate([room(1.0), pcm, room(1.0)])
+        step = engine.source.frame_samples
+        ended = None
+        for i in range(0, audio.size - step + 1, step):
+            clock["now"] += engine.frame_s  # the frame is complete only once its last sample is in
+            engine.process_frame(audio[i:i + step].tobytes())
+            frames_fed += 1
+            if ended is None and engine.segments.qsize():
+                ended = clock["now"]
+        if hits and onsets:
+            spotted.append(hits[0] - onsets[0])
+        else:
+            missed += 1
+        if ended is not None and onsets:
+            utterance_end.append(ended - onsets[0])
+    return {
+        "clips": len(clips),
+        "missed": missed,
+        "onset_to_keyword": percentiles(spotted),
+        "onset_to_utterance_end": percentiles(utterance_end),
+        "frame_us": round((time.perf_counter() - started) / max(1, frames_fed) * 1e6, 2),
+    }
+
+
+def bench_stream(prompts: int) -> dict:
+    """Fresh Gemini answers: first sentence of ask_gemini_stream vs the whole blocking ask_gemini reply"""
+    from core import gemini_connector
+
+    first_sentence, stream_total, blocking = [], [], []
+    for i in range(prompts):
+        start = time.perf_counter()
+        for n, _ in enumerate(gemini_connector.ask_gemini_stream(f"streamed benchmark question {i}",
+                                                                   on_finish=lambda *args: None)):
+            if n == 0:
+                first_sentence.append(time.perf_counter() - start)
+        stream_total.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        gemini_connector.ask_gemini(f"blocking benchmark question {i}")
+        blocking.append(time.perf_counter() - start)
+    gemini_connector.reset_conversation()
+    return {
+        "stream_first_sentence": percentiles(first_sentence),
+        "stream_total": percentiles(stream_total),
+        "blocking_reply": percentiles(blocking),
+    }
+
+
+def bench_playback(clips: int) -> dict:
+    """
+    The real VoiceResponder._play on pygame's sample mp3 (dummy audio driver):
+    call to first_audio, and the whole call, with and without playback listeners
+    """
+    import pygame
+    from core import voice_response
+    from core.tracing import Trace
+
+    sample = os.path.join(os.path.dirname(pygame.__file__), "examples", "data", "house_lo.mp3")
+    if not os.path.exists(sample):
+        return {"skipped": "pygame sample mp3 not installed"}
+    with open(sample, "rb") as f:
+        mp3 = f.read()
+    responder = voice_response._responder
+    installed = responder.playback_listeners
+    results = {}
+    try:
+        for name, listeners in (("no_listeners", []), ("meter", [responder.meter])):
+            responder.playback_listeners = listeners
+            to_audio, calls = [], []
+            for _ in range(clips):
+                trace = Trace(None, 0, "playback")
+                utterance = voice_response.Utterance(iter(()), voice_response.PRIORITY_NORMAL,
+                                                     voice_response.CancelToken(), lambda: None, trace)
+                utterance.token.cancel()  # return as soon as playback has started and listeners are fed
+                start = time.time()
+                voice_response.VoiceResponder._play(responder, io.BytesIO(mp3), utterance)
+                calls.append(time.time() - start)
+                to_audio.append(trace.marks["first_audio"] - start)
+            results[name] = {"call_to_first_audio": percentiles(to_audio), "call": percentiles(calls)}
+    finally:
+        responder.playback_listeners = installed
+    return results
+
+
+def bench_brain(rounds: int, stub: GeminiStub) -> dict:
+    """process_command over the scripted conversation (first round cold, later rounds hit the caches)"""
+    from core.brain import process_command
+
+    by_kind = {}
+    cold, warm = [], []
+    requests_before = stub.requests
+    with ThreadSampler() as threads:
+        start = time.perf_counter()
+        for round_no in range(rounds):
+            for command, kind in CONVERSATION:
+                t0 = time.perf_counter()
+                process_command(command, speak_out=False)
+                elapsed = time.perf_counter() - t0
+                by_kind.setdefault(kind, []).append(elapsed)
+                (cold if round_no == 0 else warm).append(elapsed)
+        total = time.perf_counter() - start
+    result = {
+        "commands_per_s": round(rounds * len(CONVERSATION) / total, 2),
+        "latency_cold": percentiles(cold),
+        "latency_warm": percentiles(warm),
+        "latency_by_kind": {kind: percentiles(values) for kind, values in by_kind.items()},
+        "model_requests": stub.requests - requests_before,
+    }
+    result.update(threads.report())
+    return result
+
+
+def bench_listener(utterances: int, backend: ScriptedBackend) -> dict:
+    """Scripted speech through SmritiListener: end of speech -> first audio -> end of playback"""
+    from PySide6.QtCore import QCoreApplication, QObject, Signal
+    from core import voice_recognition
+    from core.audio_capture import CaptureEngine
+    from core.tracing import tracer
+    from ui.main_window import SmritiListener
+
+    class Window(QObject):
+        captionSignal = Signal(str)
+
+        def close(self):
+            pass
+
+    # Cold answers: the brain scenario already filled the response cache with the same prompts
+    from core import gemini_connector
+    if gemini_connector._cache:
+        gemini_connector._cache.clear()
+
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+    source = ScriptedMicSource(realtime=True)
+    engine = CaptureEngine(source)
+    voice_recognition.set_capture_engine(engine)
+    engine.start()
+    voice_recognition.router.local = backend
+    voice_recognition.router.remote = backend
+
+    window = Window()
+    listener = SmritiListener(window)
+    listener.set_mic_active(True)
+    listener.start()
+
+    response, playback, timeouts = [], [], 0
+    commands = [c for c, kind in CONVERSATION if kind != "intent" or c == "who are you"]
+    try:
+        with ThreadSampler() as threads:
+            start = time.perf_counter()
+            for i in range(utterances):
+                command = commands[i % len(commands)]
+                finished_before = len(tracer.recent)
+                backend.expect(command)
+                source.say(0.6)
+                deadline = time.time() + 20
+                while len(tracer.recent) == finished_before and time.time() < deadline:
+                    app.processEvents()
+                    time.sleep(0.01)
+                if len(tracer.recent) == finished_before:
+                    timeouts += 1
+                    continue
+                trace = tracer.recent[-1]
+                speech_end = max((end for name, _, end, _ in trace.spans if name == "capture"), default=trace.start)
+                if "first_audio" in trace.marks:
+                    response.append(trace.marks["first_audio"] - speech_end)
+                playback.append(trace.marks.get("playback_end", trace.end_time) - speech_end)
+            total = time.perf_counter() - start
+    finally:
+        # A QThread destroyed while running aborts the whole process
+        listener.stop()
+        engine.stop()
+        listener.wait()
+
+    result = {
+        "utterances": utterances,
+        "timeouts": timeouts,
+        "utterances_per_min": round(60 * (utterances - timeouts) / total, 2),
+        "speech_end_to_first_audio": percentiles(response),
+        "speech_end_to_playback_end": percentiles(playback),
+        "stages": tracer.summary(),
+    }
+    result.update(threads.report())
+    return result
+
+
+def bench_burst(commands: int) -> dict:
+    """Typed commands faster than replies finish: superseded work and time to the last reply"""
+    from core.command_pipeline import get_pipeline
+
+    pipeline = get_pipeline()
+    before = pipeline.stats()
+    start = time.perf_counter()
+    futures = []
+    for i in range(commands):
+        futures.append(pipeline.submit(f"tell me something interesting number {i}"))
+        time.sleep(0.05)
+    futures[-1].result(timeout=30)
+    last = time.perf_counter() - start
+    after = pipeline.stats()
+    return {
+        "commands": commands,
+        "time_to_last_reply_ms": round(last * 1000, 1),
+        "superseded": after["superseded"] - before["superseded"],
+        "cloud_calls": after["cloud_calls"] - before["cloud_calls"],
+        "peak_cloud_calls": after["peak_cloud_calls"],
+    }
+
+
+def run(args) -> dict:
+    stub = GeminiStub(first_token_s=args.model_latency, chunk_s=args.model_latency / 3)
+    with tempfile.TemporaryDirectory(prefix="smriti-bench-") as workdir:
+        install_fakes(stub, workdir)
+        backend = ScriptedBackend()
+        rounds = 2 if args.quick else 5
+        results = {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "config": {"quick": args.quick, "model_latency_s": args.model_latency},
+        }
+        results["startup"] = bench_startup(3 if args.quick else 10, workdir)
+        results["indicator"] = bench_indicator(72 if args.quick else 144)
+        results["captions"] = bench_captions((400,) if args.quick else (400, 1200, 2400))
+        results["app_index"] = bench_app_index(5000, 100 if args.quick else 500)
+        results["routing"] = bench_routing(200 if args.quick else 2000)
+        results["audio"] = bench_audio(5 if args.quick else 20)
+        results["recognition"] = bench_recognition()
+        results["interrupt"] = bench_interrupt()
+        results["stream"] = bench_stream(5 if args.quick else 20)
+        results["playback"] = bench_playback(5 if args.quick else 20)
+        results["brain"] = bench_brain(rounds, stub)
+        results["listener"] = bench_listener(4 if args.quick else 10, backend)
+        results["burst"] = bench_burst(5 if args.quick else 10)
+        results["gemini_connections"] = len(stub.connections)
+        results["memory"] = rss_mb()
+        # Let speech still queued from the burst finish before its cache directory goes away
+        from core.voice_response import stop, is_speaking
+        stop()
+        while is_speaking():
+            time.sleep(0.01)
+    stub.close()
+    return results
+
+
+def _flatten(data, prefix=""):
+    for key, value in data.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            yield from _flatten(value, name + ".")
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            yield name, value
+
+
+# Differences below these are timer noise, whatever the relative change
+_ABSOLUTE_SLACK = {"_ms": 1.0, "_us": 2.0, "_mb": 5.0}
+
+
+def compare(current: dict, baseline: dict, tolerance: float):
+    """Regressions beyond tolerance: *_ms/_us/_mb/wer grow, *_per_s/_per_min/accuracy/erle shrink"""
+    old = dict(_flatten(baseline))
+    regressions = []
+    for name, value in _flatten(current):
+        before = old.get(name)
+        if not before:
+            continue
+        leaf = name.rsplit(".", 1)[-1]
+        slack = next((v for suffix, v in _ABSOLUTE_SLACK.items() if leaf.endswith(suffix)), None)
+        if slack is not None:
+            if value > before * (1 + tolerance) and value - before > slack:
+                regressions.append((name, before, value))
+        elif leaf.endswith(("_per_s", "_per_min", "accuracy", "erle_db")) and value < before * (1 - tolerance):
+            regressions.append((name, before, value))
+        elif leaf == "wer" and value > before * (1 + tolerance):
+            regressions.append((name, before, value))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Smriti end-to-end benchmarks")
+    parser.add_argument("--quick", action="store_true", help="fewer rounds")
+    parser.add_argument("--model-latency", type=float, default=0.3, help="stub time to first token (s)")
+    parser.add_argument("--output", help="result file (default benchmarks/results/<commit>.json)")
+    parser.add_argument("--baseline", help="earlier result file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative slowdown")
+    args = parser.parse_args(argv)
+
+    results = run(args)
+    output = args.output or os.path.join(ROOT, "benchmarks", "results", f"{results['commit']}.json")
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(json.dumps(results, indent=2))
+    print(f"📁 Results written to {output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for name, before, after in regressions:
+            print(f"📉 {name}: {before} -> {after}")
+        if regressions:
+            sys.exit(1)
+        print("✅ No regressions")
+
+
+if __name__ == "__main__":
+    main()
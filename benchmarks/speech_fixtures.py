@@ -0,0 +1,86 @@
+"""
+Builds the WAV fixtures for the recognition benchmark in benchmarks/run.py.
+
+    python -m benchmarks.speech_fixtures            # synthesize each line with gTTS (needs network)
+    python -m benchmarks.speech_fixtures --record   # read each line into the microphone instead
+
+Writes benchmarks/fixtures/speech/<name>.wav (16 kHz mono 16-bit) for every
+entry of transcripts.json that has no recording yet; --force redoes them all.
+"""
+import argparse
+import io
+import json
+import os
+import sys
+import time
+import wave
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "speech")
+SAMPLE_RATE = 16000
+
+
+def load_transcripts() -> dict:
+    with open(os.path.join(FIXTURES, "transcripts.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_wav(path: str, pcm: bytes):
+    with wave.open(path, "wb") as out:
+        out.setnchannels(1)
+        out.setsampwidth(2)
+        out.setframerate(SAMPLE_RATE)
+        out.writeframes(pcm)
+
+
+def synthesize(text: str) -> bytes:
+    """gTTS mp3 decoded to 16 kHz mono PCM by pygame's mixer"""
+    from gtts import gTTS
+    import pygame
+
+    if not pygame.mixer.get_init():
+        pygame.mixer.init(frequency=SAMPLE_RATE, size=-16, channels=1)
+    mp3 = io.BytesIO()
+    gTTS(text, lang="en", tld="co.in").write_to_fp(mp3)
+    mp3.seek(0)
+    return pygame.mixer.Sound(mp3).get_raw()
+
+
+def record(text: str) -> bytes:
+    """One utterance from the microphone, cut by the capture engine's VAD"""
+    from core.audio_capture import CaptureEngine, PyAudioSource
+
+    engine = CaptureEngine(PyAudioSource(sample_rate=SAMPLE_RATE))
+    engine.start()
+    try:
+        time.sleep(0.6)  # let the noise floor settle before prompting
+        print(f'🎙️ Say: "{text}"')
+        segment = engine.next_segment(timeout=10)
+    finally:
+        engine.stop()
+    if segment is None:
+        raise RuntimeError("nothing was heard")
+    return segment.pcm
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the speech recognition fixtures")
+    parser.add_argument("--record", action="store_true", help="record from the microphone instead of gTTS")
+    parser.add_argument("--force", action="store_true", help="replace existing recordings")
+    args = parser.parse_args(argv)
+
+    make = record if args.record else synthesize
+    for name, text in load_transcripts().items():
+        path = os.path.join(FIXTURES, f"{name}.wav")
+        if os.path.exists(path) and not args.force:
+            continue
+        try:
+            write_wav(path, make(text))
+            print(f"✅ {name}.wav")
+        except Exception as e:
+            print(f"⚠️ {name}: {e}")
+
+
+if __name__ == "__main__":
+    main()
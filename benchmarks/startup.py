@@ -0,0 +1,52 @@
+"""
+Cold-start probe, run in a fresh interpreter by benchmarks/run.py.
+
+Prints one JSON line with wall-clock timestamps of the window's first paint
+and of every startup service having loaded, then exits.
+"""
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from PySide6.QtCore import QEvent, QObject
+from PySide6.QtWidgets import QApplication
+
+from ui.main_window import SmritiWindow
+
+
+class _FirstPaint(QObject):
+    def __init__(self, marks):
+        super().__init__()
+        self.marks = marks
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint:
+            self.marks.setdefault("window", time.time())
+        return False
+
+
+def main():
+    marks = {}
+    app = QApplication(sys.argv)
+    window = SmritiWindow()
+    paint_filter = _FirstPaint(marks)
+    window.installEventFilter(paint_filter)
+
+    def ready():
+        marks["ready"] = time.time()
+        print(json.dumps(marks), flush=True)
+        # Skip teardown: background threads (prewarm, listener) are not part of the measurement
+        os._exit(0)
+
+    window.servicesReady.connect(ready)
+    window.show()
+    app.exec()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,404 @@
+import json
+import os
+import re
+import shlex
+import sys
+import threading
+import time
+from difflib import SequenceMatcher
+
+from core.intent_router import tokenize
+from core.tracing import log
+
+CACHE_DIR = os.getenv("SMRITI_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".smriti"))
+INDEX_FILE = os.path.join(CACHE_DIR, "app_index.json")
+INDEX_VERSION = 1
+
+# Scan sources, best first: a .desktop "Calculator" beats a bare "gnome-calculator" on PATH
+KIND_DESKTOP = "desktop"
+KIND_START_MENU = "start_menu"
+KIND_MAC_APP = "mac_app"
+KIND_PATH = "path"
+_KIND_RANK = {KIND_DESKTOP: 0, KIND_START_MENU: 0, KIND_MAC_APP: 0, KIND_PATH: 1}
+
+_FIELD_CODE = re.compile(r"%[fFuUdDnNickvm]")
+
+# $PATH holds every command-line tool, not only apps: these are never launched by voice
+_PATH_DENYLIST = {
+    "reboot", "poweroff", "halt", "shutdown", "init", "telinit", "systemctl", "loginctl",
+    "kill", "killall", "pkill", "xkill", "rm", "rmdir", "shred", "dd", "mkswap", "swapon", "swapoff",
+    "fdisk", "parted", "mount", "umount", "sudo", "su", "doas", "pkexec", "passwd", "chmod", "chown",
+    "yes", "test", "[", "true", "false", "sleep", "nohup", "env", "timeout", "watch", "xargs",
+    "cron", "crond", "atd", "sshd", "udevd", "dbus-daemon",
+}
+_PATH_DENY_PREFIXES = ("systemd-", "mkfs", "fsck", "dbus-")
+_SYSTEM_BIN_DIRS = {"sbin"}  # /sbin, /usr/sbin, /usr/local/sbin: administration and daemons
+
+
+def _metaphone(word: str) -> str:
+    """Simplified Metaphone: maps a word to consonant sounds"""
+    if not word.isalpha():
+        return word
+    for prefix in ("kn", "gn", "pn", "ae", "wr"):
+        if word.startswith(prefix):
+            word = word[1:]
+            break
+    if word.startswith("x"):
+        word = "s" + word[1:]
+    if word.startswith("wh"):
+        word = "w" + word[2:]
+    for pattern, sound in _METAPHONE_RULES:
+        word = pattern.sub(sound, word)
+    key = word[:1] + re.sub(r"[aeiou]", "", word[1:])
+    return re.sub(r"(.)\1+", r"\1", key)
+
+
+_METAPHONE_RULES = [(re.compile(p), s) for p, s in (
+    (r"mb$", "m"), (r"ph", "f"), (r"ck", "k"), (r"sch", "sk"), (r"tch", "x"), (r"ch", "x"),
+    (r"sh", "x"), (r"th", "0"), (r"dg(?=[eiy])", "j"), (r"gh(?![aeiou])", ""), (r"gn", "n"),
+    (r"c(?=[iey])", "s"), (r"c", "k"), (r"q", "k"), (r"x", "ks"), (r"z", "s"), (r"v", "f"),
+    (r"g(?=[iey])", "j"), (r"d", "t"), (r"w(?![aeiou])", ""), (r"y(?![aeiou])", ""),
+    (r"(?<=[aeiou])h(?![aeiou])", ""), (r"(?<=[cgpst])h", ""),
+)]
+
+
+def phonetic_key(text: str) -> str:
+    """Sound-alike key: "kalkulator" and "calculator" share one"""
+    return " ".join(_metaphone(word) for word in tokenize(text))
+
+
+def normalize_name(text: str) -> str:
+    return " ".join(tokenize(text))
+
+
+class AppEntry:
+    """One launchable application"""
+
+    __slots__ = ("name", "argv", "kind", "source")
+
+    def __init__(self, name: str, argv, kind: str, source: str):
+        self.name = name
+        self.argv = list(argv)
+        self.kind = kind
+        self.source = source  # file it was found in
+
+    def to_list(self):
+        return [self.name, self.argv, self.kind, self.source]
+
+    @classmethod
+    def from_list(cls, row):
+        return cls(*row)
+
+    def __repr__(self):
+        return f"AppEntry({self.name!r}, {self.argv!r}, {self.kind!r})"
+
+
+def _parse_desktop_file(path: str):
+    """Name and command of a .desktop launcher, or None if it is hidden or not an application"""
+    fields = {}
+    in_entry = False
+    try:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                line = line.strip()
+                if line.startswith("["):
+                    if in_entry:
+                        break  # only the main [Desktop Entry] group
+                    in_entry = line == "[Desktop Entry]"
+                elif in_entry and "=" in line:
+                    key, value = line.split("=", 1)
+                    fields.setdefault(key.strip(), value.strip())
+    except OSError:
+        return None
+    if fields.get("Type", "Application") != "Application" or "Exec" not in fields or "Name" not in fields:
+        return None
+    if fields.get("NoDisplay", "").lower() == "true" or fields.get("Hidden", "").lower() == "true":
+        return None
+    try:
+        argv = shlex.split(_FIELD_CODE.sub("", fields["Exec"]).replace("%%", "%"))
+    except ValueError:
+        return None
+    return (fields["Name"], argv) if argv else None
+
+
+def launchable_from_path(entry) -> bool:
+    """False for $PATH system tools and daemons (reboot, yes, test, anything in an sbin)"""
+    name = entry.name.lower()
+    if name in _PATH_DENYLIST or name.startswith(_PATH_DENY_PREFIXES) or name.endswith("daemon"):
+        return False
+    return os.path.basename(os.path.dirname(entry.source)) not in _SYSTEM_BIN_DIRS
+
+
+def _scan_dir(path: str, kind: str):
+    """(entries, subdirectories to scan too) of one directory"""
+    entries, subdirs = [], []
+    try:
+        items = list(os.scandir(path))
+    except OSError:
+        return entries, subdirs
+    pathext = os.environ.get("PATHEXT", ".EXE;.BAT;.CMD").lower().split(";") if os.name == "nt" else None
+    for item in items:
+        try:
+            if kind == KIND_PATH:
+                if not item.is_file():
+                    continue
+                stem, ext = os.path.splitext(item.name)
+                if pathext is not None:
+                    if ext.lower() in pathext:
+                        entries.append(AppEntry(stem, [item.path], kind, item.path))
+                elif os.access(item.path, os.X_OK):
+                    entries.append(AppEntry(item.name, [item.path], kind, item.path))
+            elif kind == KIND_MAC_APP:
+                if item.name.endswith(".app"):
+                    entries.append(AppEntry(item.name[:-4], ["open", "-a", item.path], kind, item.path))
+                elif item.is_dir():
+                    subdirs.append(item.path)
+            elif item.is_dir():
+                subdirs.append(item.path)
+            elif kind == KIND_DESKTOP and item.name.endswith(".desktop"):
+                parsed = _parse_desktop_file(item.path)
+                if parsed:
+                    entries.append(AppEntry(parsed[0], parsed[1], kind, item.path))
+            elif kind == KIND_START_MENU and item.name.lower().endswith(".lnk"):
+                entries.append(AppEntry(item.name[:-4], ["cmd", "/c", "start", "", item.path], kind, item.path))
+        except OSError:
+            continue
+    return entries, subdirs
+
+
+def default_roots():
+    """(directory, kind) pairs that exist on this machine"""
+    roots = []
+    home = os.path.expanduser("~")
+    data_home = os.environ.get("XDG_DATA_HOME") or os.path.join(home, ".local", "share")
+    data_dirs = (os.environ.get("XDG_DATA_DIRS") or "/usr/local/share:/usr/share").split(":")
+    for base in [data_home, *data_dirs, "/var/lib/flatpak/exports/share",
+                 os.path.join(home, ".local/share/flatpak/exports/share")]:
+        roots.append((os.path.join(base, "applications"), KIND_DESKTOP))
+    for base in (os.environ.get("APPDATA"), os.environ.get("PROGRAMDATA")):
+        if base:
+            roots.append((os.path.join(base, "Microsoft", "Windows", "Start Menu", "Programs"), KIND_START_MENU))
+    if sys.platform == "darwin":
+        roots += [("/Applications", KIND_MAC_APP), ("/System/Applications", KIND_MAC_APP),
+                  (os.path.join(home, "Applications"), KIND_MAC_APP)]
+    for directory in os.environ.get("PATH", "").split(os.pathsep):
+        if directory:
+            roots.append((directory, KIND_PATH))
+    seen = set()
+    return [(d, k) for d, k in roots if os.path.isdir(d) and not (d in seen or seen.add(d))]
+
+
+class AppIndex:
+    """
+    Catalog of installed applications from .desktop files, $PATH, the Start
+    Menu and /Applications. The scan is saved to disk per directory and a
+    refresh only rescans directories whose mtime changed; it runs on a
+    background thread, so lookups never scan. Lookups are in memory: exact
+    name, then word and sound-alike (Metaphone-style) keys, then trigram
+    candidates ranked by similarity. Programs found only on $PATH match by
+    exact name alone, and system tools among them never match.
+    """
+
+    def __init__(self, path: str = INDEX_FILE, roots=None, min_score: float = 0.8):
+        self.path = path
+        self.roots = roots
+        self.min_score = min_score
+        self.lookups = 0
+        self.misses = 0
+        self.scans = 0
+        self.last_refresh_s = 0.0
+        self._dirs = {}  # directory -> {"kind", "mtime", "subdirs", "entries"}
+        self._entries = []
+        self._by_name = {}
+        self._by_token = {}
+        self._by_sound = {}
+        self._by_trigram = {}
+        self._names = []  # normalized name per entry
+        self._sounds = []  # phonetic key per entry
+        self._loaded = False
+        self._refreshing = False
+        self._lock = threading.Lock()
+
+    # --- building ---------------------------------------------------------
+
+    def set_entries(self, entries):
+        """Rebuild the in-memory lookup tables (also used for synthetic catalogs)"""
+        entries = sorted((e for e in entries if e.kind != KIND_PATH or launchable_from_path(e)),
+                         key=lambda e: _KIND_RANK.get(e.kind, 2))
+        by_name, by_token, by_sound, by_trigram = {}, {}, {}, {}
+        names, sounds = [], []
+        for i, entry in enumerate(entries):
+            name = normalize_name(entry.name)
+            sound = phonetic_key(entry.name)
+            names.append(name)
+            sounds.append(sound)
+            by_name.setdefault(name, i)
+            if entry.kind == KIND_PATH:
+                continue  # "zoom" must not fuzzily become /usr/bin/sum: tools match exactly or not at all
+            by_sound.setdefault(sound, []).append(i)
+            for token in set(name.split()):
+                by_token.setdefault(token, []).append(i)
+            for trigram in _trigrams(name):
+                by_trigram.setdefault(trigram, []).append(i)
+        with self._lock:
+            self._entries, self._names, self._sounds = entries, names, sounds
+            self._by_name, self._by_token, self._by_sound, self._by_trigram = by_name, by_token, by_sound, by_trigram
+            self._loaded = True
+
+    def load(self) -> bool:
+        """Read the saved scan (no directory access)"""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if data.get("version") != INDEX_VERSION:
+            return False
+        self._dirs = {d: dict(info, entries=[AppEntry.from_list(r) for r in info["entries"]])
+                      for d, info in data.get("dirs", {}).items()}
+        self.set_entries([e for info in self._dirs.values() for e in info["entries"]])
+        return True
+
+    def refresh(self):
+        """Rescan directories whose mtime changed since the saved scan, then save"""
+        started = time.perf_counter()
+        dirs, changed = {}, False
+        pending = list(self.roots if self.roots is not None else default_roots())
+        while pending:
+            directory, kind = pending.pop(0)  # in $PATH order, so earlier directories win
+            if directory in dirs:
+                continue
+            try:
+                mtime = os.stat(directory).st_mtime
+            except OSError:
+                changed = changed or directory in self._dirs
+                continue
+            cached = self._dirs.get(directory)
+            if cached is None or cached["mtime"] != mtime or cached["kind"] != kind:
+                entries, subdirs = _scan_dir(directory, kind)
+                cached = {"kind": kind, "mtime": mtime, "subdirs": subdirs, "entries": entries}
+                self.scans += 1
+                changed = True
+            dirs[directory] = cached
+            pending.extend((subdir, kind) for subdir in cached["subdirs"])
+        changed = changed or set(dirs) != set(self._dirs)
+        self._dirs = dirs
+        if changed or not self._loaded:
+            self.set_entries([e for info in dirs.values() for e in info["entries"]])
+        if changed:
+            self._save()
+        self.last_refresh_s = time.perf_counter() - started
+        log(f"🗂️ App index: {len(self._entries)} apps, {self.scans} directories scanned "
+            f"({self.last_refresh_s * 1000:.0f} ms)")
+
+    def _save(self):
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            data = {"version": INDEX_VERSION,
+                    "dirs": {d: dict(info, entries=[e.to_list() for e in info["entries"]])
+                             for d, info in self._dirs.items()}}
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"⚠️ App index not saved: {e}")
+
+    def refresh_async(self):
+        """Load the saved scan if needed and refresh it on a background thread"""
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def run():
+            try:
+                if not self._loaded:
+                    self.load()
+                self.refresh()
+            except Exception as e:
+                print(f"⚠️ App index refresh failed: {e}")
+            finally:
+                self._refreshing = False
+
+        threading.Thread(target=run, name="smriti-app-index", daemon=True).start()
+
+    # --- lookup -----------------------------------------------------------
+
+    def find(self, spoken: str):
+        """Best matching application for a spoken name, or None"""
+        if not self._loaded:
+            # First use: the saved scan is quick to read; the rescan runs in the background
+            self.load()
+            self.refresh_async()
+        self.lookups += 1
+        match = self._match(spoken)
+        if match is None:
+            self.misses += 1
+        return match
+
+    def _match(self, spoken: str):
+        with self._lock:
+            entries, names, sounds = self._entries, self._names, self._sounds
+            by_name, by_token, by_sound, by_trigram = self._by_name, self._by_token, self._by_sound, self._by_trigram
+        query = normalize_name(spoken)
+        if not query or not entries:
+            return None
+        exact = by_name.get(query) if query in by_name else by_name.get(query.replace(" ", ""))
+        if exact is not None:
+            return entries[exact]
+
+        sound = phonetic_key(query)
+        tokens = query.split()
+        # Cheap overlap count over words and trigrams; only the best few get the costly comparison
+        counts = {}
+        for token in tokens:
+            for i in by_token.get(token, ()):
+                counts[i] = counts.get(i, 0) + 3
+        for trigram in _trigrams(query):
+            for i in by_trigram.get(trigram, ()):
+                counts[i] = counts.get(i, 0) + 1
+        candidates = set(by_sound.get(sound, ()))
+        candidates.update(sorted(counts, key=counts.get, reverse=True)[:20])
+
+        best, best_score = None, 0.0
+        for i in candidates:
+            name_tokens = names[i].split()
+            score = max(SequenceMatcher(None, query, names[i]).ratio(),
+                        SequenceMatcher(None, sound, sounds[i]).ratio() * 0.95)
+            if all(token in name_tokens for token in tokens):
+                # "studio code" -> "Visual Studio Code"; shorter names first
+                score = max(score, 0.8 + 0.1 * len(tokens) / len(name_tokens))
+            score -= 0.02 * _KIND_RANK.get(entries[i].kind, 2)
+            if score > best_score:
+                best, best_score = entries[i], score
+        return best if best_score >= self.min_score else None
+
+    def stats(self) -> dict:
+        return {
+            "apps": len(self._entries),
+            "directories": len(self._dirs),
+            "lookups": self.lookups,
+            "misses": self.misses,
+            "last_refresh_ms": round(self.last_refresh_s * 1000, 1),
+        }
+
+
+def _trigrams(name: str):
+    padded = f" {name} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+app_index = AppIndex()
+
+
+def find_application(spoken: str):
+    return app_index.find(spoken)
+
+
+def refresh_app_index():
+    app_index.refresh_async()
+
+
+def app_index_stats() -> dict:
+    return app_index.stats()
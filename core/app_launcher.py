@@ -1,7 +1,14 @@
 import webbrowser
-import os
-import subprocess
 import platform
+from core.process_launcher import launch, terminate_launched
+from core.process_inspector import close_processes
+from core.app_index import find_application, refresh_app_index
+from core.website_resolver import resolve_website, search_url
+
+# Words that refer to a launched program when closing it (besides its name)
+FILE_EXPLORER_WORDS = ("file explorer", "explorer", "finder", "file manager")
+TERMINAL_WORDS = ("terminal", "command", "cmd")
+VSCODE_WORDS = ("vs code", "code")
 
 
 class AppLauncher:
@@ -43,12 +50,25 @@ class AppLauncher:
             return self.open_vscode()
         
         else:
+            return self.open_installed(app_name)
+
+    def open_installed(self, app_name):
+        """Open anything in the installed-application index (fuzzy, sound-alike names)"""
+        app = find_application(app_name)
+        if app is None:
             return f"Sorry, I don't know how to open {app_name}"
+        try:
+            launch(app.name.lower(), app.argv, (app_name, app.name.lower()))
+            return f"Opening {app.name}"
+        except Exception as e:
+            return f"Sorry, I couldn't open {app.name}: {str(e)}"
 
     def close_application(self, app_name):
-        """Close desktop applications by process name patterns"""
+        """Close what Smriti launched itself, else desktop applications by process name patterns"""
         try:
             name = app_name.lower()
+            if terminate_launched(name):
+                return f"Closing {app_name}"
             if self.system == "Windows":
                 # Map friendly names to process image names
                 name_map = {
@@ -71,27 +91,19 @@ class AppLauncher:
                 if targets is None:
                     guessed = name.replace(" ", "") + ".exe"
                     targets = [guessed]
-
-                success = False
-                for proc in targets:
-                    try:
-                        subprocess.run(["taskkill", "/IM", proc, "/F"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-                        success = True
-                    except Exception:
-                        pass
-                if success:
-                    return f"Closing {app_name}"
-                return f"I couldn't find {app_name} running"
             else:
-                # macOS and Linux: best-effort pkill
+                # macOS and Linux: the names the processes actually run under,
+                # which often differ from the launcher ("gnome-terminal" hands
+                # its windows to gnome-terminal-server, "google-chrome" execs chrome)
                 pattern_map = {
-                    "notepad": ["TextEdit", "gedit"],
-                    "calculator": ["Calculator", "gnome-calculator"],
+                    "notepad": ["TextEdit", "gedit", "gnome-text-editor"],
+                    "calculator": ["Calculator", "gnome-calculator", "kcalc"],
                     "chrome": ["Google Chrome", "chrome"],
-                    "firefox": ["firefox"],
-                    "edge": ["Microsoft Edge", "microsoft-edge"],
+                    "chromium": ["Chromium", "chromium", "chromium-browser"],
+                    "firefox": ["firefox", "firefox-bin"],
+                    "edge": ["Microsoft Edge", "msedge"],
                     "code": ["Visual Studio Code", "code"],
-                    "terminal": ["Terminal", "gnome-terminal"],
+                    "terminal": ["Terminal", "gnome-terminal-server", "konsole", "xfce4-terminal", "kgx"],
                 }
                 targets = None
                 for key, pats in pattern_map.items():
@@ -100,16 +112,14 @@ class AppLauncher:
                         break
                 if targets is None:
                     targets = [name]
-                success = False
-                for pat in targets:
-                    try:
-                        subprocess.run(["pkill", "-f", pat])
-                        success = True
-                    except Exception:
-                        pass
-                if success:
-                    return f"Closing {app_name}"
-                return f"I couldn't find {app_name} running"
+
+            # One process-table snapshot for all names, then terminate and verify
+            closed, survivors = close_processes(targets)
+            if survivors:
+                return f"I couldn't close {app_name} completely, {len(survivors)} process(es) are still running"
+            if closed:
+                return f"Closing {app_name}"
+            return f"I couldn't find {app_name} running"
         except Exception as e:
             return f"Sorry, I couldn't close {app_name}: {str(e)}"
 
@@ -135,13 +145,13 @@ class AppLauncher:
         """Open Notepad"""
         try:
             if self.system == "Windows":
-                os.system("notepad")
+                launch("notepad", ["notepad"])
                 return "Opening Notepad"
             elif self.system == "Darwin":  # macOS
-                subprocess.run(["open", "-a", "TextEdit"])
+                launch("notepad", ["open", "-a", "TextEdit"])
                 return "Opening TextEdit"
             else:  # Linux
-                subprocess.run(["gedit"])
+                launch("notepad", ["gedit"])
                 return "Opening text editor"
         except Exception as e:
             return f"Sorry, I couldn't open Notepad: {str(e)}"
@@ -150,13 +160,13 @@ class AppLauncher:
         """Open Calculator"""
         try:
             if self.system == "Windows":
-                os.system("calc")
+                launch("calculator", ["calc"])
                 return "Opening Calculator"
             elif self.system == "Darwin":  # macOS
-                subprocess.run(["open", "-a", "Calculator"])
+                launch("calculator", ["open", "-a", "Calculator"])
                 return "Opening Calculator"
             else:  # Linux
-                subprocess.run(["gnome-calculator"])
+                launch("calculator", ["gnome-calculator"])
                 return "Opening Calculator"
         except Exception as e:
             return f"Sorry, I couldn't open Calculator: {str(e)}"
@@ -165,13 +175,13 @@ class AppLauncher:
         """Open File Explorer"""
         try:
             if self.system == "Windows":
-                os.system("explorer")
+                launch("file explorer", ["explorer"], FILE_EXPLORER_WORDS)
                 return "Opening File Explorer"
             elif self.system == "Darwin":  # macOS
-                subprocess.run(["open", "-a", "Finder"])
+                launch("file explorer", ["open", "-a", "Finder"], FILE_EXPLORER_WORDS)
                 return "Opening Finder"
             else:  # Linux
-                subprocess.run(["nautilus"])
+                launch("file explorer", ["nautilus"], FILE_EXPLORER_WORDS)
                 return "Opening File Manager"
         except Exception as e:
             return f"Sorry, I couldn't open File Explorer: {str(e)}"
@@ -180,13 +190,13 @@ class AppLauncher:
         """Open Command Prompt/Terminal"""
         try:
             if self.system == "Windows":
-                os.system("cmd")
+                launch("terminal", ["cmd"], TERMINAL_WORDS, new_console=True)
                 return "Opening Command Prompt"
             elif self.system == "Darwin":  # macOS
-                subprocess.run(["open", "-a", "Terminal"])
+                launch("terminal", ["open", "-a", "Terminal"], TERMINAL_WORDS)
                 return "Opening Terminal"
             else:  # Linux
-                subprocess.run(["gnome-terminal"])
+                launch("terminal", ["gnome-terminal"], TERMINAL_WORDS)
                 return "Opening Terminal"
         except Exception as e:
             return f"Sorry, I couldn't open Command Prompt: {str(e)}"
@@ -195,47 +205,41 @@ class AppLauncher:
         """Open Visual Studio Code"""
         try:
             if self.system == "Windows":
-                os.system("code")
+                launch("vs code", ["code"], VSCODE_WORDS)
                 return "Opening Visual Studio Code"
             elif self.system == "Darwin":  # macOS
-                subprocess.run(["open", "-a", "Visual Studio Code"])
+                launch("vs code", ["open", "-a", "Visual Studio Code"], VSCODE_WORDS)
                 return "Opening Visual Studio Code"
             else:  # Linux
-                subprocess.run(["code"])
+                launch("vs code", ["code"], VSCODE_WORDS)
                 return "Opening Visual Studio Code"
         except Exception as e:
             return f"Sorry, I couldn't open Visual Studio Code: {str(e)}"
 
     def open_specific_website(self, site_name):
-        """Open specific websites by name"""
-        sites = {
-            "google": "https://www.google.com",
-            "youtube": "https://www.youtube.com",
-            "facebook": "https://www.facebook.com",
-            "instagram": "https://www.instagram.com",
-            "twitter": "https://www.twitter.com",
-            "github": "https://www.github.com",
-            "linkedin": "https://www.linkedin.com",
-            "whatsapp": "https://web.whatsapp.com",
-            "gmail": "https://mail.google.com",
-            "drive": "https://drive.google.com",
-            "maps": "https://maps.google.com",
-            "amazon": "https://www.amazon.com",
-            "netflix": "https://www.netflix.com",
-            "prime": "https://www.primevideo.com",
-            "hotstar": "https://www.hotstar.com"
-        }
-        
-        site_name = site_name.lower()
-        for key, url in sites.items():
-            if key in site_name:
-                return self.open_website(url)
-        
-        return f"Sorry, I don't know how to open {site_name}"
+        """Open a website by spoken name: built-in sites, user aliases, bookmarks or a domain"""
+        site = resolve_website(site_name)
+        if site is None:
+            return f"Sorry, I don't know how to open {site_name}"
+        return self.open_website(site.url)
+
+    def search_web(self, request):
+        """"cats on youtube" -> open YouTube's results for cats (Google when no site is named)"""
+        found = search_url(request)
+        if found is None:
+            return "What should I search for?"
+        site, query, url = found
+        try:
+            webbrowser.open(url)
+            return f"Searching {site.title()} for {query}"
+        except Exception as e:
+            return f"Sorry, I couldn't search {site.title()}: {str(e)}"
 
 
 # Global instance
 _app_launcher = AppLauncher()
+# Catch up with apps installed since the last run, off the command path
+refresh_app_index()
 
 def open_application(app_name):
     return _app_launcher.open_application(app_name)
@@ -247,5 +251,8 @@ def open_website(url_or_name):
     else:
         return _app_launcher.open_specific_website(url_or_name)
 
+def search_web(request):
+    return _app_launcher.search_web(request)
+
 def close_application(app_name):
     return _app_launcher.close_application(app_name)
\ No newline at end of file
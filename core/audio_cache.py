@@ -0,0 +1,118 @@
+import hashlib
+import mmap
+import os
+import threading
+from collections import OrderedDict
+
+
+class AudioCache:
+    """
+    Content-addressed on-disk cache of synthesized speech.
+    Files are named by a hash of (text, lang, voice); the total size is capped
+    and the least recently used files are evicted first.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 50 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> size, oldest first
+        self._total_bytes = 0
+        os.makedirs(directory, exist_ok=True)
+        self._load_index()
+
+    @staticmethod
+    def key_for(text: str, lang: str = "en", voice: str = "com") -> str:
+        raw = f"{lang}\0{voice}\0{text.strip()}".encode("utf-8")
+        return hashlib.sha1(raw).hexdigest()
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.directory, key + ".mp3")
+
+    def _load_index(self):
+        """Rebuild the LRU order from file access times left by the previous run"""
+        files = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".mp3"):
+                continue
+            try:
+                st = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            files.append((st.st_mtime, name[:-4], st.st_size))
+        for _, key, size in sorted(files):
+            self._entries[key] = size
+            self._total_bytes += size
+
+    def get(self, text: str, lang: str = "en", voice: str = "com"):
+        """
+        Return the cached mp3 as a read-only memory map (a seekable file-like
+        object the caller closes after playback), or None on a miss.
+        """
+        key = self.key_for(text, lang, voice)
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            path = self.path_for(key)
+            try:
+                with open(path, "rb") as f:
+                    data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                os.utime(path)  # persist recency for the next start
+            except (OSError, ValueError):
+                # Missing or empty file: drop the entry and synthesize again
+                self._forget(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self.bytes_saved += len(data)
+            return data
+
+    def put(self, text: str, data: bytes, lang: str = "en", voice: str = "com"):
+        key = self.key_for(text, lang, voice)
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            path = self.path_for(key)
+            tmp_path = path + ".part"
+            try:
+                with open(tmp_path, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, path)  # never leave a half-written entry behind
+            except OSError as e:
+                print(f"⚠️ Audio cache write error: {e}")
+                return
+            self._forget(key)
+            self._entries[key] = len(data)
+            self._total_bytes += len(data)
+            while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+                oldest = next(iter(self._entries))
+                self._forget(oldest)
+                try:
+                    os.remove(self.path_for(oldest))
+                except OSError:
+                    pass
+
+    def contains(self, text: str, lang: str = "en", voice: str = "com") -> bool:
+        with self._lock:
+            return self.key_for(text, lang, voice) in self._entries
+
+    def _forget(self, key: str):
+        size = self._entries.pop(key, None)
+        if size is not None:
+            self._total_bytes -= size
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "bytes_saved": self.bytes_saved,
+            "entries": len(self._entries),
+            "total_bytes": self._total_bytes,
+        }
@@ -0,0 +1,262 @@
+import collections
+import queue
+import threading
+import time
+import wave
+from array import array
+from typing import Optional
+
+SAMPLE_RATE = 16000
+FRAME_MS = 30
+
+
+class SpeechSegment:
+    """A finished utterance: 16-bit mono PCM plus timing"""
+
+    def __init__(self, pcm: bytes, sample_rate: int, started_at: float, ended_at: float):
+        self.pcm = pcm
+        self.sample_rate = sample_rate
+        self.started_at = started_at
+        self.ended_at = ended_at
+
+    @property
+    def duration(self) -> float:
+        return len(self.pcm) / 2 / self.sample_rate
+
+
+class PyAudioSource:
+    """Live microphone opened once through PyAudio"""
+
+    def __init__(self, sample_rate: int = SAMPLE_RATE, frame_ms: int = FRAME_MS):
+        import pyaudio
+
+        self.sample_rate = sample_rate
+        self.frame_samples = sample_rate * frame_ms // 1000
+        self._pa = pyaudio.PyAudio()
+        self._stream = self._pa.open(
+            format=pyaudio.paInt16, channels=1, rate=sample_rate,
+            input=True, frames_per_buffer=self.frame_samples,
+        )
+
+    def read(self) -> bytes:
+        return self._stream.read(self.frame_samples, exception_on_overflow=False)
+
+    def close(self):
+        try:
+            self._stream.stop_stream()
+            self._stream.close()
+        finally:
+            self._pa.terminate()
+
+
+class WavFileSource:
+    """Feeds a 16-bit mono WAV file frame by frame (stand-in microphone)"""
+
+    def __init__(self, path: str, frame_ms: int = FRAME_MS, realtime: bool = False):
+        self._wav = wave.open(path, "rb")
+        if self._wav.getsampwidth() != 2 or self._wav.getnchannels() != 1:
+            raise ValueError("WavFileSource needs 16-bit mono audio")
+        self.sample_rate = self._wav.getframerate()
+        self.frame_samples = self.sample_rate * frame_ms // 1000
+        self.realtime = realtime
+
+    def read(self) -> bytes:
+        data = self._wav.readframes(self.frame_samples)
+        if self.realtime and data:
+            time.sleep(self.frame_samples / self.sample_rate)
+        return data  # b"" at end of file
+
+    def close(self):
+        self._wav.close()
+
+
+def frame_energy(samples: array) -> float:
+    """RMS amplitude of one frame"""
+    if not samples:
+        return 0.0
+    return (sum(s * s for s in samples) / len(samples)) ** 0.5
+
+
+def zero_crossing_rate(samples: array) -> float:
+    """Fraction of adjacent samples that change sign"""
+    if len(samples) < 2:
+        return 0.0
+    crossings = sum(1 for a, b in zip(samples, samples[1:]) if (a < 0) != (b < 0))
+    return crossings / (len(samples) - 1)
+
+
+class CaptureEngine:
+    """
+    Keeps one audio source open, runs an energy/zero-crossing VAD over every
+    frame and pushes finished utterances onto `segments`.
+    The noise floor is tracked continuously, so no per-listen calibration is needed:
+    it is the quietest frame of the last floor_window_s (minimum statistics), so
+    it follows the background up as well as down, even while someone is talking.
+    """
+
+    def __init__(self, source, speech_ratio: float = 3.0, min_energy: float = 120.0,
+                 pause_ms: int = 500, preroll_ms: int = 300, min_speech_ms: int = 150,
+                 max_segment_s: float = 8.0, ring_seconds: float = 10.0,
+                 floor_window_s: float = 3.0, seed_ms: int = 500):
+        self.source = source
+        self.sample_rate = source.sample_rate
+        self.frame_s = source.frame_samples / source.sample_rate
+        self.speech_ratio = speech_ratio
+        self.min_energy = min_energy
+        self.pause_frames = max(1, int(pause_ms / 1000 / self.frame_s))
+        self.preroll_frames = max(1, int(preroll_ms / 1000 / self.frame_s))
+        self.min_speech_frames = max(1, int(min_speech_ms / 1000 / self.frame_s))
+        self.max_segment_frames = int(max_segment_s / self.frame_s)
+        self.floor_window_frames = max(1, int(floor_window_s / self.frame_s))
+        self.seed_frames = max(1, int(seed_ms / 1000 / self.frame_s))
+
+        self.segments: "queue.Queue[SpeechSegment]" = queue.Queue()
+        self.ring = collections.deque(maxlen=int(ring_seconds / self.frame_s))
+        self.noise_floor = min_energy / speech_ratio
+        self._frames_seen = 0
+        self._floor_window = collections.deque()  # (frame number, energy), energies increasing: sliding minimum
+        self.level = 0.0  # last frame energy relative to the speech threshold (0..1+)
+        self.paused = False
+        self.failed = False  # the source broke: the engine is dead and should be replaced
+        self.frame_errors = 0  # frames dropped because a filter or listener raised
+        self.frame_filters = []  # callables(frame_bytes) -> frame_bytes run before the VAD (e.g. echo cancelling)
+        self.frame_listeners = []  # callables(frame_bytes, is_speech) run on every frame
+
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+        self._reset_segment()
+
+    def _reset_segment(self):
+        self._in_speech = False
+        self._segment = []
+        self._speech_frames = 0
+        self._silent_frames = 0
+        self._segment_start = 0.0
+
+    @property
+    def threshold(self) -> float:
+        return max(self.min_energy, self.noise_floor * self.speech_ratio)
+
+    def _track_floor(self, energy: float):
+        """Every frame, speech or not: keep the minimum energy of the last floor_window_s"""
+        window = self._floor_window
+        while window and window[-1][1] >= energy:
+            window.pop()
+        window.append((self._frames_seen, energy))
+        if window[0][0] <= self._frames_seen - self.floor_window_frames:
+            window.popleft()
+        self._frames_seen += 1
+        # Speech always has gaps within a few seconds; a level that never dips is background
+        self.noise_floor = window[0][1]
+
+    def is_speech(self, samples: array) -> bool:
+        energy = frame_energy(samples)
+        self._track_floor(energy)
+        if self._frames_seen <= self.seed_frames:
+            # The first frames only seed the floor, so steady noise at start-up isn't an utterance
+            self.level = 0.0
+            return False
+        self.level = energy / self.threshold
+        if energy >= self.threshold:
+            return True
+        # Quiet but noisy-looking frames (fricatives like "s", "sh") extend speech already in progress
+        return self._in_speech and energy >= self.threshold * 0.5 and zero_crossing_rate(samples) > 0.25
+
+    def process_frame(self, frame: bytes):
+        """Run the VAD on one frame; called by the capture thread (or directly in tests)"""
+        now = time.time()
+        if self.paused:
+            self.ring.append(frame)
+            return
+        for frame_filter in self.frame_filters:
+            frame = frame_filter(frame)
+        self.ring.append(frame)
+        samples = array("h", frame)
+        speech = self.is_speech(samples)
+        for listener in self.frame_listeners:
+            listener(frame, speech)
+
+        if not self._in_speech:
+            if speech:
+                self._in_speech = True
+                # Pre-roll: keep the frames right before onset so the first syllable isn't clipped
+                preroll = list(self.ring)[-self.preroll_frames:]
+                self._segment = preroll
+                self._speech_frames = 1
+                self._segment_start = now - len(preroll) * self.frame_s
+            return
+
+        self._segment.append(frame)
+        if speech:
+            self._speech_frames += 1
+            self._silent_frames = 0
+        else:
+            self._silent_frames += 1
+
+        if self._silent_frames >= self.pause_frames or len(self._segment) >= self.max_segment_frames:
+            self._finish_segment(now)
+
+    def _finish_segment(self, now: float):
+        if self._speech_frames >= self.min_speech_frames:
+            self.segments.put(SpeechSegment(b"".join(self._segment), self.sample_rate,
+                                            self._segment_start, now))
+        self._reset_segment()
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._capture_loop, name="smriti-capture", daemon=True)
+        self._thread.start()
+
+    def _capture_loop(self):
+        try:
+            while self._running:
+                try:
+                    frame = self.source.read()
+                except Exception as e:
+                    self.failed = True
+                    print(f"🎤 Capture error, microphone stream lost: {e}")
+                    break
+                if not frame:
+                    break  # end of a file source
+                try:
+                    self.process_frame(frame)
+                except Exception as e:
+                    # A failing filter or listener costs one frame, not the capture thread
+                    self.frame_errors += 1
+                    if self.frame_errors == 1 or self.frame_errors % 100 == 0:
+                        print(f"🎤 Frame dropped ({self.frame_errors} so far): {e}")
+            if self._in_speech:
+                self._finish_segment(time.time())
+        finally:
+            self._running = False
+
+    def stop(self):
+        self._running = False
+        if self._thread:
+            self._thread.join(timeout=1)
+        try:
+            self.source.close()
+        except Exception:
+            pass
+
+    def pause(self):
+        """Stop segmenting (mic off) without closing the device"""
+        self.paused = True
+        self._reset_segment()
+
+    def resume(self):
+        self.paused = False
+
+    def next_segment(self, timeout: Optional[float] = None, max_age: float = 2.0) -> Optional[SpeechSegment]:
+        """Next utterance that ended less than max_age seconds ago, or None on timeout"""
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.time())
+            try:
+                segment = self.segments.get(timeout=remaining)
+            except queue.Empty:
+                return None
+            if time.time() - segment.ended_at <= max_age:
+                return segment
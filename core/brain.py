@@ -1,14 +1,64 @@
 # brain.py
-import threading
-from core.voice_response import speak, stop
-from core.gemini_connector import ask_gemini
-from core.app_launcher import open_application, open_website, close_application  # Add this import
+from core.voice_response import speak, stop, PRIORITY_NORMAL, PRIORITY_URGENT
+from core.gemini_connector import ask_gemini, ask_gemini_stream
+from core.app_launcher import open_application, open_website, close_application, search_web
+from core.intent_router import route
+from core.website_resolver import resolve_website
+from core.local_skills import answer_locally
+from core.speculation import claim_speculation
+from core.tracing import log
+from core.replies import SMRITI_IDENTITY, STOPPED_REPLY, FALLBACK_REPLY, GLITCH_REPLY
+
+def _handle_local(command: str, speak_out: bool):
+    """Keyword-routed commands that never reach Gemini; returns None when unhandled"""
+    intent = route(command)
+    if intent is None:
+        return None
 
-# 🌸 Smriti's personality and identity
-SMRITI_IDENTITY = (
-    "I am Smriti, an AI Desktop Assistant created by Sumit Vishwakarma. "
-    "I am here to assist, chat, and help you with your tasks naturally."
-)
+    # 🛑 Stop commands
+    if intent.name == "stop":
+        stop()
+        response = STOPPED_REPLY
+        log("🔇 [Voice stopped]")
+        priority = PRIORITY_URGENT
+
+    # 🤖 Identity commands
+    elif intent.name == "identity":
+        response = SMRITI_IDENTITY
+        priority = PRIORITY_NORMAL
+
+    # 🚀 Application and Website Launcher Commands
+    elif intent.name == "launch":
+        response = handle_app_launch(command, intent)
+        priority = PRIORITY_NORMAL
+
+    # ❌ Close application commands
+    elif intent.name == "close":
+        response = handle_app_close(command, intent)
+        priority = PRIORITY_NORMAL
+
+    # 🔎 Web search ("search cats on youtube")
+    elif intent.name == "search":
+        log(f"🔎 Handling web search: {command}")
+        response = search_web(intent.remainder)
+        priority = PRIORITY_NORMAL
+
+    else:
+        return None
+
+    if speak_out:
+        _async_speak(response, priority)
+    return response
+
+
+def _inject_personality(response: str) -> str:
+    """Inject Smriti's personality"""
+    if "google" in response.lower() or "language model" in response.lower():
+        return (
+            "I am Smriti, your personal AI desktop assistant made by Sumit Vishwakarma. "
+            "Not a generic Google model. 💜"
+        )
+    return response
 
 
 def process_command(command: str, speak_out: bool = True):
@@ -19,59 +69,30 @@ def process_command(command: str, speak_out: bool = True):
         return "I didn't catch that, please repeat."
 
     command = command.strip().lower()
-    print(f"🧠 Smriti Brain Received: {command}")
+    log(f"🧠 Smriti Brain Received: {command}")
 
-    # 🛑 Stop commands
-    stop_keywords = ["stop", "ruko", "exit", "chup", "mute", "shut up", "bas"]
-    if any(word in command for word in stop_keywords):
-        stop()
-        response = "Okay, I stopped speaking."
-        print("🔇 [Voice stopped]")
-        if speak_out:
-            _async_speak(response)
-        return response
-
-    # 🤖 Identity commands
-    identity_keywords = ["who are you", "what is your name", "introduce yourself", "tum kaun ho"]
-    if any(word in command for word in identity_keywords):
-        response = SMRITI_IDENTITY
-        if speak_out:
-            _async_speak(response)
-        return response
-
-    # 🚀 Application and Website Launcher Commands
-    app_keywords = ["open", "launch", "start", "run", "kholo", "chalu"]
-    website_keywords = ["website", "site", "web", "browser", "internet"]
-    
-    if any(word in command for word in app_keywords):
-        response = handle_app_launch(command)
-        if speak_out:
-            _async_speak(response)
+    response = _handle_local(command, speak_out)
+    if response is not None:
         return response
 
-    # ❌ Close application commands
-    close_keywords = ["close", "band", "band karo", "band ho", "quit", "stop app", "shutdown app", "exit app"]
-    if any(word in command for word in close_keywords):
-        response = handle_app_close(command)
+    # ⚡ Clock, calculator, conversions, system info → answered on-device
+    response = answer_locally(command)
+    if response:
+        log(f"⚡ Answered locally: {response}")
         if speak_out:
             _async_speak(response)
         return response
 
     # 💬 General commands → handled by Gemini
     try:
-        print("🧩 Smriti: Thinking (sending to Gemini)...")
+        log("🧩 Smriti: Thinking (sending to Gemini)...")
         response = ask_gemini(command)
         if not response:
             response = "Sorry, I couldn't connect to my neural network right now."
 
-        # Inject Smriti's personality
-        if "google" in response.lower() or "language model" in response.lower():
-            response = (
-                "I am Smriti, your personal AI desktop assistant made by Sumit Vishwakarma. "
-                "Not a generic Google model. 💜"
-            )
+        response = _inject_personality(response)
 
-        print(f"🤖 Gemini replied: {response}")
+        log(f"🤖 Gemini replied: {response}")
         
         # Return response - speech will be handled in main_window
         return response
@@ -79,95 +100,114 @@ def process_command(command: str, speak_out: bool = True):
     except Exception as e:
         error_msg = f"Brain error: {e}"
         print(f"[⚠️] {error_msg}")
-        fallback = "My circuits glitched for a moment, please repeat."
-        return fallback
+        return GLITCH_REPLY
+
+
+def process_command_stream(command: str):
+    """
+    Like process_command(speak_out=False) but yields the reply sentence by sentence,
+    ready to be piped into speak_stream().
+    """
+    if not command or not command.strip():
+        yield "I didn't catch that, please repeat."
+        return
+
+    command = command.strip().lower()
+    log(f"🧠 Smriti Brain Received (stream): {command}")
+
+    response = answer_offline(command)
+    if response:
+        yield response
+        return
+
+    yield from stream_cloud_reply(command)
+
+
+def interrupt_reply(command: str):
+    """Stop commands, acted on before the pipeline queues their reply so stop() spares it"""
+    intent = route(command)
+    if intent is None or intent.name != "stop":
+        return None
+    stop()
+    log("🔇 [Voice stopped]")
+    return STOPPED_REPLY
 
 
-def handle_app_launch(command):
+def answer_offline(command: str):
+    """Reply for commands that never need the cloud (keyword intents, local skills), else None"""
+    return _handle_local(command, speak_out=False) or answer_locally(command)
+
+
+def stream_cloud_reply(command: str):
+    """Gemini's reply sentence by sentence, with Smriti's personality applied"""
+    try:
+        log("🧩 Smriti: Thinking (streaming from Gemini)...")
+        yielded = False
+        # A request started on the partial transcript is reused when the words match
+        sentences = claim_speculation(command) or ask_gemini_stream(command)
+        for sentence in sentences:
+            personal = _inject_personality(sentence)
+            yielded = True
+            yield personal
+            if personal != sentence:
+                return
+        if not yielded:
+            yield FALLBACK_REPLY
+    except Exception as e:
+        print(f"[⚠️] Brain error: {e}")
+        yield GLITCH_REPLY
+
+
+def handle_app_launch(command, intent=None):
     """Handle application and website launch commands"""
     try:
-        print(f"🚀 Handling app launch command: {command}")
-        
-        # Website commands
-        if any(word in command for word in ["youtube", "facebook", "instagram", "twitter", "github"]):
-            for site in ["youtube", "facebook", "instagram", "twitter", "github", "google", "gmail"]:
-                if site in command:
-                    return open_website(site)
-        
-        # Browser commands
-        if any(word in command for word in ["chrome", "browser", "web browser", "internet"]):
-            return open_application("chrome")
-        elif "firefox" in command:
-            return open_application("firefox")
-        elif "edge" in command:
-            return open_application("edge")
-        
-        # Application commands
-        elif "notepad" in command:
-            return open_application("notepad")
-        elif "calculator" in command:
-            return open_application("calculator")
-        elif "file explorer" in command or "explorer" in command:
-            return open_application("file explorer")
-        elif "command" in command or "terminal" in command or "cmd" in command:
-            return open_application("command prompt")
-        elif "vs code" in command or "code" in command:
-            return open_application("vs code")
-        
-        # Generic open command - let Gemini handle it
-        else:
-            # Extract what to open from command
-            if "open" in command:
-                app_to_open = command.split("open")[-1].strip()
-                return f"I'll try to open {app_to_open}. " + open_application(app_to_open)
-            else:
-                return "What would you like me to open?"
+        log(f"🚀 Handling app launch command: {command}")
+        intent = intent or route(command)
+
+        # Website and application commands (slot extracted by the intent router)
+        if intent and intent.target_kind == "site":
+            return open_website(intent.target)
+        if intent and intent.target_kind == "app":
+            return open_application(intent.target)
+
+        # Generic open command - try whatever follows the verb
+        app_to_open = intent.remainder if intent else ""
+        # User aliases, bookmarks and spoken domains before installed apps ("open my bank")
+        if app_to_open and resolve_website(app_to_open, fuzzy=False):
+            return open_website(app_to_open)
+        if app_to_open:
+            return f"I'll try to open {app_to_open}. " + open_application(app_to_open)
+        return "What would you like me to open?"
                 
     except Exception as e:
         return f"Sorry, I couldn't open that application: {str(e)}"
 
 
-def handle_app_close(command):
+# Close uses the launcher's process-name keys, which differ for the terminal
+_CLOSE_NAMES = {"command prompt": "terminal"}
+
+
+def handle_app_close(command, intent=None):
     """Handle application close/terminate commands"""
     try:
-        print(f"🛑 Handling app close command: {command}")
+        log(f"🛑 Handling app close command: {command}")
+        intent = intent or route(command)
 
         # Direct mapping
-        if "notepad" in command:
-            return close_application("notepad")
-        if "calculator" in command or "calc" in command:
-            return close_application("calculator")
-        if "chrome" in command:
-            return close_application("chrome")
-        if "firefox" in command:
-            return close_application("firefox")
-        if "edge" in command or "microsoft edge" in command:
-            return close_application("edge")
-        if "vs code" in command or "code" in command:
-            return close_application("vs code")
-        if "command" in command or "terminal" in command or "cmd" in command:
-            return close_application("terminal")
-
-        # Generic pattern: close <app>
-        if "close" in command:
-            target = command.split("close", 1)[1].strip()
-            if target:
-                return close_application(target)
-        if "band" in command:
-            # handle hindi variants like "band notepad"
-            parts = command.split("band", 1)
-            if len(parts) > 1:
-                target = parts[1].strip()
-                if target:
-                    return close_application(target)
+        if intent and intent.target_kind == "app":
+            return close_application(_CLOSE_NAMES.get(intent.target, intent.target))
+
+        # Generic pattern: close <app> / band <app>
+        target = intent.remainder if intent else ""
+        if target:
+            return close_application(target)
 
         return "Which application should I close?"
     except Exception as e:
         return f"Sorry, I couldn't close that application: {str(e)}"
 
 
-def _async_speak(text):
-    """Speaks text asynchronously without blocking"""
-    print(f"🔊 Brain requesting speech: {text[:50]}...")
-    thread = threading.Thread(target=lambda: speak(text), daemon=True)
-    thread.start()
\ No newline at end of file
+def _async_speak(text, priority=PRIORITY_NORMAL):
+    """Queues text on the TTS worker without blocking"""
+    log(f"🔊 Brain requesting speech: {text[:50]}...")
+    speak(text, priority)
@@ -0,0 +1,278 @@
+import asyncio
+import itertools
+import os
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
+
+from core.tracing import NULL_TRACE, log
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except ValueError:
+        print(f"⚠️ {name} must be a whole number; using {default}")
+        return default
+
+
+# Upper bound on Gemini generations running at the same time
+MAX_CLOUD_CALLS = _env_int("SMRITI_MAX_CLOUD_CALLS", 2)
+
+_END = object()
+
+
+class CloudLimiter:
+    """
+    Cloud generation slots shared across threads: the pipeline's replies and
+    speculative calls started from partial transcripts count against one cap.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = max(1, limit)
+        self.active = 0
+        self.peak = 0
+        self._waiters = []
+        self._lock = threading.Lock()
+
+    def try_acquire(self, on_free=None) -> bool:
+        """Take a slot if one is free; otherwise on_free() is called at the next release"""
+        with self._lock:
+            if self.active < self.limit:
+                self.active += 1
+                self.peak = max(self.peak, self.active)
+                return True
+            if on_free is not None:
+                self._waiters.append(on_free)
+            return False
+
+    def release(self):
+        with self._lock:
+            self.active -= 1
+            waiters, self._waiters = self._waiters, []
+        for wake in waiters:
+            wake()
+
+
+class CommandJob:
+    """One command travelling through the pipeline, and the reply it produced"""
+
+    def __init__(self, seq: int, command: str, trace=NULL_TRACE):
+        self.seq = seq
+        self.command = command
+        self.trace = trace
+        self.reply = []    # sentences handed to TTS, in order
+        self.token = None  # TTS CancelToken of the spoken reply
+        self.task: Optional[asyncio.Task] = None
+        self._cancelled = threading.Event()
+        self._chunks = queue.Queue()
+
+    @property
+    def stale(self) -> bool:
+        """Superseded, stopped, or its speech was cancelled/dropped"""
+        return self._cancelled.is_set() or (self.token is not None and self.token.cancelled)
+
+    def chunks(self):
+        """Reply sentences as they arrive; consumed by the TTS synthesis worker"""
+        while True:
+            chunk = self._chunks.get()
+            if chunk is _END:
+                return
+            yield chunk
+
+    def deliver(self, sentence: str):
+        if sentence and not self.stale:
+            self.trace.mark("first_sentence")
+            self.reply.append(sentence)
+            self._chunks.put(sentence)
+
+    def finish(self):
+        self._chunks.put(_END)
+
+    def cancel(self):
+        self._cancelled.set()
+        if self.token is not None:
+            self.token.cancel()
+        self.finish()
+
+
+class CommandPipeline:
+    """
+    Runs route → generate → speak for every command on one asyncio event loop
+    thread. A new command cancels the ones still in flight, replies reach TTS
+    in submission order, and at most max_cloud_calls cloud generations run at
+    once. Blocking stage functions run on a small thread pool.
+    """
+
+    def __init__(self, answer_offline, stream_reply, speak_stream,
+                 max_cloud_calls: int = MAX_CLOUD_CALLS, cancel_stale: bool = True,
+                 error_reply: Optional[str] = None, interrupt=None):
+        """
+        answer_offline(command) -> reply or None (no cloud needed)
+        stream_reply(command) -> iterable of reply sentences (cloud)
+        speak_stream(chunks, trace=...) -> CancelToken or None
+        interrupt(command) -> reply or None; runs before the reply is queued for
+            speech, so a stop command silences what came before but not its own answer
+        """
+        self.answer_offline = answer_offline
+        self.stream_reply = stream_reply
+        self.speak_stream = speak_stream
+        self.max_cloud_calls = max(1, max_cloud_calls)
+        self.cancel_stale = cancel_stale
+        self.error_reply = error_reply
+        self.interrupt = interrupt
+
+        self.submitted = 0
+        self.superseded = 0
+        self.cloud_calls = 0
+        self.cloud = CloudLimiter(self.max_cloud_calls)
+        self._seq = itertools.count(1)
+        self._jobs = {}  # seq -> in-flight job; only touched on the loop thread
+        self._stats_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_cloud_calls + 2,
+                                            thread_name_prefix="smriti-pipeline-io")
+        self._loop = asyncio.new_event_loop()
+        ready = threading.Event()
+        threading.Thread(target=self._run_loop, args=(ready,), name="smriti-pipeline", daemon=True).start()
+        ready.wait()
+
+    def _run_loop(self, ready: threading.Event):
+        asyncio.set_event_loop(self._loop)
+        self._loop.call_soon(ready.set)
+        self._loop.run_forever()
+
+    def submit(self, command: str, trace=NULL_TRACE) -> Future:
+        """Queue a command from any thread; the future resolves to its CommandJob"""
+        with self._stats_lock:
+            self.submitted += 1
+        return asyncio.run_coroutine_threadsafe(self._handle(command, trace), self._loop)
+
+    def cancel_all(self):
+        """Drop every in-flight command (stop keyword, mic off)"""
+        self._loop.call_soon_threadsafe(self._cancel_in_flight)
+
+    def _cancel_in_flight(self):
+        for job in list(self._jobs.values()):
+            job.cancel()
+            if job.task is not None:
+                job.task.cancel()
+
+    async def _handle(self, command: str, trace=NULL_TRACE) -> CommandJob:
+        job = CommandJob(next(self._seq), command, trace)
+        trace.annotate(command=command)
+        job.task = asyncio.current_task()
+        if self.cancel_stale and self._jobs:
+            self.superseded += sum(1 for stale in self._jobs.values() if not stale.stale)
+            self._cancel_in_flight()
+        self._jobs[job.seq] = job
+        interrupted = self.interrupt(command) if self.interrupt else None
+        # Handing the reply stream to TTS before any await fixes its place in
+        # the speech queue, so replies play in command order however the calls finish
+        job.token = self.speak_stream(job.chunks(), trace=trace)
+        if job.token is None:
+            job.cancel()  # dropped by TTS backpressure
+            trace.end()
+        try:
+            reply = interrupted
+            if not reply:
+                with trace.span("routing"):
+                    reply = await self._loop.run_in_executor(self._executor, self.answer_offline, command)
+            if reply:
+                job.deliver(reply)
+            elif not job.stale:
+                with trace.span("model"):
+                    await self._generate(job)
+        except asyncio.CancelledError:
+            job.cancel()
+        except Exception as e:
+            print(f"❌ Command pipeline error: {e}")
+            job.deliver(self.error_reply)
+        finally:
+            job.finish()
+            self._jobs.pop(job.seq, None)
+        return job
+
+    async def _cloud_slot(self):
+        """Wait for a cloud slot without blocking the loop; speculation frees them from other threads"""
+        while True:
+            freed = self._loop.create_future()
+            wake = lambda: self._loop.call_soon_threadsafe(lambda: freed.done() or freed.set_result(None))
+            if self.cloud.try_acquire(on_free=wake):
+                return
+            await freed
+
+    async def _generate(self, job: CommandJob):
+        await self._cloud_slot()
+        try:
+            if job.stale:
+                return
+            self.cloud_calls += 1
+            pump = self._loop.run_in_executor(self._executor, self._pump, job)
+            try:
+                await asyncio.shield(pump)
+            except asyncio.CancelledError:
+                job.cancel()
+                # Hold the cloud slot until the worker thread has actually let go
+                await asyncio.wait([pump])
+                raise
+        finally:
+            self.cloud.release()
+
+    def _pump(self, job: CommandJob):
+        """Worker thread: pull sentences from the cloud stream until it ends or the job goes stale"""
+        stream = self.stream_reply(job.command)
+        try:
+            for sentence in stream:
+                if job.stale:
+                    break
+                job.deliver(sentence)
+        finally:
+            close = getattr(stream, "close", None)
+            if close:
+                close()
+
+    def stats(self) -> dict:
+        return {
+            "submitted": self.submitted,
+            "superseded": self.superseded,
+            "in_flight": len(self._jobs),
+            "cloud_calls": self.cloud_calls,
+            "peak_cloud_calls": self.cloud.peak,
+            "max_cloud_calls": self.max_cloud_calls,
+        }
+
+
+_pipeline = None
+_pipeline_lock = threading.Lock()
+
+
+def get_pipeline() -> CommandPipeline:
+    """Start the shared pipeline on first use"""
+    global _pipeline
+    with _pipeline_lock:
+        if _pipeline is None:
+            from core.brain import answer_offline, stream_cloud_reply, interrupt_reply, GLITCH_REPLY
+            from core.voice_response import speak_stream
+
+            _pipeline = CommandPipeline(answer_offline, stream_cloud_reply, speak_stream,
+                                        error_reply=GLITCH_REPLY, interrupt=interrupt_reply)
+        return _pipeline
+
+
+def submit_command(command: str, trace=NULL_TRACE) -> Optional[Future]:
+    """Route, generate and speak a command in the background; supersedes older ones"""
+    if not command or not command.strip():
+        return None
+    command = command.strip().lower()
+    log(f"🧠 Pipeline received: {command}")
+    return get_pipeline().submit(command, trace)
+
+
+def cancel_commands():
+    if _pipeline:
+        _pipeline.cancel_all()
+
+
+def pipeline_stats() -> dict:
+    return _pipeline.stats() if _pipeline else {}
@@ -0,0 +1,127 @@
+import threading
+import time
+
+import numpy as np
+
+
+class NLMSFilter:
+    """
+    Frequency-domain block NLMS filter (constrained overlap-save): estimates
+    the echo of the reference signal in the microphone signal and subtracts
+    it. Each frequency bin is normalized by its own power, so it converges on
+    speech as well as on white noise, at a few FFTs per block.
+    """
+
+    def __init__(self, taps: int = 512, step: float = 0.5, double_talk_ratio: float = 0.6,
+                 smoothing: float = 0.5):
+        self.taps = taps
+        self.step = step
+        self.double_talk_ratio = double_talk_ratio
+        self.smoothing = smoothing
+        self.size = 2 * taps  # FFT length: blocks of up to taps + 1 samples fit overlap-save
+        self.weights = np.zeros(self.size // 2 + 1, dtype=np.complex128)  # echo path per bin
+        self._power = np.zeros(self.size // 2 + 1, dtype=np.float64)
+        self._history = np.zeros(self.size, dtype=np.float64)
+
+    def reset(self):
+        self.weights[:] = 0.0
+        self._power[:] = 0.0
+        self.clear_history()
+
+    def clear_history(self):
+        """Forget past reference samples (after a gap in playback)"""
+        self._history[:] = 0.0
+
+    def process(self, mic: np.ndarray, reference: np.ndarray) -> np.ndarray:
+        """mic and reference are aligned float blocks of equal length; returns the residual"""
+        if mic.size > self.taps:
+            return np.concatenate([self.process(mic[i:i + self.taps], reference[i:i + self.taps])
+                                   for i in range(0, mic.size, self.taps)])
+        block = mic.size
+        self._history = np.concatenate((self._history[block:], reference))
+        X = np.fft.rfft(self._history)
+        # Overlap-save: the last `block` samples of the circular convolution are the linear one
+        echo = np.fft.irfft(X * self.weights, self.size)[-block:]
+        residual = mic - echo
+
+        # Geigel double-talk detector: freeze adaptation while the user is talking over playback
+        peak_ref = np.max(np.abs(self._history[-(self.taps + block):]))
+        if np.max(np.abs(mic)) < self.double_talk_ratio * peak_ref:
+            power = np.abs(X) ** 2
+            self._power = self.smoothing * self._power + (1 - self.smoothing) * power
+            E = np.fft.rfft(np.concatenate((np.zeros(self.size - block), residual)))
+            gradient = np.fft.irfft(np.conj(X) * E / (self._power + 0.1 * np.mean(self._power) + 1e-6), self.size)
+            # Constraint: keep the echo path `taps` long (drops the circular wrap-around)
+            gradient[self.taps:] = 0.0
+            self.weights += self.step * np.fft.rfft(gradient)
+        return residual
+
+
+class EchoCanceller:
+    """
+    Removes Smriti's own voice from the microphone stream.
+    VoiceResponder pushes the PCM it is about to play (push_reference); the
+    capture engine runs every mic frame through process() before VAD and
+    recognition. Reference and mic are aligned on wall-clock time plus a fixed
+    output/input latency (delay_ms).
+    """
+
+    def __init__(self, sample_rate: int = 16000, taps: int = 512, step: float = 0.5,
+                 delay_ms: int = 100, history_s: float = 30.0):
+        self.sample_rate = sample_rate
+        self.delay = int(sample_rate * delay_ms / 1000)
+        self.filter = NLMSFilter(taps=taps, step=step)
+        self._ring = np.zeros(int(sample_rate * history_s), dtype=np.float64)
+        self._epoch = time.time()
+        self._written_from = 0  # absolute sample index range holding valid reference
+        self._written_until = 0
+        self._lock = threading.Lock()
+
+    def _index(self, timestamp: float) -> int:
+        return int(round((timestamp - self._epoch) * self.sample_rate))
+
+    def push_reference(self, pcm: bytes, sample_rate: int, channels: int, start_time: float):
+        """Register audio that starts playing at start_time (16-bit interleaved PCM)"""
+        samples = np.frombuffer(pcm, dtype=np.int16).astype(np.float64)
+        if channels > 1:
+            samples = samples[: len(samples) // channels * channels].reshape(-1, channels).mean(axis=1)
+        if sample_rate != self.sample_rate and samples.size:
+            duration = samples.size / sample_rate
+            target = np.arange(int(duration * self.sample_rate)) / self.sample_rate
+            samples = np.interp(target, np.arange(samples.size) / sample_rate, samples)
+        samples = samples[-self._ring.size:]
+        with self._lock:
+            start = self._index(start_time)
+            if start > self._written_until or start < self._written_from:
+                self._written_from = start
+            self._write(start, samples)
+            self._written_until = start + samples.size
+
+    def end_reference(self, end_time: float):
+        """Playback stopped early: forget reference audio after end_time"""
+        with self._lock:
+            self._written_until = min(self._written_until, self._index(end_time))
+
+    def _write(self, start: int, samples: np.ndarray):
+        idx = np.arange(start, start + samples.size) % self._ring.size
+        self._ring[idx] = samples
+
+    def _read(self, start: int, count: int) -> np.ndarray:
+        absolute = np.arange(start, start + count)
+        valid = (absolute >= max(self._written_from, self._written_until - self._ring.size)) & \
+                (absolute < self._written_until)
+        out = np.zeros(count, dtype=np.float64)
+        out[valid] = self._ring[absolute[valid] % self._ring.size]
+        return out
+
+    def process(self, frame: bytes) -> bytes:
+        """CaptureEngine frame filter (16-bit mono at self.sample_rate)"""
+        mic = np.frombuffer(frame, dtype=np.int16).astype(np.float64)
+        end = self._index(time.time()) - self.delay
+        with self._lock:
+            if end - mic.size >= self._written_until:
+                self.filter.clear_history()
+                return frame  # nothing playing: zero cost path
+            reference = self._read(end - mic.size, mic.size)
+        residual = self.filter.process(mic, reference)
+        return np.clip(residual, -32768, 32767).astype(np.int16).tobytes()
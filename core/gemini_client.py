@@ -0,0 +1,227 @@
+import collections
+import random
+import threading
+import time
+
+from google.api_core import exceptions as api_exceptions
+
+try:
+    import requests
+except ImportError:  # only used to classify transport errors of the REST transport
+    requests = None
+
+# Failure reasons worth another attempt
+TRANSIENT_REASONS = {"timeout", "rate_limited", "unavailable", "server_error", "connection"}
+
+
+class CircuitOpenError(Exception):
+    """Raised without calling the API while the circuit breaker is open"""
+
+
+class DeadlineExceededError(TimeoutError):
+    """The overall per-call deadline ran out (including retries)"""
+
+
+def failure_reason(error: Exception) -> str:
+    """Short, stable label for an API error (used for retry decisions and metrics)"""
+    if isinstance(error, CircuitOpenError):
+        return "circuit_open"
+    if isinstance(error, (api_exceptions.DeadlineExceeded, api_exceptions.GatewayTimeout, TimeoutError)):
+        return "timeout"
+    if isinstance(error, api_exceptions.TooManyRequests):
+        return "rate_limited"
+    if isinstance(error, api_exceptions.ServiceUnavailable):
+        return "unavailable"
+    if isinstance(error, api_exceptions.ServerError):
+        return "server_error"
+    if requests is not None:
+        if isinstance(error, requests.Timeout):
+            return "timeout"
+        if isinstance(error, requests.ConnectionError):
+            return "connection"
+    if isinstance(error, ConnectionError):
+        return "connection"
+    return type(error).__name__
+
+
+class CircuitBreaker:
+    """
+    Closed: calls pass. After failure_threshold consecutive transient failures
+    it opens and rejects calls for reset_timeout seconds, then lets a single
+    trial call through (half-open); its outcome closes or re-opens the circuit.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and self.clock() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN:
+                if self.clock() - self._opened_at < self.reset_timeout:
+                    return False
+                self._state = self.HALF_OPEN
+                self._trial_running = False
+            if self._trial_running:
+                return False
+            self._trial_running = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = self.clock()
+            self._trial_running = False
+
+
+class CallMetrics:
+    """Latency percentiles over the most recent calls plus failure counts by reason"""
+
+    def __init__(self, window: int = 256):
+        self.latencies = collections.deque(maxlen=window)
+        self.failures = collections.Counter()
+        self.calls = 0
+        self.retries = 0
+        self._lock = threading.Lock()
+
+    def record_success(self, latency: float):
+        with self._lock:
+            self.calls += 1
+            self.latencies.append(latency)
+
+    def record_failure(self, reason: str):
+        with self._lock:
+            self.calls += 1
+            self.failures[reason] += 1
+
+    def record_retry(self):
+        with self._lock:
+            self.retries += 1
+
+    def percentile(self, pct: float):
+        with self._lock:
+            ordered = sorted(self.latencies)
+        if not ordered:
+            return None
+        return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+    def snapshot(self) -> dict:
+        p50, p95, p99 = (self.percentile(p) for p in (50, 95, 99))
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "retries": self.retries,
+                "failures": dict(self.failures),
+                "p50_ms": None if p50 is None else round(p50 * 1000),
+                "p95_ms": None if p95 is None else round(p95 * 1000),
+                "p99_ms": None if p99 is None else round(p99 * 1000),
+            }
+
+
+class GeminiClient:
+    """
+    Calls generate_content on one shared model with a per-call deadline,
+    jittered exponential retry for transient errors and a circuit breaker.
+    The model is reused for every call, so its transport (one pooled HTTP
+    session with the REST transport) is shared as well.
+    """
+
+    def __init__(self, get_model, deadline: float = 15.0, attempt_timeout: float = 8.0,
+                 max_attempts: int = 3, backoff_base: float = 0.4, backoff_max: float = 4.0,
+                 breaker: CircuitBreaker = None, metrics: CallMetrics = None, sleep=time.sleep):
+        self.get_model = get_model
+        self.deadline = deadline
+        self.attempt_timeout = attempt_timeout
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breaker = breaker or CircuitBreaker()
+        self.metrics = metrics or CallMetrics()
+        self.sleep = sleep
+
+    def backoff(self, attempt: int) -> float:
+        """Full jitter: uniform in [0, base * 2^attempt], capped"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def generate(self, contents):
+        """Blocking call; returns the response or raises the last error"""
+        return self._call(contents, stream=False)
+
+    def generate_stream(self, contents):
+        """
+        Streaming call. Retries cover the request up to its first chunk; an
+        error after that is raised to the caller (a retry would repeat speech).
+        """
+        return self._call(contents, stream=True)
+
+    def _call(self, contents, stream: bool):
+        if not self.breaker.allow():
+            self.metrics.record_failure("circuit_open")
+            raise CircuitOpenError("Gemini circuit breaker is open")
+
+        started = time.monotonic()
+        give_up_at = started + self.deadline
+        attempt = 0
+        while True:
+            remaining = give_up_at - time.monotonic()
+            try:
+                if remaining <= 0:
+                    raise DeadlineExceededError(f"no answer within {self.deadline:.0f}s")
+                # retry=None switches off the SDK's own (deadline-unaware) retry loop
+                response = self.get_model().generate_content(
+                    contents, stream=stream,
+                    request_options={"timeout": min(self.attempt_timeout, remaining), "retry": None},
+                )
+                self.breaker.record_success()
+                self.metrics.record_success(time.monotonic() - started)
+                return response
+            except Exception as e:
+                reason = failure_reason(e)
+                attempt += 1
+                pause = self.backoff(attempt - 1)
+                retry = (reason in TRANSIENT_REASONS and attempt < self.max_attempts
+                         and time.monotonic() + pause < give_up_at)
+                if retry:
+                    print(f"🔁 Gemini {reason}, retrying in {pause:.2f}s ({attempt}/{self.max_attempts - 1})")
+                    self.metrics.record_retry()
+                    self.sleep(pause)
+                    continue
+                if reason in TRANSIENT_REASONS:
+                    self.breaker.record_failure()
+                else:
+                    # The API answered (bad request, blocked prompt...): it is up
+                    self.breaker.record_success()
+                self.metrics.record_failure(reason)
+                raise
+
+    def stats(self) -> dict:
+        stats = self.metrics.snapshot()
+        stats["circuit"] = self.breaker.state
+        return stats
@@ -1,21 +1,174 @@
 import os
+import re
+import threading
 import google.generativeai as genai
 from dotenv import load_dotenv
+from core.response_cache import ResponseCache
+from core.gemini_client import GeminiClient, CircuitOpenError
+from core.tracing import log
 
 # 🧩 Load environment variables (API key from .env)
 load_dotenv()
 api_key = os.getenv("SMRITI_GEMINI_API_KEY")
 
+# 🔌 "rest" keeps one pooled keep-alive HTTP session; SMRITI_GEMINI_ENDPOINT points
+# the client elsewhere (e.g. http://127.0.0.1:8080 for a local stub server)
+GEMINI_TRANSPORT = os.getenv("SMRITI_GEMINI_TRANSPORT", "rest")
+GEMINI_ENDPOINT = os.getenv("SMRITI_GEMINI_ENDPOINT")
+
+# ⏱️ Whole-call deadline (retries included) and per-attempt timeout, in seconds
+GEMINI_DEADLINE = float(os.getenv("SMRITI_GEMINI_DEADLINE", "15"))
+GEMINI_ATTEMPT_TIMEOUT = float(os.getenv("SMRITI_GEMINI_ATTEMPT_TIMEOUT", "8"))
+
 # ⚙️ Configure Gemini API (guard missing/invalid key)
 if not api_key:
     print("[Gemini Error ⚠️] Missing SMRITI_GEMINI_API_KEY in environment/.env")
 else:
     try:
-        genai.configure(api_key=api_key)
+        genai.configure(
+            api_key=api_key,
+            transport=GEMINI_TRANSPORT,
+            client_options={"api_endpoint": GEMINI_ENDPOINT} if GEMINI_ENDPOINT else None,
+        )
         print("✅ Gemini API configured successfully")
     except Exception as e:
         print(f"[Gemini Config Error ⚠️] {e}")
 
+MODEL_NAME = "gemini-2.5-flash"
+
+# 🌀 Sent once as the system instruction instead of being prefixed to every prompt
+CONCISE_INSTRUCTION = (
+    "Answer concisely in at most one short paragraph (max 3 sentences). "
+    "Avoid long lists unless explicitly requested."
+)
+
+# Rough budget for the remembered conversation (prompt + replies)
+MAX_HISTORY_TOKENS = 1500
+
+
+def _estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token) to avoid a count_tokens round-trip"""
+    return max(1, len(text) // 4)
+
+
+class GeminiSession:
+    """
+    Keeps a single GenerativeModel alive and remembers a bounded multi-turn history.
+    The model (and the transport behind it) is created once and reused for every turn;
+    calls go through a GeminiClient for deadlines, retries and the circuit breaker.
+    """
+
+    def __init__(self, client=genai, model_name: str = MODEL_NAME,
+                 max_history_tokens: int = MAX_HISTORY_TOKENS, api: GeminiClient = None):
+        self.client = client
+        self.model_name = model_name
+        self.max_history_tokens = max_history_tokens
+        self.api = api or GeminiClient(self.get_model, deadline=GEMINI_DEADLINE,
+                                       attempt_timeout=GEMINI_ATTEMPT_TIMEOUT)
+        self._model = None
+        self._history = []  # [{"role": "user"/"model", "parts": [text]}]
+        self._history_tokens = 0
+        self._lock = threading.Lock()
+
+    def get_model(self):
+        if self._model is None:
+            self._model = self.client.GenerativeModel(
+                self.model_name, system_instruction=CONCISE_INSTRUCTION
+            )
+        return self._model
+
+    def build_contents(self, prompt: str):
+        """History plus the new user turn, as sent to generate_content"""
+        with self._lock:
+            return list(self._history) + [{"role": "user", "parts": [prompt]}]
+
+    def generate(self, prompt: str):
+        """Send one turn with the remembered context and return the raw response"""
+        return self.api.generate(self.build_contents(prompt))
+
+    def generate_stream(self, prompt: str):
+        """Streaming variant of generate(): an iterator of response chunks"""
+        return self.api.generate_stream(self.build_contents(prompt))
+
+    def remember(self, prompt: str, reply: str):
+        """Store a finished exchange and trim the oldest turns to the token budget"""
+        with self._lock:
+            for role, text in (("user", prompt), ("model", reply)):
+                self._history.append({"role": role, "parts": [text]})
+                self._history_tokens += _estimate_tokens(text)
+            # Drop whole user/model pairs so the history always starts with a user turn
+            while self._history_tokens > self.max_history_tokens and len(self._history) > 2:
+                for turn in self._history[:2]:
+                    self._history_tokens -= _estimate_tokens(turn["parts"][0])
+                del self._history[:2]
+
+    def reset(self):
+        with self._lock:
+            self._history.clear()
+            self._history_tokens = 0
+
+    @property
+    def history(self):
+        with self._lock:
+            return list(self._history)
+
+
+def _extract_text(response) -> str:
+    """Handle response safely"""
+    if hasattr(response, "text") and response.text:
+        return response.text.strip()
+    elif hasattr(response, "candidates") and response.candidates:
+        return response.candidates[0].content.parts[0].text.strip()
+    return NO_RESPONSE_TEXT
+
+
+def _apply_identity_filter(full_text: str) -> str:
+    """🚫 Identity correction filter (Smriti supremacy mode)"""
+    if any(keyword in full_text.lower() for keyword in [
+        "large language model",
+        "trained by google",
+        "gemini",
+        "ai model",
+        "google model",
+        "google assistant"
+    ]):
+        return (
+            "I am Smriti — your AI Desktop Assistant created by Sumit Vishwakarma. "
+            "I'm designed to assist you with voice commands, tasks, and conversations."
+        )
+    return full_text
+
+
+def _trim_to_paragraph(text: str, max_words: int = 120) -> str:
+    """Final safety: trim to one paragraph ~80-120 words"""
+    # Take up to the first blank-line paragraph
+    paras = [p.strip() for p in text.split("\n\n") if p.strip()]
+    first = paras[0] if paras else text.strip()
+    words = first.split()
+    if len(words) <= max_words:
+        return first
+    return " ".join(words[:max_words]) + "…"
+
+
+_session = GeminiSession()
+
+# 🗃️ Persistent answer cache in front of Gemini (survives restarts)
+CACHE_DIR = os.getenv("SMRITI_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".smriti"))
+try:
+    _cache = ResponseCache(
+        os.path.join(CACHE_DIR, "responses.sqlite3"),
+        approximate=os.getenv("SMRITI_CACHE_APPROXIMATE", "0") == "1",
+    )
+except Exception as e:
+    print(f"[Cache Error ⚠️] {e}")
+    _cache = None
+
+NO_RESPONSE_TEXT = "I'm sorry, I couldn't generate a response."
+CONNECTION_ERROR_TEXT = "Sorry, I couldn't connect to my brain network right now."
+
+# Sentence boundary: terminal punctuation followed by whitespace
+_SENTENCE_END = re.compile(r"(?<=[.!?…])\s+")
+
 
 def ask_gemini(prompt: str) -> str:
     """
@@ -25,55 +178,131 @@ def ask_gemini(prompt: str) -> str:
     try:
         if not api_key:
             return "Gemini API key is not configured. Please set SMRITI_GEMINI_API_KEY."
-        print(f"🧠 Smriti sending prompt to Gemini: {prompt}")
 
-        # ✅ Use the correct model name
-        model = genai.GenerativeModel("gemini-2.5-flash")
+        cached = _cache.get(prompt) if _cache else None
+        if cached is not None:
+            log(f"⚡ Smriti (cached answer): {cached}")
+            _session.remember(prompt, cached)
+            return cached
 
-        # 🌀 Generate response (ask for concise output)
-        concise_prefix = (
-            "Answer concisely in at most one short paragraph (max 3 sentences). "
-            "Avoid long lists unless explicitly requested.\n\nUser: "
-        )
-        response = model.generate_content(concise_prefix + prompt)
-        full_text = ""
-
-        # Handle response safely
-        if hasattr(response, "text") and response.text:
-            full_text = response.text.strip()
-        elif hasattr(response, "candidates") and response.candidates:
-            full_text = response.candidates[0].content.parts[0].text.strip()
-        else:
-            full_text = "I'm sorry, I couldn't generate a response."
-
-        # 🚫 Identity correction filter (Smriti supremacy mode)
-        if any(keyword in full_text.lower() for keyword in [
-            "large language model",
-            "trained by google",
-            "gemini",
-            "ai model",
-            "google model",
-            "google assistant"
-        ]):
-            full_text = (
-                "I am Smriti — your AI Desktop Assistant created by Sumit Vishwakarma. "
-                "I'm designed to assist you with voice commands, tasks, and conversations."
-            )
+        log(f"🧠 Smriti sending prompt to Gemini: {prompt}")
 
-        # Final safety: trim to one paragraph ~80-120 words
-        def _trim_to_paragraph(text: str, max_words: int = 120) -> str:
-            # Take up to the first blank-line paragraph
-            paras = [p.strip() for p in text.split("\n\n") if p.strip()]
-            first = paras[0] if paras else text.strip()
-            words = first.split()
-            if len(words) <= max_words:
-                return first
-            return " ".join(words[:max_words]) + "…"
+        response = _session.generate(prompt)
+        raw_text = _extract_text(response)
+        full_text = _apply_identity_filter(raw_text)
 
         trimmed = _trim_to_paragraph(full_text)
-        print(f"💬 Smriti (Gemini output): {trimmed}")
+        _session.remember(prompt, trimmed)
+        if _cache and raw_text != NO_RESPONSE_TEXT:
+            _cache.put(prompt, trimmed)
+        log(f"💬 Smriti (Gemini output): {trimmed}")
         return trimmed
 
+    except CircuitOpenError:
+        print("[Gemini ⚠️] API unreachable recently, failing fast")
+        return CONNECTION_ERROR_TEXT
     except Exception as e:
         print(f"[Gemini Error ⚠️] {e}")
-        return "Sorry, I couldn't connect to my brain network right now."
\ No newline at end of file
+        return CONNECTION_ERROR_TEXT
+
+
+def _split_sentences(buffer: str):
+    """Split off complete sentences; returns (sentences, unfinished remainder)"""
+    parts = _SENTENCE_END.split(buffer)
+    return [p.strip() for p in parts[:-1] if p.strip()], parts[-1]
+
+
+def remember_answer(prompt: str, reply: str, completed: bool = True):
+    """Record a finished exchange in the chat history and, if complete, the cache"""
+    _session.remember(prompt, reply)
+    # Only complete answers are cached; a stop() mid-stream leaves a partial one
+    if completed and _cache:
+        _cache.put(prompt, reply)
+
+
+def ask_gemini_stream(prompt: str, max_words: int = 120, on_finish=remember_answer):
+    """
+    Streaming variant of ask_gemini: yields the answer sentence by sentence as
+    Gemini produces it, so speech can start before the full reply exists.
+    on_finish(prompt, reply, completed) records the answer; speculative calls
+    pass their own so an unused answer never reaches the history.
+    """
+    if not api_key:
+        yield "Gemini API key is not configured. Please set SMRITI_GEMINI_API_KEY."
+        return
+
+    cached = _cache.get(prompt) if _cache else None
+    if cached is not None:
+        log(f"⚡ Smriti (cached answer): {cached}")
+        on_finish(prompt, cached, False)
+        sentences, rest = _split_sentences(cached)
+        yield from sentences + ([rest.strip()] if rest.strip() else [])
+        return
+
+    log(f"🧠 Smriti streaming prompt to Gemini: {prompt}")
+
+    spoken = []
+    completed = False
+    word_count = 0
+    buffer = ""
+    try:
+        response = _session.generate_stream(prompt)
+        for chunk in response:
+            text = getattr(chunk, "text", "") or ""
+            # Only the first paragraph is spoken (same rule as _trim_to_paragraph)
+            done = "\n\n" in text
+            buffer += text.split("\n\n", 1)[0] if done else text
+            sentences, buffer = _split_sentences(buffer)
+            if done and buffer.strip():
+                sentences.append(buffer.strip())
+                buffer = ""
+            for sentence in sentences:
+                filtered = _apply_identity_filter(sentence)
+                if filtered != sentence:
+                    # Identity leak: replace the rest of the answer with Smriti's intro
+                    spoken = [filtered]
+                    completed = True
+                    yield filtered
+                    return
+                spoken.append(sentence)
+                word_count += len(sentence.split())
+                if word_count >= max_words:
+                    completed = True
+                yield sentence
+                if completed:
+                    return
+            if done:
+                completed = True
+                return
+        if buffer.strip():
+            spoken.append(buffer.strip())
+            yield buffer.strip()
+        if not spoken:
+            yield NO_RESPONSE_TEXT
+            return
+        completed = True
+    except CircuitOpenError:
+        print("[Gemini ⚠️] API unreachable recently, failing fast")
+        yield CONNECTION_ERROR_TEXT
+    except Exception as e:
+        print(f"[Gemini Error ⚠️] {e}")
+        if not spoken:
+            yield CONNECTION_ERROR_TEXT
+    finally:
+        if spoken:
+            on_finish(prompt, " ".join(spoken), completed)
+
+
+def reset_conversation():
+    """Forget the remembered chat history"""
+    _session.reset()
+
+
+def cache_stats() -> dict:
+    """Hit/miss counters of the response cache (for tuning)"""
+    return _cache.stats() if _cache else {}
+
+
+def api_stats() -> dict:
+    """Gemini call latency percentiles, retries, failures by reason and circuit state"""
+    return _session.api.stats()
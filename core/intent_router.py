@@ -0,0 +1,229 @@
+import re
+from collections import deque
+from typing import Optional
+
+from core.website_resolver import BUILTIN_SITES, SEARCH_TEMPLATES
+
+_TOKEN = re.compile(r"[a-z0-9']+")
+
+
+def tokenize(text: str):
+    return _TOKEN.findall(text.lower())
+
+
+class PhraseMatcher:
+    """
+    Aho-Corasick automaton over word tokens: finds every keyword phrase of every
+    table in one left-to-right pass, and only on whole-word boundaries
+    ("start" never matches "restart", "bas" never matches "basic").
+    """
+
+    def __init__(self):
+        self._goto = [{}]     # state -> {token: next state}
+        self._fail = [0]
+        self._output = [[]]   # state -> [(length, table, value)]
+        self._built = False
+
+    def add(self, phrase: str, table: str, value: str = None):
+        tokens = tokenize(phrase)
+        if not tokens:
+            return
+        state = 0
+        for token in tokens:
+            nxt = self._goto[state].get(token)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][token] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = nxt
+        self._output[state].append((len(tokens), table, value if value is not None else phrase))
+        self._built = False
+
+    def add_table(self, table: str, phrases):
+        """phrases: list of phrases, or {canonical value: [synonyms]}"""
+        if isinstance(phrases, dict):
+            for value, synonyms in phrases.items():
+                for phrase in synonyms:
+                    self.add(phrase, table, value)
+        else:
+            for phrase in phrases:
+                self.add(phrase, table)
+
+    def build(self):
+        """Compute failure links (breadth first)"""
+        queue = deque()
+        for state in self._goto[0].values():
+            self._fail[state] = 0
+            queue.append(state)
+        while queue:
+            current = queue.popleft()
+            for token, nxt in self._goto[current].items():
+                queue.append(nxt)
+                fallback = self._fail[current]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(token, 0)
+                self._output[nxt] = self._output[nxt] + self._output[self._fail[nxt]]
+        self._built = True
+
+    def find_all(self, tokens):
+        """All matches as (start, end, table, value), end exclusive, in token order"""
+        if not self._built:
+            self.build()
+        matches = []
+        state = 0
+        for i, token in enumerate(tokens):
+            while state and token not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(token, 0)
+            for length, table, value in self._output[state]:
+                matches.append((i + 1 - length, i + 1, table, value))
+        matches.sort(key=lambda m: (m[0], -(m[1] - m[0])))
+        return matches
+
+    def find(self, tokens):
+        """Leftmost-longest, non-overlapping matches ("google chrome" wins over "google")"""
+        chosen = []
+        taken_until = 0
+        # find_all() orders by start, longest first
+        for match in self.find_all(tokens):
+            if match[0] >= taken_until:
+                chosen.append(match)
+                taken_until = match[1]
+        return chosen
+
+    def contains(self, text: str, table: str = None) -> bool:
+        return any(table is None or m[2] == table for m in self.find(tokenize(text)))
+
+
+class Intent:
+    """Result of routing one command"""
+
+    def __init__(self, name: str, keyword: str, target: Optional[str] = None,
+                 target_kind: Optional[str] = None, remainder: str = ""):
+        self.name = name                # e.g. "stop", "launch", "close"
+        self.keyword = keyword          # phrase that triggered it
+        self.target = target            # canonical app/site name
+        self.target_kind = target_kind  # "app" or "site"
+        self.remainder = remainder      # words after the trigger ("open <remainder>")
+
+    def __repr__(self):
+        return f"Intent({self.name!r}, keyword={self.keyword!r}, target={self.target!r}, remainder={self.remainder!r})"
+
+
+# Politeness before a command word: "please search ...", "hey smriti can you search ..."
+_LEADING_FILLER = {"please", "hey", "ok", "okay", "smriti", "can", "could", "would", "will", "you", "i", "want", "to"}
+
+
+class IntentRouter:
+    """
+    Routes a command to the highest-priority intent whose trigger table matched,
+    with the app/site slot extracted from the same single scan.
+    """
+
+    def __init__(self, intents, slots=None, anchored=None):
+        """
+        intents: ordered list of (intent name, phrases) - earlier wins
+        slots: {slot kind: {canonical value: [synonyms]}}
+        anchored: {intent name: accepts(keyword, remainder) or None} - these intents
+            trigger only at the start of the command, unless accepts() says otherwise
+        """
+        self.priority = [name for name, _ in intents]
+        self.slot_kinds = set(slots or {})
+        self.anchored = dict(anchored or {})
+        self.matcher = PhraseMatcher()
+        for name, phrases in intents:
+            self.matcher.add_table(name, phrases)
+        for kind, table in (slots or {}).items():
+            self.matcher.add_table(kind, table)
+        self.matcher.build()
+
+    def route(self, command: str) -> Optional[Intent]:
+        tokens = tokenize(command)
+        matches = self.matcher.find(tokens)
+        if not matches:
+            return None
+        slot = next((m for m in matches if m[2] in self.slot_kinds), None)
+        triggers = {}
+        for match in matches:
+            if match[2] not in self.slot_kinds:
+                triggers.setdefault(match[2], match)
+        for name in self.priority:
+            trigger = triggers.get(name)
+            if trigger is None:
+                continue
+            remainder = " ".join(tokens[trigger[1]:])
+            if name in self.anchored and not self._at_start(tokens, trigger[0]):
+                accepts = self.anchored[name]
+                if accepts is None or not accepts(trigger[3], remainder):
+                    continue
+            return Intent(name, trigger[3],
+                          target=slot[3] if slot else None,
+                          target_kind=slot[2] if slot else None,
+                          remainder=remainder)
+        return None
+
+    @staticmethod
+    def _at_start(tokens, start: int) -> bool:
+        return all(token in _LEADING_FILLER for token in tokens[:start])
+
+
+# 🧭 Command tables used by brain.process_command (priority order)
+INTENT_TABLES = [
+    ("stop", ["stop", "ruko", "exit", "chup", "mute", "shut up", "bas"]),
+    ("identity", ["who are you", "what is your name", "introduce yourself", "tum kaun ho"]),
+    ("launch", ["open", "launch", "start", "run", "kholo", "chalu"]),
+    ("close", ["close", "band", "band karo", "band ho", "quit", "stop app", "shutdown app", "exit app"]),
+    ("search", ["search", "search for", "look up"]),
+]
+
+APP_SLOTS = {
+    "chrome": ["chrome", "google chrome", "browser", "web browser", "internet"],
+    "firefox": ["firefox", "mozilla", "mozilla firefox"],
+    "edge": ["edge", "microsoft edge"],
+    "notepad": ["notepad"],
+    "calculator": ["calculator", "calc"],
+    "file explorer": ["file explorer", "explorer"],
+    "command prompt": ["command prompt", "command", "terminal", "cmd"],
+    "vs code": ["vs code", "vscode", "visual studio code", "code"],
+}
+
+# Same names the website resolver knows, so "open gmail" and "open youtube" take one path
+SITE_SLOTS = {name: words for name, (_, words) in BUILTIN_SITES.items()}
+
+_SEARCH_ON_SITE = re.compile(r"^.+ (?:on|in) (\w+(?: \w+)?)$")
+
+
+def _names_search_site(keyword: str, remainder: str) -> bool:
+    """ "... search cats on youtube": mid-sentence "search" counts only with a searchable site"""
+    match = _SEARCH_ON_SITE.match(remainder)
+    return bool(match) and any(site in SEARCH_TEMPLATES and (match.group(1) == site or match.group(1) in words)
+                               for site, (_, words) in BUILTIN_SITES.items())
+
+
+# Hindi verbs follow their object: "chrome kholo", "ab chup"
+_VERBS_LAST = {"kholo", "chalu", "ruko", "chup", "bas"}
+
+
+def _verb_last(keyword: str, remainder: str) -> bool:
+    return keyword in _VERBS_LAST and not remainder
+
+
+# Mid-sentence these words are mostly a topic, not a request: "how binary search works",
+# "what does exit velocity mean", "how do i run a marathon", "should i start a business"
+ANCHORED_INTENTS = {"search": _names_search_site, "stop": _verb_last, "launch": _verb_last}
+
+_router = None
+
+
+def get_router() -> IntentRouter:
+    global _router
+    if _router is None:
+        _router = IntentRouter(INTENT_TABLES, {"app": APP_SLOTS, "site": SITE_SLOTS}, ANCHORED_INTENTS)
+    return _router
+
+
+def route(command: str) -> Optional[Intent]:
+    return get_router().route(command)
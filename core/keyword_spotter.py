@@ -0,0 +1,124 @@
+import json
+import re
+import time
+
+from core.intent_router import route
+
+# 🛑 Words that cut Smriti off mid-sentence
+STOP_KEYWORDS = ["stop", "ruko", "chup", "mute", "bas", "shut up", "wait", "wait stop"]
+
+# 🔌 Words that close Smriti entirely
+SHUTDOWN_KEYWORDS = [
+    "shutdown", "shut down", "exit", "close", "band hojao",
+    "band ho jao", "band ho", "band karo", "goodbye", "bye"
+]
+
+KIND_STOP = "stop"
+KIND_SHUTDOWN = "shutdown"
+
+# Shutdown words that may begin an app command ("close spotify"): mid-speech they only interrupt
+APP_COMMAND_WORDS = {"close", "exit"}
+# What may follow "close" when it still means Smriti itself ("close yourself", "close the app")
+SELF_WORDS = {"smriti", "yourself", "you", "the", "app", "window", "assistant", "now", "please"}
+
+
+def _phrase_pattern(phrases):
+    """Whole-word regex over all phrases, longest first so "shut down" beats "shut" """
+    ordered = sorted(set(phrases), key=len, reverse=True)
+    return re.compile(r"\b(" + "|".join(re.escape(p) for p in ordered) + r")\b")
+
+
+def keyword_kinds(stop_keywords=STOP_KEYWORDS, shutdown_keywords=SHUTDOWN_KEYWORDS):
+    """phrase -> kind; a phrase in both lists counts as stop"""
+    kinds = {p: KIND_SHUTDOWN for p in shutdown_keywords}
+    kinds.update({p: KIND_STOP for p in stop_keywords})
+    return kinds
+
+
+_DEFAULT_KINDS = keyword_kinds()
+_DEFAULT_PATTERN = _phrase_pattern(_DEFAULT_KINDS)
+
+
+def match_keyword(text: str):
+    """(kind, phrase) for the first whole-word stop/shutdown phrase in a transcript, or None"""
+    found = _DEFAULT_PATTERN.search(text.lower())
+    if not found:
+        return None
+    return _DEFAULT_KINDS[found.group(1)], found.group(1)
+
+
+def command_keyword(command: str):
+    """
+    match_keyword for a whole transcript: a close aimed at anything but
+    Smriti ("close spotify", "firefox band karo", "exit chrome") is an app
+    command for the brain, not a shutdown.
+    """
+    keyword = match_keyword(command)
+    if keyword is None or keyword[0] == KIND_STOP:
+        return keyword
+    intent = route(command)
+    if intent and (intent.target or intent.name == "close" and
+                   any(word not in SELF_WORDS for word in intent.remainder.split())):
+        return None
+    return keyword
+
+
+class KeywordSpotter:
+    """
+    Streams live microphone frames into a grammar-restricted offline recognizer
+    and fires on_keyword(kind, phrase) as soon as a partial result contains a
+    stop or shutdown phrase, without waiting for the end of the utterance.
+    """
+
+    def __init__(self, model, sample_rate: int, on_keyword, is_active=lambda: True,
+                 stop_keywords=STOP_KEYWORDS, shutdown_keywords=SHUTDOWN_KEYWORDS,
+                 clock=time.perf_counter):
+        import vosk
+
+        self.on_keyword = on_keyword
+        self.is_active = is_active
+        self.clock = clock  # replaced by the audio position when replaying recordings
+        self.kinds = keyword_kinds(stop_keywords, shutdown_keywords)
+        self._pattern = _phrase_pattern(self.kinds)
+        # Restricting the grammar keeps decoding cheap and avoids near-miss words
+        grammar = json.dumps(sorted(self.kinds) + ["[unk]"])
+        self._recognizer = vosk.KaldiRecognizer(model, sample_rate, grammar)
+        self._speech_started = None
+        self.last_latency = None  # seconds from speech onset to detection
+
+    def match(self, text: str):
+        """Return (kind, phrase) for the first keyword in text, or None"""
+        found = self._pattern.search(text.lower())
+        if not found:
+            return None
+        return self.kinds[found.group(1)], found.group(1)
+
+    def feed(self, frame: bytes, is_speech: bool):
+        """CaptureEngine frame listener"""
+        if not self.is_active():
+            if self._speech_started is not None:
+                self._reset()
+            return
+        if self._speech_started is None:
+            if not is_speech:
+                return
+            self._speech_started = self.clock()
+
+        if self._recognizer.AcceptWaveform(frame):
+            text = json.loads(self._recognizer.Result()).get("text", "")
+            utterance_ended = True
+        else:
+            text = json.loads(self._recognizer.PartialResult()).get("partial", "")
+            utterance_ended = False
+
+        hit = self.match(text) if text else None
+        if hit:
+            self.last_latency = self.clock() - self._speech_started
+            self._reset()
+            self.on_keyword(*hit)
+        elif utterance_ended:
+            self._reset()
+
+    def _reset(self):
+        self._recognizer.Reset()
+        self._speech_started = None
@@ -0,0 +1,385 @@
+import ast
+import math
+import operator
+import os
+import platform
+import re
+import shutil
+import threading
+from datetime import datetime
+
+from core.intent_router import tokenize
+
+# 📚 Example utterances per skill (the classifier's whole training set)
+TRAINING_EXAMPLES = {
+    "clock": [
+        "what time is it", "what is the time", "tell me the time", "current time",
+        "time in tokyo", "what time is it in london", "time kya hua", "kitne baje hai",
+        "what's the time now",
+    ],
+    "date": [
+        "what is the date today", "what's today's date", "what day is it today",
+        "which day is today", "aaj ki date", "today's date", "what is the day",
+    ],
+    "calculator": [
+        "what is 5 plus 7", "calculate 12 times 4", "what is 100 divided by 8",
+        "25 minus 9", "square root of 81", "15 percent of 200", "multiply 6 by 7",
+        "what is 2 to the power 10", "compute 3 into 4",
+    ],
+    "convert": [
+        "convert 5 km to miles", "how many pounds in 3 kg", "100 fahrenheit in celsius",
+        "convert 2 liters to gallons", "10 inches to cm", "how many meters is 6 feet",
+        "30 degrees celsius to fahrenheit",
+    ],
+    "sysinfo": [
+        "system info", "which operating system am i using", "how many cpu cores",
+        "how much disk space is free", "how much memory is free", "battery status",
+        "what is my computer name", "system information",
+    ],
+}
+
+MIN_SIMILARITY = 0.3
+
+CITY_TIMEZONES = {
+    "tokyo": "Asia/Tokyo", "japan": "Asia/Tokyo", "london": "Europe/London",
+    "uk": "Europe/London", "new york": "America/New_York", "paris": "Europe/Paris",
+    "berlin": "Europe/Berlin", "dubai": "Asia/Dubai", "singapore": "Asia/Singapore",
+    "sydney": "Australia/Sydney", "delhi": "Asia/Kolkata", "mumbai": "Asia/Kolkata",
+    "india": "Asia/Kolkata", "los angeles": "America/Los_Angeles",
+    "california": "America/Los_Angeles", "chicago": "America/Chicago",
+    "beijing": "Asia/Shanghai", "china": "Asia/Shanghai", "moscow": "Europe/Moscow",
+}
+
+
+class IntentClassifier:
+    """TF-IDF bag-of-words classifier: cosine similarity to each skill's centroid"""
+
+    def __init__(self, examples):
+        docs = [(label, tokenize(text)) for label, texts in examples.items() for text in texts]
+        df = {}
+        for _, tokens in docs:
+            for token in set(tokens):
+                df[token] = df.get(token, 0) + 1
+        self.idf = {t: math.log((1 + len(docs)) / (1 + n)) + 1 for t, n in df.items()}
+        centroids = {}
+        for label, tokens in docs:
+            centroid = centroids.setdefault(label, {})
+            for token, weight in self._vector(tokens).items():
+                centroid[token] = centroid.get(token, 0.0) + weight
+        self.centroids = {label: self._normalize(vec) for label, vec in centroids.items()}
+
+    @staticmethod
+    def _normalize(vec):
+        norm = math.sqrt(sum(w * w for w in vec.values())) or 1.0
+        return {t: w / norm for t, w in vec.items()}
+
+    def _vector(self, tokens):
+        vec = {}
+        for token in tokens:
+            # Numbers only matter as "a number was said"
+            token = "<num>" if token.replace(".", "", 1).isdigit() else token
+            if token in self.idf or token == "<num>":
+                vec[token] = vec.get(token, 0.0) + self.idf.get(token, 1.0)
+        return self._normalize(vec)
+
+    def classify(self, text: str):
+        """(label, similarity) of the best skill, or (None, 0.0)"""
+        vec = self._vector(tokenize(text))
+        best, best_score = None, 0.0
+        for label, centroid in self.centroids.items():
+            score = sum(w * centroid.get(t, 0.0) for t, w in vec.items())
+            if score > best_score:
+                best, best_score = label, score
+        return best, best_score
+
+
+# ---------------------------------------------------------------- skills
+
+
+# "the time" must end the question or be followed by now/in/at, never by a noun ("time complexity")
+_TIME_END = r"(?=\s*$|\s+(?:now|right now|please|in|at)\b)"
+_TIME_QUESTION = re.compile(
+    rf"\b(what(?:'s| is)? (?:the )?time{_TIME_END}|what time is it|time (?:is it|now)\b|^time (?:in|at) |current time{_TIME_END}"
+    rf"|tell me the time{_TIME_END}|kitne baje|time kya)"
+)
+_DATE_QUESTION = re.compile(
+    r"\b(today'?s date|date (?:is it )?today|(?:date|day) is (?:it|today)\b(?! on| in)|which day is today"
+    r"|current date|aaj ki date|aaj kya date|what(?:'s| is) (?:the )?(?:date|day)(?: today| now)?\s*$)"
+)
+
+
+def _clock(command: str):
+    if not _TIME_QUESTION.search(command):
+        return None  # "time" in some other sense ("the time machine movie")
+    place = next((c for c in sorted(CITY_TIMEZONES, key=len, reverse=True)
+                  if re.search(rf"\b{c}\b", command)), None)
+    if place is None:
+        return f"It's {datetime.now().strftime('%I:%M %p').lstrip('0')}."
+    try:
+        from zoneinfo import ZoneInfo
+
+        now = datetime.now(ZoneInfo(CITY_TIMEZONES[place]))
+    except Exception:
+        return None  # no tz database here - let Gemini answer
+    return f"It's {now.strftime('%I:%M %p').lstrip('0')} in {place.title()}."
+
+
+def _date(command: str):
+    if not _DATE_QUESTION.search(command):
+        return None  # a date or day of something else ("what day is christmas")
+    return f"Today is {datetime.now().strftime('%A, %d %B %Y')}."
+
+
+_OPERATOR_WORDS = [
+    (r"\bmultiplied by\b|\btimes\b|\binto\b|\bx\b|×", "*"),
+    (r"\bdivided by\b|\bover\b|÷", "/"),
+    (r"\bplus\b|\badd\b", "+"),
+    (r"\bminus\b|\bsubtract\b", "-"),
+    (r"\bto the power(?: of)?\b|\braised to\b|\^", "**"),
+    (r"\bmod(?:ulo)?\b", "%"),
+]
+
+# Arithmetic has to be asked for: a bare number pair elsewhere ("who won 3 - 1 yesterday") is no sum
+_MATH_REQUEST = re.compile(
+    r"^(?:what(?:'s| is)|whats|how much is)\b|\b(?:calculate|compute|solve|evaluate|multiply|divide|add|subtract)\b"
+)
+
+_BIN_OPS = {
+    ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul,
+    ast.Div: operator.truediv, ast.Pow: operator.pow, ast.Mod: operator.mod,
+}
+
+
+def _safe_eval(node):
+    if isinstance(node, ast.Expression):
+        return _safe_eval(node.body)
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+        return node.value
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+        value = _safe_eval(node.operand)
+        return -value if isinstance(node.op, ast.USub) else value
+    if isinstance(node, ast.BinOp) and type(node.op) in _BIN_OPS:
+        left, right = _safe_eval(node.left), _safe_eval(node.right)
+        if isinstance(node.op, ast.Pow) and abs(right) > 100:
+            raise ValueError("exponent too large")
+        return _BIN_OPS[type(node.op)](left, right)
+    raise ValueError("unsupported expression")
+
+
+def _format_number(value) -> str:
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    if isinstance(value, float):
+        return f"{value:.6g}"
+    return f"{value:,}" if abs(value) >= 10000 else str(value)
+
+
+def _calculator(command: str):
+    text = command.lower().replace(",", "")
+    m = re.search(r"square root of (-?\d+(?:\.\d+)?)", text)
+    if m:
+        value = float(m.group(1))
+        return None if value < 0 else f"The square root of {m.group(1)} is {_format_number(math.sqrt(value))}."
+    m = re.search(r"(\d+(?:\.\d+)?) ?(?:percent|%) of (\d+(?:\.\d+)?)", text)
+    if m:
+        result = float(m.group(1)) * float(m.group(2)) / 100
+        return f"{m.group(1)} percent of {m.group(2)} is {_format_number(result)}."
+    asked = _MATH_REQUEST.search(text.strip())
+    m = re.search(r"multiply (\d+(?:\.\d+)?) (?:by|and|with) (\d+(?:\.\d+)?)", text)
+    if m:
+        text = f"{m.group(1)} * {m.group(2)}"
+    for pattern, symbol in _OPERATOR_WORDS:
+        text = re.sub(pattern, f" {symbol} ", text)
+    expression = re.search(r"[-(]*\d[\d.\s+\-*/%()]*", text)
+    if not expression or not re.search(r"\d\s*(\*\*|[+\-*/%])\s*[-(]*\d", expression.group(0)):
+        return None
+    expr = expression.group(0).strip()
+    # Without "what is"/"calculate", only a command that is nothing but the sum ("25 minus 9")
+    if not asked and " ".join(text.split()) != " ".join(expr.split()):
+        return None
+    try:
+        result = _safe_eval(ast.parse(expr, mode="eval"))
+    except (SyntaxError, ValueError, ZeroDivisionError, OverflowError):
+        return None
+    spoken = expr
+    for symbol, words in (("**", " to the power "), ("*", " times "), ("/", " divided by "),
+                          ("+", " plus "), ("-", " minus ")):
+        spoken = spoken.replace(symbol, words)
+    return f"{' '.join(spoken.split())} is {_format_number(result)}."
+
+
+# unit -> (dimension, factor to the base unit)
+_UNITS = {
+    "km": ("length", 1000.0), "kilometer": ("length", 1000.0), "kilometre": ("length", 1000.0),
+    "m": ("length", 1.0), "meter": ("length", 1.0), "metre": ("length", 1.0),
+    "cm": ("length", 0.01), "centimeter": ("length", 0.01), "mm": ("length", 0.001),
+    "mile": ("length", 1609.344), "yard": ("length", 0.9144),
+    "foot": ("length", 0.3048), "feet": ("length", 0.3048), "ft": ("length", 0.3048),
+    "inch": ("length", 0.0254), "inches": ("length", 0.0254),
+    "kg": ("mass", 1.0), "kilogram": ("mass", 1.0), "gram": ("mass", 0.001), "g": ("mass", 0.001),
+    "pound": ("mass", 0.45359237), "lb": ("mass", 0.45359237), "lbs": ("mass", 0.45359237),
+    "ounce": ("mass", 0.028349523125), "oz": ("mass", 0.028349523125),
+    "liter": ("volume", 1.0), "litre": ("volume", 1.0), "l": ("volume", 1.0),
+    "ml": ("volume", 0.001), "milliliter": ("volume", 0.001),
+    "gallon": ("volume", 3.785411784), "cup": ("volume", 0.2365882365),
+    "celsius": ("temperature", None), "c": ("temperature", None),
+    "fahrenheit": ("temperature", None), "f": ("temperature", None),
+    "kelvin": ("temperature", None), "k": ("temperature", None),
+}
+_TEMPERATURE_NAMES = {"c": "celsius", "f": "fahrenheit", "k": "kelvin"}
+
+
+def _unit(word: str):
+    word = word.lower().rstrip(".")
+    if word in _UNITS:
+        return word
+    if word.endswith("s") and word[:-1] in _UNITS:
+        return word[:-1]
+    if word.endswith("es") and word[:-2] in _UNITS:
+        return word[:-2]
+    return None
+
+
+def _to_kelvin(value, unit):
+    unit = _TEMPERATURE_NAMES.get(unit, unit)
+    if unit == "celsius":
+        return value + 273.15
+    if unit == "fahrenheit":
+        return (value - 32) * 5 / 9 + 273.15
+    return value
+
+
+def _from_kelvin(value, unit):
+    unit = _TEMPERATURE_NAMES.get(unit, unit)
+    if unit == "celsius":
+        return value - 273.15
+    if unit == "fahrenheit":
+        return (value - 273.15) * 9 / 5 + 32
+    return value
+
+
+def _convert(command: str):
+    text = command.lower().replace("degrees", "").replace("degree", "")
+    # "5 km to miles" / "how many pounds in 3 kg"
+    m = re.search(r"(-?\d+(?:\.\d+)?)\s*([a-z]+)\s+(?:to|in|into)\s+([a-z]+)", text)
+    if m:
+        value, src_word, dst_word = float(m.group(1)), m.group(2), m.group(3)
+    else:
+        m = re.search(r"how many ([a-z]+) (?:in|is|are) (-?\d+(?:\.\d+)?)\s*([a-z]+)", text)
+        if not m:
+            return None
+        value, src_word, dst_word = float(m.group(2)), m.group(3), m.group(1)
+    src, dst = _unit(src_word), _unit(dst_word)
+    if not src or not dst or _UNITS[src][0] != _UNITS[dst][0]:
+        return None
+    if _UNITS[src][0] == "temperature":
+        result = _from_kelvin(_to_kelvin(value, src), dst)
+        src_word, dst_word = _TEMPERATURE_NAMES.get(src, src), _TEMPERATURE_NAMES.get(dst, dst)
+    else:
+        result = value * _UNITS[src][1] / _UNITS[dst][1]
+    # Units are echoed the way they were said ("5 km is 3.1069 miles")
+    return f"{_format_number(value)} {src_word} is {_format_number(round(result, 4))} {dst_word}."
+
+
+# About this machine, not the topic in general ("explain the operating system")
+_SYSINFO_QUESTION = re.compile(
+    r"\b(my|i|am i|do i|this (?:computer|machine|pc|laptop)|system info(?:rmation)?|how (?:much|many)"
+    r"|free|left|status)\b"
+)
+
+
+def _sysinfo(command: str):
+    if not _SYSINFO_QUESTION.search(command):
+        return None
+    facts = []
+    if re.search(r"\b(os|operating system|system)\b", command):
+        facts.append(f"You're running {platform.system()} {platform.release()}")
+    if re.search(r"\b(computer name|hostname|machine name)\b", command):
+        facts.append(f"this computer is called {platform.node()}")
+    if re.search(r"\b(cpu|processor|cores?)\b", command) or "system" in command:
+        cores = os.cpu_count() or 1
+        facts.append(f"it has {cores} CPU core{'s' if cores != 1 else ''}")
+    if re.search(r"\b(disk|storage|space)\b", command) or "system" in command:
+        usage = shutil.disk_usage(os.path.expanduser("~"))
+        facts.append(f"{usage.free / 1e9:.0f} GB of disk space is free")
+    if re.search(r"\b(memory|ram|battery)\b", command):
+        try:
+            import psutil
+
+            if "battery" in command:
+                battery = psutil.sensors_battery()
+                if battery is not None:
+                    facts.append(f"battery is at {battery.percent:.0f}%"
+                                 + (" and charging" if battery.power_plugged else ""))
+            else:
+                facts.append(f"{psutil.virtual_memory().available / 1e9:.1f} GB of memory is free")
+        except Exception:
+            pass
+    if not facts:
+        return None
+    sentence = ", ".join(facts)
+    return sentence[0].upper() + sentence[1:] + "."
+
+
+SKILLS = {
+    "clock": _clock,
+    "date": _date,
+    "calculator": _calculator,
+    "convert": _convert,
+    "sysinfo": _sysinfo,
+}
+
+
+class LocalSkills:
+    """Answers simple commands on-device; anything it can't handle goes to Gemini"""
+
+    def __init__(self, examples=TRAINING_EXAMPLES, skills=SKILLS, min_similarity: float = MIN_SIMILARITY):
+        self.classifier = IntentClassifier(examples)
+        self.skills = skills
+        self.min_similarity = min_similarity
+        self.routed = {name: 0 for name in skills}
+        self.fallbacks = 0
+        self._lock = threading.Lock()
+
+    def answer(self, command: str, count: bool = True):
+        """Local reply for command, or None to fall back to Gemini (count=False: dry run for stats)"""
+        label, score = self.classifier.classify(command)
+        reply = None
+        if label and score >= self.min_similarity:
+            try:
+                reply = self.skills[label](command.lower())
+            except Exception as e:
+                print(f"[⚠️] Local skill '{label}' failed: {e}")
+        if not count:
+            return reply
+        with self._lock:
+            if reply:
+                self.routed[label] += 1
+            else:
+                self.fallbacks += 1
+        return reply
+
+    def stats(self) -> dict:
+        with self._lock:
+            routed = sum(self.routed.values())
+            total = routed + self.fallbacks
+            return {
+                "routed": dict(self.routed),
+                "routed_total": routed,
+                "fallbacks": self.fallbacks,
+                "local_share": routed / total if total else 0.0,
+            }
+
+
+_skills = None
+
+
+def answer_locally(command: str, count: bool = True):
+    global _skills
+    if _skills is None:
+        _skills = LocalSkills()
+    return _skills.answer(command, count)
+
+
+def skill_stats() -> dict:
+    return _skills.stats() if _skills else {}
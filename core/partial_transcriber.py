@@ -0,0 +1,65 @@
+import json
+
+
+class PartialTranscriber:
+    """
+    Streams live microphone frames into an offline recognizer while the user
+    speaks and calls on_stable(text) whenever the partial transcript has stopped
+    changing for stable_ms (and once more with the recognizer's final text).
+    Used to start work on a command before the utterance has ended.
+    """
+
+    def __init__(self, model, sample_rate: int, on_stable, is_active=lambda: True,
+                 stable_ms: int = 300, min_words: int = 2):
+        import vosk
+
+        self.sample_rate = sample_rate
+        self.on_stable = on_stable
+        self.is_active = is_active
+        self.stable_ms = stable_ms
+        self.min_words = min_words
+        self._recognizer = vosk.KaldiRecognizer(model, sample_rate)
+        self._in_utterance = False
+        self._partial = ""
+        self._unchanged_ms = 0.0
+        self._emitted = ""
+
+    def feed(self, frame: bytes, is_speech: bool):
+        """CaptureEngine frame listener"""
+        if not self.is_active():
+            if self._in_utterance:
+                self._reset()
+            return
+        if not self._in_utterance:
+            if not is_speech:
+                return
+            self._in_utterance = True
+
+        frame_ms = len(frame) / 2 / self.sample_rate * 1000
+        if self._recognizer.AcceptWaveform(frame):
+            # The recognizer's own endpointer closed the utterance
+            self._emit(json.loads(self._recognizer.Result()).get("text", ""))
+            self._reset()
+            return
+
+        partial = json.loads(self._recognizer.PartialResult()).get("partial", "")
+        if partial != self._partial:
+            self._partial = partial
+            self._unchanged_ms = 0.0
+            return
+        self._unchanged_ms += frame_ms
+        if self._unchanged_ms >= self.stable_ms:
+            self._emit(partial)
+
+    def _emit(self, text: str):
+        text = text.strip()
+        if text and text != self._emitted and len(text.split()) >= self.min_words:
+            self._emitted = text
+            self.on_stable(text)
+
+    def _reset(self):
+        self._recognizer.Reset()
+        self._in_utterance = False
+        self._partial = ""
+        self._unchanged_ms = 0.0
+        self._emitted = ""
@@ -0,0 +1,170 @@
+import csv
+import io
+import os
+import signal
+import subprocess
+import time
+
+IS_WINDOWS = os.name == "nt"
+_COMM_LEN = 15  # Linux TASK_COMM_LEN without the NUL
+
+
+class ProcessInfo:
+    """One row of the process table"""
+
+    __slots__ = ("pid", "name", "exe", "uid")
+
+    def __init__(self, pid: int, name: str, exe: str = "", uid: int = None):
+        self.pid = pid
+        self.name = name  # short process name (comm / image name)
+        self.exe = exe    # argv[0], usually the executable path
+        self.uid = uid
+
+    def matches(self, pattern: str) -> bool:
+        """
+        Exact process or executable name, case-insensitive ("code" never hits
+        "vscode-helper" or "/usr/bin/decode"). Linux cuts comm to 15 characters,
+        so a full-length comm also matches a longer pattern it starts.
+        Patterns with spaces are app bundle names and may appear anywhere in
+        the path ("Google Chrome").
+        """
+        pattern = pattern.lower()
+        name = self.name.lower()
+        exe = self.exe.lower()
+        base = os.path.basename(exe)
+        if pattern in (name, base) or pattern + ".exe" in (name, base):
+            return True
+        if len(name) == _COMM_LEN and pattern.startswith(name):
+            return True
+        return " " in pattern and pattern in exe
+
+    def __repr__(self):
+        return f"ProcessInfo({self.pid}, {self.name!r})"
+
+
+def _snapshot_proc():
+    processes = []
+    for entry in os.scandir("/proc"):
+        if not entry.name.isdigit():
+            continue
+        pid = int(entry.name)
+        try:
+            with open(f"/proc/{pid}/stat", "rb") as f:
+                stat = f.read()
+            # comm is in parentheses and may itself contain spaces or ")"
+            name = stat[stat.index(b"(") + 1:stat.rindex(b")")].decode(errors="replace")
+            if stat[stat.rindex(b")") + 2:stat.rindex(b")") + 3] == b"Z":
+                continue  # already exited, waiting to be reaped
+            with open(f"/proc/{pid}/cmdline", "rb") as f:
+                exe = f.read().split(b"\0", 1)[0].decode(errors="replace")
+            uid = entry.stat().st_uid
+        except (OSError, ValueError):
+            continue  # exited while we were reading
+        processes.append(ProcessInfo(pid, name, exe, uid))
+    return processes
+
+
+def _snapshot_ps():
+    out = subprocess.run(["ps", "-axo", "pid=,uid=,stat=,comm="], capture_output=True, text=True).stdout
+    processes = []
+    for line in out.splitlines():
+        parts = line.split(None, 3)
+        if len(parts) == 4 and not parts[2].startswith("Z"):
+            # macOS comm is the full executable path
+            processes.append(ProcessInfo(int(parts[0]), os.path.basename(parts[3]), parts[3], int(parts[1])))
+    return processes
+
+
+def _snapshot_tasklist():
+    out = subprocess.run(["tasklist", "/FO", "CSV", "/NH"], capture_output=True, text=True,
+                         creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0)).stdout
+    return [ProcessInfo(int(row[1]), row[0], row[0]) for row in csv.reader(io.StringIO(out)) if len(row) > 1]
+
+
+def snapshot():
+    """Every process visible to us, read in one pass"""
+    if IS_WINDOWS:
+        return _snapshot_tasklist()
+    if os.path.isdir("/proc/self"):
+        return _snapshot_proc()
+    return _snapshot_ps()
+
+
+def find_processes(patterns, processes=None):
+    """Processes matching any pattern; never Smriti itself, its parent, or other users' processes"""
+    processes = snapshot() if processes is None else processes
+    protected = {os.getpid(), os.getppid()}
+    uid = os.getuid() if hasattr(os, "getuid") else None
+    return [p for p in processes
+            if p.pid not in protected and (uid is None or p.uid in (None, uid))
+            and any(p.matches(pattern) for pattern in patterns)]
+
+
+def _alive(pids):
+    """Subset of pids still running (exited-but-unreaped processes count as gone)"""
+    if IS_WINDOWS:
+        running = {p.pid for p in _snapshot_tasklist()}
+        return {pid for pid in pids if pid in running}
+    alive = set()
+    for pid in pids:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            continue
+        except PermissionError:
+            pass
+        try:
+            with open(f"/proc/{pid}/stat", "rb") as f:
+                stat = f.read()
+            if stat[stat.rindex(b")") + 2:stat.rindex(b")") + 3] == b"Z":
+                continue
+        except (OSError, ValueError):
+            pass
+        alive.add(pid)
+    return alive
+
+
+def _send(pids, force: bool):
+    if IS_WINDOWS:
+        # One taskkill for the whole batch; without /F apps get a close request first
+        args = ["taskkill"] + (["/F"] if force else []) + [a for pid in pids for a in ("/PID", str(pid))]
+        subprocess.run(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                       creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0))
+        return
+    for pid in pids:
+        try:
+            os.kill(pid, signal.SIGKILL if force else signal.SIGTERM)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+
+def _wait_gone(pids, timeout: float):
+    deadline = time.monotonic() + timeout
+    alive = _alive(pids)
+    while alive and time.monotonic() < deadline:
+        time.sleep(0.05)
+        alive = _alive(alive)
+    return alive
+
+
+def terminate_processes(processes, grace_s: float = 3.0, kill_wait_s: float = 1.0):
+    """
+    SIGTERM every process, SIGKILL the ones still running after grace_s, then
+    check they are gone. Returns (closed, survivors).
+    """
+    pids = {p.pid for p in processes}
+    if not pids:
+        return [], []
+    _send(pids, force=False)
+    alive = _wait_gone(pids, grace_s)
+    if alive:
+        _send(alive, force=True)
+        alive = _wait_gone(alive, kill_wait_s)
+    closed = [p for p in processes if p.pid not in alive]
+    survivors = [p for p in processes if p.pid in alive]
+    return closed, survivors
+
+
+def close_processes(patterns, grace_s: float = 3.0):
+    """Snapshot once, match every pattern in memory, terminate the matches; (closed, survivors)"""
+    return terminate_processes(find_processes(patterns), grace_s)
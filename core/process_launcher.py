@@ -0,0 +1,137 @@
+import os
+import shutil
+import signal
+import subprocess
+import threading
+import time
+
+from core.tracing import log
+
+IS_WINDOWS = os.name == "nt"
+
+
+class LaunchedProcess:
+    """One program Smriti started, with the words that refer to it"""
+
+    def __init__(self, name: str, keywords, popen: subprocess.Popen):
+        self.name = name
+        self.keywords = tuple(keywords) or (name,)
+        self.popen = popen
+        self.pid = popen.pid
+        # Started in its own session/group, so the group id is the pid
+        self.pgid = popen.pid if not IS_WINDOWS else None
+        self.started_at = time.time()
+
+    def matches(self, spoken: str) -> bool:
+        return any(keyword in spoken for keyword in self.keywords)
+
+    @property
+    def running(self) -> bool:
+        return self.popen.poll() is None
+
+
+class ProcessLauncher:
+    """
+    Starts programs without waiting for them, in their own process group,
+    and keeps a registry of what is still running. A waiter thread per child
+    reaps it as soon as it exits, so no zombies are left behind.
+    """
+
+    def __init__(self):
+        self._processes = {}  # pid -> LaunchedProcess
+        self._lock = threading.Lock()
+        self.launched = 0
+        self.exited = 0
+        self.terminated = 0
+
+    def launch(self, name: str, argv, keywords=(), new_console: bool = False) -> LaunchedProcess:
+        """Start argv and return at once; raises FileNotFoundError if the program is missing"""
+        program = shutil.which(argv[0])
+        if program is None:
+            raise FileNotFoundError(f"{argv[0]} is not installed")
+        kwargs = {"stdin": subprocess.DEVNULL, "stdout": subprocess.DEVNULL, "stderr": subprocess.DEVNULL}
+        if IS_WINDOWS:
+            flags = subprocess.CREATE_NEW_PROCESS_GROUP
+            if new_console:
+                flags |= subprocess.CREATE_NEW_CONSOLE
+            kwargs["creationflags"] = flags
+        else:
+            # Own session: closing it later signals the whole group, and Ctrl+C on Smriti doesn't reach it
+            kwargs["start_new_session"] = True
+        popen = subprocess.Popen([program, *argv[1:]], **kwargs)
+        process = LaunchedProcess(name, keywords, popen)
+        with self._lock:
+            self._processes[process.pid] = process
+            self.launched += 1
+        threading.Thread(target=self._reap, args=(process,), name=f"smriti-reap-{process.pid}",
+                         daemon=True).start()
+        log(f"🚀 Launched {name} (pid {process.pid})")
+        return process
+
+    def _reap(self, process: LaunchedProcess):
+        process.popen.wait()
+        with self._lock:
+            if self._processes.pop(process.pid, None) is not None:
+                self.exited += 1
+        log(f"👋 {process.name} exited (pid {process.pid}, code {process.popen.returncode})")
+
+    def running(self, spoken: str = None):
+        """Launched programs still running, optionally only those the spoken name refers to"""
+        with self._lock:
+            processes = list(self._processes.values())
+        return [p for p in processes if p.running and (spoken is None or p.matches(spoken))]
+
+    def _signal(self, process: LaunchedProcess, force: bool):
+        try:
+            if IS_WINDOWS:
+                process.popen.kill() if force else process.popen.terminate()
+            else:
+                os.killpg(process.pgid, signal.SIGKILL if force else signal.SIGTERM)
+        except (ProcessLookupError, PermissionError, OSError):
+            pass
+
+    def terminate(self, spoken: str, grace_s: float = 2.0):
+        """Close the launched programs the spoken name refers to; returns the ones that exited"""
+        targets = self.running(spoken)
+        for process in targets:
+            self._signal(process, force=False)
+        deadline = time.monotonic() + grace_s
+        for process in targets:
+            try:
+                process.popen.wait(timeout=max(0.0, deadline - time.monotonic()))
+            except subprocess.TimeoutExpired:
+                self._signal(process, force=True)
+        closed = []
+        for process in targets:
+            try:
+                process.popen.wait(timeout=1.0)
+                closed.append(process)
+            except subprocess.TimeoutExpired:
+                print(f"⚠️ {process.name} (pid {process.pid}) did not exit")
+        with self._lock:
+            self.terminated += len(closed)
+        return closed
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "launched": self.launched,
+                "running": len(self._processes),
+                "exited": self.exited,
+                "terminated": self.terminated,
+            }
+
+
+launcher = ProcessLauncher()
+
+
+def launch(name: str, argv, keywords=(), new_console: bool = False) -> LaunchedProcess:
+    return launcher.launch(name, argv, keywords, new_console)
+
+
+def terminate_launched(spoken: str, grace_s: float = 2.0):
+    return launcher.terminate(spoken, grace_s)
+
+
+def launcher_stats() -> dict:
+    return launcher.stats()
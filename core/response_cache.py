@@ -0,0 +1,180 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+
+# Words that carry no meaning for the answer ("hey smriti, please tell me a joke")
+FILLER_WORDS = {
+    "hey", "hi", "hello", "smriti", "please", "kindly", "um", "uh", "umm", "hmm",
+    "ok", "okay", "so", "just", "can", "could", "would", "you", "me", "tell",
+    "bata", "batao", "do", "na", "yaar",
+}
+
+# Prompts that depend on the previous turn must never be answered from the cache
+CONTEXT_WORDS = {
+    "it", "that", "this", "those", "these", "he", "she", "they", "them", "his",
+    "her", "their", "more", "again", "else", "previous", "last",
+}
+
+# Answers that go stale quickly get a much shorter lifetime
+VOLATILE_WORDS = {
+    "time", "today", "now", "date", "weather", "news", "tomorrow", "yesterday",
+    "score", "price", "latest", "current",
+}
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Lowercase, strip punctuation and filler words so paraphrases share a key"""
+    words = _PUNCTUATION.sub(" ", prompt.lower()).split()
+    kept = [w for w in words if w not in FILLER_WORDS]
+    # A prompt made only of fillers ("tell me") keeps its original words
+    return " ".join(kept or words)
+
+
+def _ngrams(text: str, n: int = 3):
+    padded = f"  {text} "
+    return {padded[i:i + n] for i in range(len(padded) - n + 1)}
+
+
+def _similarity(a: set, b: set) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class ResponseCache:
+    """
+    Persistent prompt → answer cache in a local SQLite file.
+    Entries expire after a TTL and the least recently used ones are evicted
+    once max_entries is exceeded. Approximate mode also matches keys by
+    character trigram (Jaccard) similarity.
+    """
+
+    def __init__(self, path: str, ttl: float = 24 * 3600, volatile_ttl: float = 60,
+                 max_entries: int = 500, approximate: bool = False,
+                 similarity_threshold: float = 0.8):
+        self.path = path
+        self.ttl = ttl
+        self.volatile_ttl = volatile_ttl
+        self.max_entries = max_entries
+        self.approximate = approximate
+        self.similarity_threshold = similarity_threshold
+        self.hits = 0
+        self.approx_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._ngram_index = None  # key -> trigram set, built lazily in approximate mode
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, response TEXT NOT NULL,"
+            " expires REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_last_used ON responses(last_used)")
+        self._db.commit()
+
+    @staticmethod
+    def is_cacheable(prompt: str) -> bool:
+        words = set(_PUNCTUATION.sub(" ", prompt.lower()).split())
+        return bool(words) and not (words & CONTEXT_WORDS)
+
+    def get(self, prompt: str):
+        """Return the cached answer for prompt, or None"""
+        if not self.is_cacheable(prompt):
+            return None
+        key = normalize_prompt(prompt)
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT response, expires FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None and self.approximate:
+                key = self._closest_key(key)
+                if key is not None:
+                    row = self._db.execute(
+                        "SELECT response, expires FROM responses WHERE key = ?", (key,)
+                    ).fetchone()
+                    if row is not None and row[1] > now:
+                        self.approx_hits += 1
+            if row is None or row[1] <= now:
+                if row is not None:
+                    self._delete(key)
+                self.misses += 1
+                return None
+            self._db.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            self._db.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, prompt: str, response: str):
+        if not self.is_cacheable(prompt) or not response:
+            return
+        key = normalize_prompt(prompt)
+        now = time.time()
+        ttl = self.volatile_ttl if set(key.split()) & VOLATILE_WORDS else self.ttl
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, response, expires, last_used)"
+                " VALUES (?, ?, ?, ?)",
+                (key, response, now + ttl, now),
+            )
+            if self._ngram_index is not None:
+                self._ngram_index[key] = _ngrams(key)
+            self._evict()
+            self._db.commit()
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+            self._db.commit()
+            self._ngram_index = None
+
+    def stats(self) -> dict:
+        with self._lock:
+            size = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "approx_hits": self.approx_hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": size,
+        }
+
+    def _closest_key(self, key: str):
+        if self._ngram_index is None:
+            rows = self._db.execute("SELECT key FROM responses").fetchall()
+            self._ngram_index = {k: _ngrams(k) for (k,) in rows}
+        grams = _ngrams(key)
+        best, best_score = None, self.similarity_threshold
+        for candidate, candidate_grams in self._ngram_index.items():
+            score = _similarity(grams, candidate_grams)
+            if score >= best_score:
+                best, best_score = candidate, score
+        return best
+
+    def _delete(self, key: str):
+        self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+        self._db.commit()
+        if self._ngram_index is not None:
+            self._ngram_index.pop(key, None)
+
+    def _evict(self):
+        now = time.time()
+        removed = self._db.execute("DELETE FROM responses WHERE expires <= ?", (now,)).rowcount
+        overflow = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0] - self.max_entries
+        if overflow > 0:
+            stale = self._db.execute(
+                "SELECT key FROM responses ORDER BY last_used ASC LIMIT ?", (overflow,)
+            ).fetchall()
+            self._db.executemany("DELETE FROM responses WHERE key = ?", stale)
+            removed += len(stale)
+        if removed and self._ngram_index is not None:
+            # Cheap to rebuild lazily on the next approximate lookup
+            self._ngram_index = None
@@ -0,0 +1,109 @@
+import importlib
+import threading
+import time
+
+
+class ServiceRegistry:
+    """
+    Subsystems whose imports are slow (pygame/gTTS, speech_recognition, the
+    Gemini SDK) registered by name. Each one is imported on first use, or
+    warmed up in order on a background thread once the window has painted.
+    """
+
+    def __init__(self):
+        self._specs = {}  # name -> (label, loader)
+        self._services = {}
+        self._locks = {}
+        self.load_times = {}  # name -> seconds spent loading
+
+    def register(self, name: str, loader, label: str = None):
+        self._specs[name] = (label or name, loader)
+        self._locks[name] = threading.Lock()
+
+    def get(self, name: str):
+        """The loaded service; the first caller loads it, concurrent callers wait"""
+        service = self._services.get(name)
+        if service is not None:
+            return service
+        with self._locks[name]:
+            if name not in self._services:
+                started = time.perf_counter()
+                self._services[name] = self._specs[name][1]()
+                self.load_times[name] = time.perf_counter() - started
+        return self._services[name]
+
+    def is_ready(self, name: str) -> bool:
+        return name in self._services
+
+    def label(self, name: str) -> str:
+        return self._specs[name][0]
+
+    def proxy(self, name: str):
+        """Module-like handle that loads the service on first attribute access"""
+        return _ServiceProxy(self, name)
+
+    def warm_up(self, names, on_progress=None, on_done=None):
+        """
+        Load services in order on a background thread.
+        on_progress(label, index, total) runs before each one, on_done(failed) at the end.
+        """
+        names = list(names)
+
+        def run():
+            failed = []
+            for index, name in enumerate(names, 1):
+                if on_progress:
+                    on_progress(self._specs[name][0], index, len(names))
+                try:
+                    self.get(name)
+                except Exception as e:
+                    print(f"❌ Failed to start {name}: {e}")
+                    failed.append(name)
+            if on_done:
+                on_done(failed)
+
+        thread = threading.Thread(target=run, name="smriti-startup", daemon=True)
+        thread.start()
+        return thread
+
+    def stats(self) -> dict:
+        return {name: round(seconds * 1000, 1) for name, seconds in self.load_times.items()}
+
+
+class _ServiceProxy:
+    def __init__(self, registry: ServiceRegistry, name: str):
+        self._registry = registry
+        self._name = name
+
+    def __getattr__(self, attr):
+        return getattr(self._registry.get(self._name), attr)
+
+
+def _import(module: str):
+    return lambda: importlib.import_module(module)
+
+
+def _load_brain():
+    """Brain plus the command pipeline's event loop and worker threads"""
+    from core.command_pipeline import get_pipeline
+
+    get_pipeline()
+    return importlib.import_module("core.brain")
+
+
+services = ServiceRegistry()
+services.register("voice", _import("core.voice_response"), "voice")
+services.register("gemini", _import("core.gemini_connector"), "Gemini")
+services.register("brain", _load_brain, "brain")
+services.register("recognition", _import("core.voice_recognition"), "speech recognition")
+
+# Voice first: the welcome message needs it, and it is the quickest to be useful
+STARTUP_ORDER = ["voice", "gemini", "brain", "recognition"]
+
+
+def get_service(name: str):
+    return services.get(name)
+
+
+def service_stats() -> dict:
+    return services.stats()
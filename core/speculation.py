@@ -0,0 +1,238 @@
+import collections
+import queue
+import threading
+import time
+
+from core.command_pipeline import _env_int
+from core.intent_router import route, tokenize
+from core.local_skills import answer_locally
+from core.tracing import log
+
+# At most this many speculative calls may be thrown away per window
+MAX_WASTED_CALLS = _env_int("SMRITI_SPECULATION_MAX_WASTED", 5)
+WASTE_WINDOW_S = 60.0
+
+_END = object()
+
+
+def _key(text: str) -> str:
+    """Transcripts match when their words match (case and punctuation ignored)"""
+    return " ".join(tokenize(text))
+
+
+class Speculation:
+    """One speculative answer being streamed in the background"""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.key = _key(text)
+        self.started_at = time.monotonic()
+        self.result = None  # (reply, completed) once the stream has finished
+        self.release_slot = lambda: None  # hands the cloud slot back, once
+        self._chunks = queue.Queue()
+        self._cancelled = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def finished(self, prompt: str, reply: str, completed: bool):
+        """on_finish hook of the stream: hold the answer back until it is committed"""
+        self.result = (reply, completed)
+
+    def run(self, start_stream):
+        stream = start_stream(self.text, self.finished)
+        try:
+            for sentence in stream:
+                if self.cancelled:
+                    break
+                self._chunks.put(sentence)
+        except Exception as e:
+            print(f"[⚠️] Speculative request failed: {e}")
+        finally:
+            close = getattr(stream, "close", None)
+            if close:
+                close()
+            self.release_slot()
+            self._chunks.put(_END)
+
+    def replay(self):
+        """Sentences produced so far, then the rest as they arrive"""
+        while True:
+            sentence = self._chunks.get()
+            if sentence is _END:
+                return
+            yield sentence
+
+
+class Speculator:
+    """
+    Starts a cloud answer for a stable partial transcript while the user is
+    still talking. If the final transcript has the same words, claim() hands
+    the answer over (already partly generated); otherwise the speculative call
+    is cancelled. Thrown-away calls are capped at max_wasted per window_s, and
+    a speculative call only starts when the shared cloud limiter has a free slot.
+    """
+
+    def __init__(self, start_stream, commit, should_speculate=lambda text: True,
+                 max_wasted: int = MAX_WASTED_CALLS, window_s: float = WASTE_WINDOW_S,
+                 max_age_s: float = 10.0, limiter=None):
+        """
+        start_stream(text, on_finish) -> iterable of sentences (must not record history itself)
+        commit(text, reply, completed) records a claimed answer
+        limiter: CloudLimiter shared with the command pipeline, or None for no cap
+        """
+        self.start_stream = start_stream
+        self.commit = commit
+        self.should_speculate = should_speculate
+        self.max_wasted = max_wasted
+        self.window_s = window_s
+        self.max_age_s = max_age_s
+        self.limiter = limiter
+        self.started = 0
+        self.committed = 0
+        self.wasted = 0
+        self.skipped_budget = 0
+        self.skipped_busy = 0
+        self.time_saved = 0.0  # seconds of generation already done when answers were claimed
+        self._wasted_at = collections.deque()
+        self._current = None
+        self._lock = threading.Lock()
+
+    def _budget_left(self) -> bool:
+        now = time.monotonic()
+        while self._wasted_at and now - self._wasted_at[0] > self.window_s:
+            self._wasted_at.popleft()
+        return len(self._wasted_at) < self.max_wasted
+
+    def _discard(self, speculation: Speculation):
+        speculation.cancel()
+        self.wasted += 1
+        self._wasted_at.append(time.monotonic())
+
+    def propose(self, text: str):
+        """A stable partial transcript arrived; (re)start speculation if it changed"""
+        key = _key(text)
+        if not key:
+            return
+        with self._lock:
+            if self._current is not None:
+                if self._current.key == key:
+                    return
+                self._discard(self._current)
+                self._current = None
+            if not self.should_speculate(text):
+                return
+            if not self._budget_left():
+                self.skipped_budget += 1
+                return
+            if self.limiter is not None and not self.limiter.try_acquire():
+                self.skipped_busy += 1  # real commands keep the cloud slots
+                return
+            speculation = Speculation(text)
+            if self.limiter is not None:
+                speculation.release_slot = self._releaser(self.limiter)
+            self._current = speculation
+            self.started += 1
+        log(f"🔮 Speculating on: {text}")
+        threading.Thread(target=speculation.run, args=(self.start_stream,),
+                         name="smriti-speculation", daemon=True).start()
+
+    @staticmethod
+    def _releaser(limiter):
+        released = threading.Event()
+
+        def release():
+            if not released.is_set():
+                released.set()
+                limiter.release()
+        return release
+
+    def claim(self, text: str):
+        """Iterator over the speculative answer if it matches the final transcript, else None"""
+        with self._lock:
+            speculation, self._current = self._current, None
+            if speculation is None:
+                return None
+            too_old = time.monotonic() - speculation.started_at > self.max_age_s
+            if speculation.key != _key(text) or too_old:
+                self._discard(speculation)
+                return None
+            self.committed += 1
+            self.time_saved += time.monotonic() - speculation.started_at
+        # The claiming command holds its own cloud slot from here on
+        speculation.release_slot()
+        log(f"🔮 Speculation hit: {text}")
+        return self._committed(speculation)
+
+    def _committed(self, speculation: Speculation):
+        try:
+            yield from speculation.replay()
+        finally:
+            speculation.cancel()  # stops the background stream if the reply was cut short
+        if speculation.result is not None:
+            self.commit(speculation.text, *speculation.result)
+
+    def cancel(self):
+        """Drop the in-flight speculation (counts as wasted)"""
+        with self._lock:
+            if self._current is not None:
+                self._discard(self._current)
+                self._current = None
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "started": self.started,
+                "committed": self.committed,
+                "wasted": self.wasted,
+                "skipped_budget": self.skipped_budget,
+                "skipped_busy": self.skipped_busy,
+                "hit_rate": self.committed / self.started if self.started else 0.0,
+                "time_saved_s": round(self.time_saved, 2),
+            }
+
+
+def _needs_cloud(text: str) -> bool:
+    """Only speculate on what would reach Gemini (no intents, no local skills)"""
+    return route(text) is None and not answer_locally(text, count=False)
+
+
+_speculator = None
+_speculator_lock = threading.Lock()
+
+
+def get_speculator() -> Speculator:
+    global _speculator
+    with _speculator_lock:
+        if _speculator is None:
+            from core.command_pipeline import get_pipeline
+            from core.gemini_connector import ask_gemini_stream, remember_answer
+
+            _speculator = Speculator(
+                lambda text, on_finish: ask_gemini_stream(text, on_finish=on_finish),
+                commit=remember_answer,
+                should_speculate=_needs_cloud,
+                limiter=get_pipeline().cloud,
+            )
+        return _speculator
+
+
+def propose_speculation(text: str):
+    get_speculator().propose(text)
+
+
+def claim_speculation(text: str):
+    return _speculator.claim(text) if _speculator else None
+
+
+def cancel_speculation():
+    if _speculator:
+        _speculator.cancel()
+
+
+def speculation_stats() -> dict:
+    return _speculator.stats() if _speculator else {}
@@ -0,0 +1,195 @@
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+import speech_recognition as sr
+
+POLICY_LOCAL_FIRST = "local-first"
+POLICY_REMOTE_FIRST = "remote-first"
+POLICY_RACE = "race"
+POLICIES = (POLICY_LOCAL_FIRST, POLICY_REMOTE_FIRST, POLICY_RACE)
+
+# Below this a result is not trusted on its own (the other backend gets a try)
+MIN_CONFIDENCE = 0.6
+
+
+class RecognitionResult:
+    def __init__(self, text: str, confidence: float, backend: str, latency: float):
+        self.text = text
+        self.confidence = confidence
+        self.backend = backend
+        self.latency = latency
+
+    def __repr__(self):
+        return f"RecognitionResult({self.text!r}, {self.confidence:.2f}, {self.backend}, {self.latency * 1000:.0f} ms)"
+
+
+class SpeechBackend(ABC):
+    """
+    Base recognizer interface. recognize() returns a RecognitionResult and raises
+    sr.UnknownValueError when nothing was understood, sr.RequestError when the
+    backend itself failed (offline, missing model...).
+    """
+
+    name = "base"
+
+    def available(self) -> bool:
+        return True
+
+    @abstractmethod
+    def recognize(self, audio: sr.AudioData) -> RecognitionResult:
+        """Transcribe one utterance"""
+
+
+class GoogleBackend(SpeechBackend):
+    """Google Web Speech API through speech_recognition (network round-trip)"""
+
+    name = "google"
+
+    def __init__(self, recognizer: sr.Recognizer, language: str = "en-IN"):
+        self.recognizer = recognizer
+        self.language = language
+
+    def recognize(self, audio: sr.AudioData) -> RecognitionResult:
+        start = time.perf_counter()
+        result = self.recognizer.recognize_google(audio, language=self.language, show_all=True)
+        alternatives = result.get("alternative") if isinstance(result, dict) else None
+        if not alternatives:
+            raise sr.UnknownValueError()
+        best = alternatives[0]
+        # Google only reports confidence on the top alternative, and not always
+        confidence = float(best.get("confidence", 0.8))
+        return RecognitionResult(best["transcript"], confidence, self.name, time.perf_counter() - start)
+
+
+class VoskBackend(SpeechBackend):
+    """Offline CPU recognizer (vosk); the model directory comes from SMRITI_VOSK_MODEL"""
+
+    name = "vosk"
+    sample_rate = 16000
+
+    def __init__(self, model_path: str = None):
+        self.model_path = model_path or os.getenv("SMRITI_VOSK_MODEL", "")
+        self._model = None
+        self._load_failed = False
+        self._lock = threading.Lock()
+
+    def available(self) -> bool:
+        return self.get_model() is not None
+
+    def get_model(self):
+        """The loaded model, or None; only ever read from disk, never downloaded"""
+        with self._lock:
+            if self._model is None and not self._load_failed:
+                if not os.path.isdir(self.model_path):
+                    # vosk.Model(lang=...) would fetch a model over the network,
+                    # which fails in exactly the offline case this backend is for
+                    self._load_failed = True
+                    where = f"{self.model_path} is not a directory" if self.model_path else "SMRITI_VOSK_MODEL is not set"
+                    print(f"🚫 Offline recognizer unavailable: {where} (point it at an unpacked Vosk model)")
+                    return None
+                try:
+                    import vosk
+
+                    vosk.SetLogLevel(-1)
+                    self._model = vosk.Model(self.model_path)
+                except Exception as e:
+                    self._load_failed = True
+                    print(f"🚫 Offline recognizer unavailable: {e}")
+            return self._model
+
+    def recognize(self, audio: sr.AudioData) -> RecognitionResult:
+        model = self.get_model()
+        if model is None:
+            raise sr.RequestError("offline model not available")
+        import vosk
+
+        start = time.perf_counter()
+        recognizer = vosk.KaldiRecognizer(model, self.sample_rate)
+        recognizer.SetWords(True)
+        recognizer.AcceptWaveform(audio.get_raw_data(convert_rate=self.sample_rate, convert_width=2))
+        result = json.loads(recognizer.FinalResult())
+        text = result.get("text", "").strip()
+        if not text:
+            raise sr.UnknownValueError()
+        words = result.get("result") or []
+        confidence = sum(w.get("conf", 0.0) for w in words) / len(words) if words else 0.5
+        return RecognitionResult(text, confidence, self.name, time.perf_counter() - start)
+
+
+def _as_recognition_error(error: Exception) -> Exception:
+    if isinstance(error, (sr.UnknownValueError, sr.RequestError)):
+        return error
+    return sr.RequestError(str(error))
+
+
+class RecognitionRouter:
+    """Chooses between a local and a remote backend according to a policy"""
+
+    def __init__(self, local: SpeechBackend, remote: SpeechBackend,
+                 policy: str = POLICY_REMOTE_FIRST, min_confidence: float = MIN_CONFIDENCE):
+        self.local = local
+        self.remote = remote
+        self.min_confidence = min_confidence
+        self.policy = POLICY_REMOTE_FIRST
+        try:
+            self.set_policy(policy)
+        except ValueError as e:
+            # A typo in SMRITI_STT_POLICY must not take speech recognition down at startup
+            print(f"⚠️ {e}; using {POLICY_REMOTE_FIRST}")
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="smriti-stt")
+
+    def set_policy(self, policy: str):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown recognition policy {policy!r}, expected one of {POLICIES}")
+        self.policy = policy
+
+    def recognize(self, audio: sr.AudioData) -> RecognitionResult:
+        if self.policy == POLICY_RACE:
+            return self._race(audio)
+        if self.policy == POLICY_LOCAL_FIRST:
+            order = (self.local, self.remote)
+        else:
+            order = (self.remote, self.local)
+        return self._in_order(audio, order)
+
+    def _in_order(self, audio, backends) -> RecognitionResult:
+        best = None
+        last_error = sr.UnknownValueError()
+        for backend in backends:
+            try:
+                result = backend.recognize(audio)
+            except Exception as e:
+                last_error = _as_recognition_error(e)
+                continue
+            if result.confidence >= self.min_confidence:
+                return result
+            if best is None or result.confidence > best.confidence:
+                best = result
+        if best is not None:
+            return best
+        raise last_error
+
+    def _race(self, audio) -> RecognitionResult:
+        futures = {self._pool.submit(b.recognize, audio) for b in (self.local, self.remote)}
+        best = None
+        last_error = sr.UnknownValueError()
+        while futures:
+            done, futures = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    result = future.result()
+                except Exception as e:
+                    last_error = _as_recognition_error(e)
+                    continue
+                if result.confidence >= self.min_confidence:
+                    # First confident answer wins; the slower call finishes in the background
+                    return result
+                if best is None or result.confidence > best.confidence:
+                    best = result
+        if best is not None:
+            return best
+        raise last_error
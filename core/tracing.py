@@ -0,0 +1,199 @@
+import collections
+import itertools
+import json
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+# SMRITI_TRACE: "jsonl" (one line per command) or "chrome" (chrome://tracing / Perfetto); unset = off
+TRACE_FORMAT = os.getenv("SMRITI_TRACE", "").lower()
+TRACE_DIR = os.getenv("SMRITI_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".smriti"))
+TRACE_FILE = os.getenv("SMRITI_TRACE_FILE") or os.path.join(
+    TRACE_DIR, "trace.json" if TRACE_FORMAT == "chrome" else "traces.jsonl"
+)
+# SMRITI_QUIET=1 drops hot-path console messages instead of printing them
+QUIET = os.getenv("SMRITI_QUIET", "0") == "1"
+
+
+class Trace:
+    """Spans and instant marks of one command, from capture to the end of playback"""
+
+    def __init__(self, tracer, trace_id: int, name: str, start: float = None):
+        self.tracer = tracer
+        self.id = trace_id
+        self.name = name
+        self.start = time.time() if start is None else start
+        self.end_time = None
+        self.args = {}
+        self.spans = []  # (name, start, end, thread name)
+        self.marks = {}  # name -> first timestamp
+
+    @contextmanager
+    def span(self, name: str):
+        started = time.time()
+        try:
+            yield self
+        finally:
+            self.add_span(name, started, time.time())
+
+    def add_span(self, name: str, start: float, end: float):
+        """Record a span whose timing was measured elsewhere (e.g. a speech segment)"""
+        self.spans.append((name, start, end, threading.current_thread().name))
+        self.start = min(self.start, start)
+
+    def mark(self, name: str):
+        """Instant event; only the first occurrence of a name is kept"""
+        self.marks.setdefault(name, time.time())
+
+    def annotate(self, **args):
+        self.args.update(args)
+
+    def end(self):
+        """Finish the trace (idempotent) and hand it to the tracer"""
+        if self.end_time is None:
+            self.end_time = time.time()
+            self.tracer.finish(self)
+
+    def to_dict(self) -> dict:
+        ms = lambda t: round((t - self.start) * 1000, 2)
+        return {
+            "id": self.id,
+            "name": self.name,
+            "start": self.start,
+            "duration_ms": ms(self.end_time or time.time()),
+            "args": self.args,
+            "spans": [{"name": n, "start_ms": ms(s), "dur_ms": round((e - s) * 1000, 2), "thread": t}
+                      for n, s, e, t in self.spans],
+            "marks": {n: ms(t) for n, t in self.marks.items()},
+        }
+
+
+class _NullTrace:
+    """Stand-in while tracing is off: every call is a no-op"""
+
+    id = 0
+    _span = nullcontext()
+
+    def span(self, name: str):
+        return self._span
+
+    def add_span(self, name, start, end):
+        pass
+
+    def mark(self, name):
+        pass
+
+    def annotate(self, **args):
+        pass
+
+    def end(self):
+        pass
+
+
+NULL_TRACE = _NullTrace()
+
+
+class Tracer:
+    """
+    Hands out per-command traces, keeps the most recent ones in a ring buffer
+    for p50/p95 summaries and writes finished traces (plus hot-path console
+    messages) from a background thread, so callers never block on I/O.
+    """
+
+    def __init__(self, fmt: str = TRACE_FORMAT, path: str = TRACE_FILE, ring_size: int = 100,
+                 quiet: bool = QUIET):
+        self.format = fmt if fmt in ("jsonl", "chrome") else ""
+        self.enabled = bool(self.format)
+        self.path = path
+        self.quiet = quiet
+        self.recent = collections.deque(maxlen=ring_size)
+        self._ids = itertools.count(1)
+        self._outbox = queue.Queue()
+        self._file = None
+        threading.Thread(target=self._writer, name="smriti-trace-writer", daemon=True).start()
+
+    def begin(self, name: str, start: float = None):
+        """New trace for one command (a shared no-op object when tracing is off)"""
+        if not self.enabled:
+            return NULL_TRACE
+        return Trace(self, next(self._ids), name, start)
+
+    def finish(self, trace: Trace):
+        self.recent.append(trace)
+        self._outbox.put(trace)
+
+    def log(self, message: str):
+        """Console message printed off the calling thread"""
+        if not self.quiet:
+            self._outbox.put(message)
+
+    def _writer(self):
+        while True:
+            item = self._outbox.get()
+            if isinstance(item, str):
+                print(item)
+                continue
+            try:
+                self._write(item)
+            except Exception as e:
+                print(f"⚠️ Trace write failed: {e}")
+
+    def _write(self, trace: Trace):
+        if self._file is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._file = open(self.path, "w", encoding="utf-8")
+            if self.format == "chrome":
+                # The closing bracket is optional in the Chrome trace format
+                self._file.write("[\n")
+        if self.format == "chrome":
+            for event in self._chrome_events(trace):
+                self._file.write(json.dumps(event) + ",\n")
+        else:
+            self._file.write(json.dumps(trace.to_dict()) + "\n")
+        self._file.flush()
+
+    @staticmethod
+    def _chrome_events(trace: Trace):
+        us = lambda t: round(t * 1_000_000)
+        # One row (tid) per command so overlapping commands stay readable
+        yield {"name": trace.name, "ph": "X", "pid": 1, "tid": trace.id, "ts": us(trace.start),
+               "dur": us(trace.end_time - trace.start), "args": trace.args}
+        for name, start, end, thread in trace.spans:
+            yield {"name": name, "ph": "X", "pid": 1, "tid": trace.id, "ts": us(start),
+                   "dur": us(end - start), "args": {"thread": thread}}
+        for name, at in trace.marks.items():
+            yield {"name": name, "ph": "i", "s": "t", "pid": 1, "tid": trace.id, "ts": us(at)}
+
+    def summary(self) -> dict:
+        """p50/p95 in ms per span name (durations) and per mark (offset from trace start)"""
+        samples = collections.defaultdict(list)
+        for trace in list(self.recent):
+            for name, start, end, _ in trace.spans:
+                samples[name].append(end - start)
+            for name, at in trace.marks.items():
+                samples[name].append(at - trace.start)
+            samples["total"].append(trace.end_time - trace.start)
+        return {name: _percentiles(values) for name, values in samples.items()}
+
+
+def _percentiles(values) -> dict:
+    ordered = sorted(values)
+    pick = lambda pct: round(ordered[int(round(pct / 100 * (len(ordered) - 1)))] * 1000, 1)
+    return {"count": len(ordered), "p50_ms": pick(50), "p95_ms": pick(95)}
+
+
+tracer = Tracer()
+
+
+def begin_trace(name: str, start: float = None):
+    return tracer.begin(name, start)
+
+
+def log(message: str):
+    tracer.log(message)
+
+
+def trace_summary() -> dict:
+    return tracer.summary()
@@ -1,5 +1,12 @@
 import speech_recognition as sr
+import threading
 import time
+import os
+from core.audio_capture import CaptureEngine, PyAudioSource
+from core.speech_backends import GoogleBackend, VoskBackend, RecognitionRouter, POLICY_REMOTE_FIRST
+from core.keyword_spotter import KeywordSpotter
+from core.partial_transcriber import PartialTranscriber
+from core.tracing import NULL_TRACE, log
 
 recognizer = sr.Recognizer()
 # Make recognition more responsive to short phrases and small gaps
@@ -10,21 +17,152 @@ recognizer.phrase_threshold = 0.2  # require less speech before considering a ph
 recognizer.non_speaking_duration = 0.2  # shorter required silence before/after speech
 recognizer.operation_timeout = 3  # network operations timeout
 
-def listen_command(timeout=4, phrase_time_limit=4):
-    """Listen for a voice command with enhanced timing and stop speaking when user talks"""
+# 🔀 Speech-to-text backends: Google (remote) and Vosk (local, offline)
+# SMRITI_STT_POLICY: local-first, remote-first (default) or race
+router = RecognitionRouter(
+    local=VoskBackend(),
+    remote=GoogleBackend(recognizer, language='en-IN'),
+    policy=os.getenv("SMRITI_STT_POLICY", POLICY_REMOTE_FIRST),
+)
+
+
+def set_recognition_policy(policy: str):
+    """Switch between local-first, remote-first and race at runtime"""
+    router.set_policy(policy)
+    print(f"🔀 Speech recognition policy: {policy}")
+
+# 🎙️ Continuous capture: the microphone is opened once and segmented by the VAD
+_engine = None
+_engine_failed = False
+_engine_lock = threading.Lock()
+
+
+def get_capture_engine():
+    """Open the microphone once and start the capture engine (None if unavailable)"""
+    global _engine, _engine_failed
+    with _engine_lock:
+        if _engine is not None and _engine.failed:
+            # The capture thread is gone; listening on it would only ever time out
+            print("🚫 Continuous capture stopped, falling back to per-listen mic")
+            _engine.stop()  # releases the device
+            _engine, _engine_failed = None, True
+        if _engine is None and not _engine_failed:
+            try:
+                _engine = CaptureEngine(PyAudioSource())
+                _engine.start()
+                print("✅ Continuous microphone capture started")
+            except Exception as e:
+                _engine_failed = True
+                print(f"🚫 Continuous capture unavailable, falling back to per-listen mic: {e}")
+        return _engine
+
+
+def set_capture_engine(engine):
+    """Use a custom capture engine (e.g. one fed by WavFileSource)"""
+    global _engine, _engine_failed
+    with _engine_lock:
+        _engine = engine
+        _engine_failed = False
+
+
+def set_listening(active: bool):
+    """Pause/resume segmentation when the mic button is toggled"""
+    # The engine itself is opened lazily by the listener thread on its first listen
+    if _engine:
+        if active:
+            _engine.resume()
+        else:
+            _engine.pause()
+
+
+def mic_level() -> float:
+    """Last microphone frame energy relative to the speech threshold (0 when not capturing)"""
+    return _engine.level if _engine and not _engine.paused else 0.0
+
+
+def start_echo_canceller(add_playback_listener):
+    """
+    Subtract Smriti's own playback from the mic stream before VAD and recognition.
+    add_playback_listener registers the canceller with the TTS side.
+    """
+    engine = get_capture_engine()
+    if engine is None:
+        return None
     try:
-        with sr.Microphone() as source:
-            print("🎧 Smriti is listening... (Speak now)")
-            
-            # Adjust for ambient noise quickly (shorter calibration)
+        from core.echo_canceller import EchoCanceller
+    except ImportError as e:
+        print(f"🚫 Echo cancellation unavailable: {e}")
+        return None
+    canceller = EchoCanceller(engine.sample_rate)
+    engine.frame_filters.append(canceller.process)
+    add_playback_listener(canceller)
+    print("✅ Echo cancellation active")
+    return canceller
+
+
+def start_keyword_spotter(on_keyword, is_active):
+    """
+    Attach a local stop/shutdown keyword spotter to the live capture stream.
+    Returns None when continuous capture or the offline model is unavailable.
+    """
+    engine = get_capture_engine()
+    model = router.local.get_model() if isinstance(router.local, VoskBackend) else None
+    if engine is None or model is None:
+        print("🚫 Keyword spotter unavailable (needs continuous capture and an offline model)")
+        return None
+    spotter = KeywordSpotter(model, engine.sample_rate, on_keyword, is_active)
+    engine.frame_listeners.append(spotter.feed)
+    print("✅ Keyword spotter listening for stop/shutdown words")
+    return spotter
+
+
+def start_partial_transcriber(on_stable, is_active):
+    """
+    Stream partial transcripts of the user's speech from the offline model, so
+    work can start before the utterance ends. Returns None when unavailable.
+    """
+    engine = get_capture_engine()
+    model = router.local.get_model() if isinstance(router.local, VoskBackend) else None
+    if engine is None or model is None:
+        print("🚫 Partial transcripts unavailable (needs continuous capture and an offline model)")
+        return None
+    transcriber = PartialTranscriber(model, engine.sample_rate, on_stable, is_active)
+    engine.frame_listeners.append(transcriber.feed)
+    print("✅ Partial transcripts enabled")
+    return transcriber
+
+
+def _listen_with_microphone(timeout, phrase_time_limit, trace=NULL_TRACE):
+    """Legacy path: open the mic and calibrate for this one listen"""
+    with sr.Microphone() as source:
+        log("🎧 Smriti is listening... (Speak now)")
+        
+        # Adjust for ambient noise quickly (shorter calibration)
+        with trace.span("ambient_calibration"):
             recognizer.adjust_for_ambient_noise(source, duration=0.3)
-            print("✅ Ambient noise adjusted")
-            
-            # Listen with tighter timeout and phrase limit for snappier UX
-            audio = recognizer.listen(source, timeout=timeout, phrase_time_limit=phrase_time_limit)
+        log("✅ Ambient noise adjusted")
+        
+        # Listen with tighter timeout and phrase limit for snappier UX
+        with trace.span("capture"):
+            return recognizer.listen(source, timeout=timeout, phrase_time_limit=phrase_time_limit)
+
+
+def listen_command(timeout=4, phrase_time_limit=4, trace=NULL_TRACE):
+    """Listen for a voice command with enhanced timing and stop speaking when user talks"""
+    try:
+        engine = get_capture_engine()
+        if engine:
+            # Wait for speech to start (timeout) and finish (phrase_time_limit)
+            segment = engine.next_segment(timeout=timeout + phrase_time_limit)
+            if segment is None:
+                raise sr.WaitTimeoutError("listening timed out while waiting for phrase to start")
+            trace.add_span("capture", segment.started_at, segment.ended_at)
+            audio = sr.AudioData(segment.pcm, segment.sample_rate, 2)
+        else:
+            audio = _listen_with_microphone(timeout, phrase_time_limit, trace)
             
     except sr.WaitTimeoutError:
-        print("⏰ Listening timeout - no speech detected")
+        log("⏰ Listening timeout - no speech detected")
         return ""
     except OSError as e:
         print(f"🚫 Microphone not available: {e}")
@@ -34,12 +172,15 @@ def listen_command(timeout=4, phrase_time_limit=4):
         return ""
 
     try:
-        command = recognizer.recognize_google(audio, language='en-IN')
-        print(f"🗣️ You said: {command}")
+        with trace.span("recognition"):
+            result = router.recognize(audio)
+        trace.annotate(stt_backend=result.backend)
+        command = result.text
+        log(f"🗣️ You said: {command} ({result.backend}, {result.latency * 1000:.0f} ms)")
         return command.lower()
     except sr.UnknownValueError:
-        print("😕 Smriti didn't catch that clearly.")
+        log("😕 Smriti didn't catch that clearly.")
         return ""
     except sr.RequestError as e:
         print(f"🚫 Voice recognition service error: {e}")
-        return ""
\ No newline at end of file
+        return ""
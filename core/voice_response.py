@@ -1,20 +1,178 @@
 import threading
+import queue
+import heapq
+import itertools
 from typing import Optional, Callable
 from gtts import gTTS
 from io import BytesIO
 import pygame
 import time
-from tempfile import NamedTemporaryFile
+import math
 import os
+from core.audio_cache import AudioCache
+from core.tracing import NULL_TRACE, log
+
+TTS_LANG = 'en'
+TTS_VOICE = 'com'  # gTTS tld, selects the accent
+CACHE_DIR = os.getenv("SMRITI_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".smriti"))
+
+# Utterance priorities (lower plays first)
+PRIORITY_URGENT = 0   # interrupt acknowledgements, errors
+PRIORITY_NORMAL = 1   # replies
+PRIORITY_CHATTER = 2  # status chatter, dropped first under backpressure
+
+MAX_PENDING_UTTERANCES = 8
+
+
+class CancelToken:
+    """Cancellation flag shared between the caller and the TTS worker"""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+
+class Utterance:
+    """One queued speech request: a text or a stream of sentence chunks"""
+
+    def __init__(self, chunks, priority: int, generation: CancelToken, on_done, trace=NULL_TRACE):
+        self.chunks = chunks
+        self.priority = priority
+        self.trace = trace
+        self.token = CancelToken()
+        self._generation = generation
+        self._on_done = on_done
+        self._done = False
+        self._done_lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        return self.token.cancelled or self._generation.cancelled
+
+    def finish(self):
+        """Mark as finished exactly once (played, cancelled or dropped)"""
+        with self._done_lock:
+            if self._done:
+                return
+            self._done = True
+        self._on_done()
+        self.trace.mark("playback_end")
+        self.trace.end()
+
+
+class UtteranceQueue:
+    """Bounded priority queue; under backpressure the lowest-ranked item is dropped"""
+
+    def __init__(self, maxsize: int = MAX_PENDING_UTTERANCES):
+        self.maxsize = maxsize
+        self._heap = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+
+    def put(self, utterance: Utterance) -> Optional[Utterance]:
+        """Queue an utterance; returns whichever utterance was dropped to make room, if any"""
+        with self._cond:
+            dropped = None
+            if len(self._heap) >= self.maxsize:
+                worst = max(self._heap)  # lowest priority, newest
+                if worst[0] < utterance.priority:
+                    return utterance
+                self._heap.remove(worst)
+                heapq.heapify(self._heap)
+                dropped = worst[2]
+            heapq.heappush(self._heap, (utterance.priority, next(self._seq), utterance))
+            self._cond.notify()
+            return dropped
+
+    def get(self) -> Utterance:
+        with self._cond:
+            while not self._heap:
+                self._cond.wait()
+            return heapq.heappop(self._heap)[2]
+
+    def flush(self):
+        """Remove every pending utterance and return them"""
+        with self._cond:
+            pending = [item[2] for item in self._heap]
+            self._heap.clear()
+            return pending
+
+
+class PlaybackMeter:
+    """Playback listener reporting how loud the audio playing right now is (0..1)"""
+
+    def __init__(self, window_s: float = 0.05, full_scale: float = 8000.0):
+        self.window_s = window_s
+        self.full_scale = full_scale
+        self._clip = None  # (16-bit samples, sample rate, channels, start time)
+
+    def push_reference(self, pcm: bytes, sample_rate: int, channels: int, start_time: float):
+        self._clip = (memoryview(pcm).cast("h"), sample_rate, channels, start_time)
+
+    def end_reference(self, end_time: float):
+        self._clip = None
+
+    def progress(self, since: float, now: float = None):
+        """Fraction (0..1) played of the clip if it started after `since`, else None"""
+        clip = self._clip
+        if clip is None or clip[3] < since:
+            return None
+        samples, rate, channels, start = clip
+        now = time.time() if now is None else now
+        return min(1.0, max(0.0, (now - start) * rate * channels / max(1, len(samples))))
+
+    def level(self, now: float = None) -> float:
+        clip = self._clip
+        if clip is None:
+            return 0.0
+        samples, rate, channels, start = clip
+        now = time.time() if now is None else now
+        first = int((now - start) * rate) * channels
+        if first < 0 or first >= len(samples):
+            return 0.0
+        # First channel only: loudness, not fidelity
+        window = samples[first:first + int(self.window_s * rate) * channels:channels]
+        rms = math.sqrt(sum(s * s for s in window) / len(window))
+        return min(1.0, rms / self.full_scale)
+
+
+def _mp3_bytes(mp3_source) -> bytes:
+    """Contents of a BytesIO or memory-mapped cache entry"""
+    if isinstance(mp3_source, BytesIO):
+        with mp3_source.getbuffer() as view:
+            return bytes(view)
+    return bytes(mp3_source)
 
 
 class VoiceResponder:
     def __init__(self):
         try:
             print("🔧 Initializing gTTS responder...")
-            self.is_speaking_flag = False
             self.caption_callback: Optional[Callable[[str], None]] = None
             self._pygame_ready: bool = False
+            self.audio_cache: Optional[AudioCache] = None
+            self.dropped = 0
+            self.playback_listeners = []  # objects with push_reference()/end_reference(), e.g. an EchoCanceller
+            self.meter = PlaybackMeter()  # fed only after enable_meter(): every listener costs a decode per clip
+            self._pending = 0
+            self._pending_lock = threading.Lock()
+            self._generation = CancelToken()
+            self._utterances = UtteranceQueue()
+            # Small buffer: enough to hide synthesis latency without running ahead of a stop()
+            self._audio_queue = queue.Queue(maxsize=2)
+            # One synthesis worker and one playback worker for the whole app lifetime
+            threading.Thread(target=self._synth_worker, name="smriti-tts-synth", daemon=True).start()
+            threading.Thread(target=self._play_worker, name="smriti-tts-play", daemon=True).start()
+            try:
+                self.audio_cache = AudioCache(os.path.join(CACHE_DIR, "tts"))
+            except Exception as cache_err:
+                print(f"⚠️ Audio cache disabled: {cache_err}")
             # Initialize pygame mixer
             pygame.mixer.init()
             self._pygame_ready = True
@@ -22,70 +180,190 @@ class VoiceResponder:
         except Exception as e:
             print(f"❌ TTS init error: {e}")
 
-    def speak(self, text: str):
-        if not text or not text.strip():
-            return
-            
-        def speak_thread():
+    def _synthesize(self, text: str):
+        """
+        Generate TTS audio (mp3) in-memory, reusing cached audio when available.
+        Returns a seekable file-like object (BytesIO or a memory-mapped cache file).
+        """
+        if self.audio_cache:
+            cached = self.audio_cache.get(text, TTS_LANG, TTS_VOICE)
+            if cached is not None:
+                return cached
+        tts = gTTS(text=text, lang=TTS_LANG, tld=TTS_VOICE, slow=False)
+        mp3_buf = BytesIO()
+        tts.write_to_fp(mp3_buf)
+        if self.audio_cache:
+            # Write straight from the buffer, no getvalue() copy
+            with mp3_buf.getbuffer() as view:
+                self.audio_cache.put(text, view, TTS_LANG, TTS_VOICE)
+        mp3_buf.seek(0)
+        return mp3_buf
+
+    def _play(self, mp3_source, utterance: Utterance):
+        """Play one in-memory mp3 and block until it ends or the utterance is cancelled"""
+        # Use pygame to play MP3 directly
+        if not self._pygame_ready:
+            pygame.mixer.init()
+            self._pygame_ready = True
+
+        try:
+            # pygame reads the file-like object directly - no temp file round trip
+            pygame.mixer.music.load(mp3_source, "mp3")
+            started_at = time.time()
+            pygame.mixer.music.play()
+            utterance.trace.mark("first_audio")
+            # Decoded only for listeners, and only once the audio is already playing
+            reference = self._decode_reference(mp3_source) if self.playback_listeners else None
+            if reference is not None:
+                for listener in self.playback_listeners:
+                    listener.push_reference(*reference, started_at)
+            # Wait for playback to finish
+            while pygame.mixer.music.get_busy() and not utterance.cancelled:
+                time.sleep(0.05)
+            if reference is not None and utterance.cancelled:
+                for listener in self.playback_listeners:
+                    listener.end_reference(time.time())
+        finally:
             try:
-                print(f"🔊 Speaking: {text[:60]}...")
-                self.is_speaking_flag = True
+                # Release pygame's handle before the buffer/mapping goes away
+                pygame.mixer.music.unload()
+            except Exception:
+                pass
+            mp3_source.close()
 
-                # Send caption to UI
-                if self.caption_callback:
-                    self.caption_callback(text)
+    def _decode_reference(self, mp3_source):
+        """
+        Decode the mp3 to PCM for the playback listeners; returns (pcm, rate, channels) or None.
+        Works on a copy: the mixer is streaming from mp3_source, and pygame closes what it decodes.
+        """
+        try:
+            pcm = pygame.mixer.Sound(file=BytesIO(_mp3_bytes(mp3_source))).get_raw()
+            rate, size, channels = pygame.mixer.get_init()
+            if abs(size) != 16:
+                return None
+            return pcm, rate, channels
+        except Exception as e:
+            print(f"⚠️ Echo reference unavailable: {e}")
+            return None
+
+    def add_playback_listener(self, listener):
+        self.playback_listeners.append(listener)
 
-                # Generate TTS audio (mp3) in-memory
-                tts = gTTS(text=text, lang='en', slow=False)
-                mp3_buf = BytesIO()
-                tts.write_to_fp(mp3_buf)
-                mp3_buf.seek(0)
+    def enable_meter(self):
+        if self.meter not in self.playback_listeners:
+            self.playback_listeners.append(self.meter)
+
+    def prewarm(self, phrases):
+        """Synthesize fixed phrases into the audio cache in the background"""
+        if not self.audio_cache:
+            return
 
+        def prewarm_thread():
+            for phrase in phrases:
                 try:
-                    # Use pygame to play MP3 directly
-                    if not self._pygame_ready:
-                        pygame.mixer.init()
-                        self._pygame_ready = True
-                    
-                    # Write mp3 to temp file for pygame
-                    with NamedTemporaryFile(delete=False, suffix=".mp3") as tmp:
-                        tmp.write(mp3_buf.getvalue())
-                        tmp_path = tmp.name
-                    
-                    pygame.mixer.music.load(tmp_path)
-                    pygame.mixer.music.play()
-                    # Wait for playback to finish
-                    while pygame.mixer.music.get_busy() and self.is_speaking_flag:
-                        time.sleep(0.1)
-                    # Cleanup
-                    try:
-                        os.remove(tmp_path)
-                    except Exception:
-                        pass
-                except Exception as play_err:
-                    print(f"❌ Audio playback error: {play_err}")
-                finally:
-                    self.is_speaking_flag = False
-                    print("✅ Speech completed")
+                    if not self.audio_cache.contains(phrase, TTS_LANG, TTS_VOICE):
+                        tts = gTTS(text=phrase, lang=TTS_LANG, tld=TTS_VOICE, slow=False)
+                        mp3_buf = BytesIO()
+                        tts.write_to_fp(mp3_buf)
+                        with mp3_buf.getbuffer() as view:
+                            self.audio_cache.put(phrase, view, TTS_LANG, TTS_VOICE)
+                except Exception as e:
+                    print(f"⚠️ Prewarm failed for '{phrase[:30]}': {e}")
+            print("✅ Voice cache prewarmed")
+
+        threading.Thread(target=prewarm_thread, daemon=True).start()
+
+    def cache_stats(self) -> dict:
+        return self.audio_cache.stats() if self.audio_cache else {}
+
+    def _enqueue(self, chunks, priority: int, trace=NULL_TRACE) -> Optional[CancelToken]:
+        with self._pending_lock:
+            self._pending += 1
+        utterance = Utterance(chunks, priority, self._generation, self._utterance_done, trace)
+        dropped = self._utterances.put(utterance)
+        if dropped is not None:
+            self.dropped += 1
+            log("⏭️ Speech queue full, dropping low-priority utterance")
+            dropped.finish()
+            if dropped is utterance:
+                return None
+        return utterance.token
+
+    def _utterance_done(self):
+        with self._pending_lock:
+            self._pending -= 1
+
+    def speak(self, text: str, priority: int = PRIORITY_NORMAL, trace=NULL_TRACE) -> Optional[CancelToken]:
+        """Queue text for speech; returns a token that cancels just this utterance"""
+        if not text or not text.strip():
+            return None
+        return self._enqueue([text], priority, trace)
+
+    def speak_stream(self, chunks, priority: int = PRIORITY_NORMAL, trace=NULL_TRACE) -> Optional[CancelToken]:
+        """
+        Speak an iterable of sentence chunks as they arrive.
+        Synthesis of the next sentence overlaps playback of the current one,
+        so audio starts after roughly one sentence instead of the whole reply.
+        """
+        return self._enqueue(chunks, priority, trace)
+
+    def _synth_worker(self):
+        while True:
+            utterance = self._utterances.get()
+            try:
+                for chunk in utterance.chunks:
+                    if utterance.cancelled:
+                        break
+                    if chunk and chunk.strip():
+                        with utterance.trace.span("synthesis"):
+                            mp3_buf = self._synthesize(chunk)
+                        self._audio_queue.put((utterance, chunk, mp3_buf))
             except Exception as e:
                 print(f"❌ Speech error: {e}")
-                self.is_speaking_flag = False
+            finally:
+                # Stop a cancelled generator (e.g. a Gemini stream) right away
+                close = getattr(utterance.chunks, "close", None)
+                if close:
+                    close()
+                # End marker: the player finishes the utterance after its last chunk
+                self._audio_queue.put((utterance, None, None))
 
-        thread = threading.Thread(target=speak_thread, daemon=True)
-        thread.start()
+    def _play_worker(self):
+        while True:
+            utterance, text, mp3_buf = self._audio_queue.get()
+            if text is None:
+                utterance.finish()
+                continue
+            if utterance.cancelled:
+                mp3_buf.close()
+                continue  # drain audio synthesized before stop()
+            log(f"🔊 Speaking: {text[:60]}...")
+            if self.caption_callback:
+                self.caption_callback(text)
+            try:
+                with utterance.trace.span("playback"):
+                    self._play(mp3_buf, utterance)
+            except Exception as play_err:
+                print(f"❌ Audio playback error: {play_err}")
 
     def stop(self):
+        """Cancel the current utterance and flush everything queued before this call"""
         try:
-            print("🛑 Stopping current speech...")
+            log("🛑 Stopping current speech...")
+            stale, self._generation = self._generation, CancelToken()
+            stale.cancel()
+            for utterance in self._utterances.flush():
+                utterance.finish()
             if self._pygame_ready:
                 pygame.mixer.music.stop()
-            self.is_speaking_flag = False
-            print("🔇 Speech stopped successfully")
+            log("🔇 Speech stopped successfully")
         except Exception as e:
             print(f"⚠️ Stop error: {e}")
 
     def is_speaking(self):
-        return self.is_speaking_flag
+        """True while anything is queued, being synthesized or playing"""
+        with self._pending_lock:
+            return self._pending > 0
 
     def set_caption_callback(self, callback):
         self.caption_callback = callback
@@ -93,8 +371,11 @@ class VoiceResponder:
 
 _responder = VoiceResponder()
 
-def speak(text: str):
-    _responder.speak(text)
+def speak(text: str, priority: int = PRIORITY_NORMAL, trace=NULL_TRACE):
+    return _responder.speak(text, priority, trace)
+
+def speak_stream(chunks, priority: int = PRIORITY_NORMAL, trace=NULL_TRACE):
+    return _responder.speak_stream(chunks, priority, trace)
 
 def stop():
     _responder.stop()
@@ -103,4 +384,25 @@ def is_speaking():
     return _responder.is_speaking()
 
 def set_caption_callback(callback):
-    _responder.set_caption_callback(callback)
\ No newline at end of file
+    _responder.set_caption_callback(callback)
+
+def prewarm(phrases):
+    _responder.prewarm(phrases)
+
+def add_playback_listener(listener):
+    _responder.add_playback_listener(listener)
+
+def enable_meter():
+    """Feed speech_level() and playback_progress(); each clip is then decoded once it starts playing"""
+    _responder.enable_meter()
+
+def speech_level() -> float:
+    """Loudness of Smriti's voice right now (0..1), e.g. for the indicator animation"""
+    return _responder.meter.level()
+
+def playback_progress(since: float):
+    """How far (0..1) the audio that started playing after `since` has got, or None"""
+    return _responder.meter.progress(since)
+
+def audio_cache_stats():
+    return _responder.cache_stats()
\ No newline at end of file
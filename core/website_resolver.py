@@ -0,0 +1,345 @@
+import glob
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from difflib import get_close_matches
+from urllib.parse import quote_plus
+
+from core.tracing import log
+
+CACHE_DIR = os.getenv("SMRITI_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".smriti"))
+# {"spoken name": "https://..."} - the user's own shortcuts, they win over everything else
+ALIASES_FILE = os.getenv("SMRITI_SITES_FILE", os.path.join(CACHE_DIR, "sites.json"))
+
+# canonical name -> (url, spoken names); the intent router's site slots come from here too
+BUILTIN_SITES = {
+    "google": ("https://www.google.com", ["google"]),
+    "youtube": ("https://www.youtube.com", ["youtube", "you tube"]),
+    "facebook": ("https://www.facebook.com", ["facebook"]),
+    "instagram": ("https://www.instagram.com", ["instagram", "insta"]),
+    "twitter": ("https://www.twitter.com", ["twitter"]),
+    "github": ("https://www.github.com", ["github", "git hub"]),
+    "linkedin": ("https://www.linkedin.com", ["linkedin", "linked in"]),
+    "whatsapp": ("https://web.whatsapp.com", ["whatsapp", "whats app", "whatsapp web"]),
+    "gmail": ("https://mail.google.com", ["gmail", "google mail"]),
+    "drive": ("https://drive.google.com", ["google drive", "drive"]),
+    "maps": ("https://maps.google.com", ["google maps", "maps"]),
+    "amazon": ("https://www.amazon.com", ["amazon"]),
+    "netflix": ("https://www.netflix.com", ["netflix"]),
+    "prime": ("https://www.primevideo.com", ["prime video", "amazon prime", "prime"]),
+    "hotstar": ("https://www.hotstar.com", ["hotstar", "disney hotstar"]),
+    "wikipedia": ("https://www.wikipedia.org", ["wikipedia", "wiki"]),
+}
+
+# "search <query> on <site>"; {} is the url-encoded query
+SEARCH_TEMPLATES = {
+    "google": "https://www.google.com/search?q={}",
+    "youtube": "https://www.youtube.com/results?search_query={}",
+    "amazon": "https://www.amazon.com/s?k={}",
+    "github": "https://github.com/search?q={}",
+    "wikipedia": "https://en.wikipedia.org/w/index.php?search={}",
+    "maps": "https://www.google.com/maps/search/{}",
+    "netflix": "https://www.netflix.com/search?q={}",
+}
+DEFAULT_SEARCH = "google"
+
+SOURCE_ALIAS = "alias"
+SOURCE_BUILTIN = "builtin"
+SOURCE_BOOKMARK = "bookmark"
+_SOURCE_RANK = {SOURCE_ALIAS: 0, SOURCE_BUILTIN: 1, SOURCE_BOOKMARK: 2}
+
+_WORD = re.compile(r"[a-z0-9]+")
+_DOMAIN = re.compile(r"^[a-z0-9-]+(?:\.[a-z0-9-]+)*\.([a-z]{2,})(/\S*)?$")
+# A dotted word is a domain when it ends in one of these, or was spoken with "dot"
+# ("python 3.11" and "notes.txt" are not)
+KNOWN_TLDS = {
+    "com", "org", "net", "edu", "gov", "int", "io", "co", "ai", "app", "dev", "me", "in", "us", "uk", "ca",
+    "au", "de", "fr", "jp", "info", "biz", "tv", "gg", "ly", "xyz", "site", "online", "tech", "blog", "wiki",
+}
+# Filler around a site name: "open the youtube website", "go to github dot com"
+_FILLER = {"the", "website", "site", "web", "page", "homepage", "my"}
+
+
+def normalize_site_name(text: str) -> str:
+    return " ".join(w for w in _WORD.findall(text.lower()) if w not in _FILLER)
+
+
+class Website:
+    __slots__ = ("name", "url", "source")
+
+    def __init__(self, name: str, url: str, source: str):
+        self.name = name
+        self.url = url
+        self.source = source
+
+    def __repr__(self):
+        return f"Website({self.name!r}, {self.url!r}, {self.source!r})"
+
+
+class PrefixTrie:
+    """Site names by prefix: "insta" or "linked" find the one site they start"""
+
+    def __init__(self):
+        self._root = {}
+
+    def insert(self, key: str, value):
+        node = self._root
+        for ch in key:
+            node = node.setdefault(ch, {})
+        node.setdefault(None, []).append(value)
+
+    def with_prefix(self, prefix: str, limit: int = 8):
+        node = self._root
+        for ch in prefix:
+            node = node.get(ch)
+            if node is None:
+                return []
+        # Shortest completions first: breadth-first over the subtree
+        found, level = [], [node]
+        while level and len(found) < limit:
+            next_level = []
+            for n in level:
+                found.extend(n.get(None, ()))
+                next_level.extend(child for key, child in n.items() if key is not None)
+            level = next_level
+        return found[:limit]
+
+
+def chrome_bookmark_files():
+    home = os.path.expanduser("~")
+    local = os.environ.get("LOCALAPPDATA", "")
+    bases = [
+        os.path.join(home, ".config", "google-chrome"), os.path.join(home, ".config", "chromium"),
+        os.path.join(home, ".config", "microsoft-edge"), os.path.join(home, ".config", "BraveSoftware", "Brave-Browser"),
+        os.path.join(home, "Library", "Application Support", "Google", "Chrome"),
+        os.path.join(home, "Library", "Application Support", "Microsoft Edge"),
+    ]
+    if local:
+        bases += [os.path.join(local, "Google", "Chrome", "User Data"), os.path.join(local, "Microsoft", "Edge", "User Data")]
+    return [path for base in bases for path in glob.glob(os.path.join(base, "*", "Bookmarks"))]
+
+
+def firefox_bookmark_files():
+    home = os.path.expanduser("~")
+    patterns = [os.path.join(home, ".mozilla", "firefox", "*", "places.sqlite"),
+                os.path.join(home, "Library", "Application Support", "Firefox", "Profiles", "*", "places.sqlite")]
+    if os.environ.get("APPDATA"):
+        patterns.append(os.path.join(os.environ["APPDATA"], "Mozilla", "Firefox", "Profiles", "*", "places.sqlite"))
+    return [path for pattern in patterns for path in glob.glob(pattern)]
+
+
+def read_chrome_bookmarks(path: str):
+    """(title, url) pairs from a Chrome/Edge/Brave "Bookmarks" JSON file"""
+    with open(path, encoding="utf-8") as f:
+        roots = json.load(f).get("roots", {})
+    pending = [node for node in roots.values() if isinstance(node, dict)]
+    while pending:
+        node = pending.pop()
+        if node.get("type") == "url" and node.get("name") and node.get("url"):
+            yield node["name"], node["url"]
+        pending.extend(node.get("children", ()))
+
+
+def read_firefox_bookmarks(path: str):
+    """(title, url) pairs from places.sqlite; immutable mode reads it while Firefox holds the lock"""
+    uri = "file:" + path.replace("\\", "/") + "?immutable=1"
+    connection = sqlite3.connect(uri, uri=True)
+    try:
+        rows = connection.execute(
+            "SELECT b.title, p.url FROM moz_bookmarks b JOIN moz_places p ON b.fk = p.id "
+            "WHERE b.type = 1 AND b.title IS NOT NULL AND p.url LIKE 'http%'"
+        ).fetchall()
+    finally:
+        connection.close()
+    return rows
+
+
+class WebsiteResolver:
+    """
+    Spoken site name -> URL, over built-in sites, user aliases and browser
+    bookmarks. Names are looked up exactly, then by prefix (trie), then
+    fuzzily. The index is built on first use and rebuilt in the background
+    when the aliases or bookmark files change.
+    """
+
+    def __init__(self, aliases_file: str = ALIASES_FILE, bookmark_files=None,
+                 check_interval_s: float = 5.0, fuzzy_cutoff: float = 0.8):
+        self.aliases_file = aliases_file
+        self.bookmark_files = bookmark_files  # None = discover Chrome/Firefox profiles
+        self.check_interval_s = check_interval_s
+        self.fuzzy_cutoff = fuzzy_cutoff
+        self.builds = 0
+        self.lookups = 0
+        self.misses = 0
+        self._by_name = {}
+        self._trie = PrefixTrie()
+        self._by_initial = {}
+        self._signature = None
+        self._checked_at = 0.0
+        self._rebuilding = False
+        self._lock = threading.Lock()
+
+    # --- building ---------------------------------------------------------
+
+    def _sources(self):
+        if self.bookmark_files is not None:
+            return [self.aliases_file, *self.bookmark_files]
+        return [self.aliases_file, *chrome_bookmark_files(), *firefox_bookmark_files()]
+
+    @staticmethod
+    def _signature_of(paths):
+        signature = []
+        for path in paths:
+            try:
+                stat = os.stat(path)
+                signature.append((path, stat.st_mtime, stat.st_size))
+            except OSError:
+                signature.append((path, None, None))
+        return tuple(signature)
+
+    def _load_sites(self, paths):
+        sites = []
+        for name, (url, words) in BUILTIN_SITES.items():
+            sites.extend(Website(word, url, SOURCE_BUILTIN) for word in words)
+        for path in paths:
+            try:
+                if path == self.aliases_file:
+                    with open(path, encoding="utf-8") as f:
+                        sites.extend(Website(name, url, SOURCE_ALIAS) for name, url in json.load(f).items())
+                elif path.endswith(".sqlite"):
+                    sites.extend(Website(t, u, SOURCE_BOOKMARK) for t, u in read_firefox_bookmarks(path))
+                else:
+                    sites.extend(Website(t, u, SOURCE_BOOKMARK) for t, u in read_chrome_bookmarks(path))
+            except FileNotFoundError:
+                continue
+            except Exception as e:
+                print(f"⚠️ Couldn't read sites from {path}: {e}")
+        return sites
+
+    def build(self):
+        """(Re)build the index from every source"""
+        started = time.perf_counter()
+        paths = self._sources()
+        signature = self._signature_of(paths)
+        by_name, trie, by_initial = {}, PrefixTrie(), {}
+        for site in sorted(self._load_sites(paths), key=lambda s: _SOURCE_RANK[s.source]):
+            key = normalize_site_name(site.name)
+            if not key or key in by_name:
+                continue  # aliases beat built-ins beat bookmarks
+            by_name[key] = site
+            trie.insert(key, key)
+            compact = key.replace(" ", "")
+            if compact != key:
+                trie.insert(compact, key)
+            by_initial.setdefault(key[0], []).append(key)
+        with self._lock:
+            self._by_name, self._trie, self._by_initial = by_name, trie, by_initial
+            self._signature = signature
+            self._checked_at = time.monotonic()
+        self.builds += 1
+        log(f"🌐 Website index: {len(by_name)} names ({(time.perf_counter() - started) * 1000:.0f} ms)")
+
+    def _ensure_fresh(self):
+        if self._signature is None:
+            self.build()
+            return
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval_s:
+            return
+        self._checked_at = now
+        if self._signature_of(self._sources()) != self._signature and not self._rebuilding:
+            # Keep answering from the current index while the new one is built
+            self._rebuilding = True
+
+            def rebuild():
+                try:
+                    self.build()
+                finally:
+                    self._rebuilding = False
+
+            threading.Thread(target=rebuild, name="smriti-site-index", daemon=True).start()
+
+    # --- lookup -----------------------------------------------------------
+
+    def resolve(self, spoken: str, fuzzy: bool = True):
+        """
+        Website for a spoken name or domain ("youtube", "insta", "example dot com"),
+        or None. fuzzy=False skips the misspelling pass (for "open X" before trying apps).
+        """
+        self._ensure_fresh()
+        self.lookups += 1
+        spoken_dot = " dot " in f" {spoken.lower().strip()} "
+        text = spoken.lower().strip().replace(" dot ", ".")
+        compact = text.replace(" ", "")
+        domain = _DOMAIN.match(compact)
+        if text.startswith(("http://", "https://")) or (domain and (spoken_dot or domain.group(1) in KNOWN_TLDS)):
+            url = compact if compact.startswith("http") else "https://" + compact
+            return Website(compact, url, SOURCE_ALIAS)
+
+        key = normalize_site_name(text)
+        with self._lock:
+            by_name, trie, by_initial = self._by_name, self._trie, self._by_initial
+        if not key:
+            self.misses += 1
+            return None
+        site = by_name.get(key)
+        if site is None and len(key) >= 3:
+            # A prefix naming exactly one site ("insta", "linked")
+            completions = set(trie.with_prefix(key.replace(" ", "")))
+            if len(completions) == 1:
+                site = by_name[completions.pop()]
+        if site is None and fuzzy:
+            close = get_close_matches(key, by_initial.get(key[0], ()), n=1, cutoff=self.fuzzy_cutoff)
+            site = by_name[close[0]] if close else None
+        if site is None:
+            self.misses += 1
+        return site
+
+    def search_url(self, request: str):
+        """
+        "cats on youtube" / "youtube for cats" / "cats" -> (site, query, url);
+        None when there is nothing to search for.
+        """
+        text = " ".join(_WORD.findall(request.lower()))  # keep "the"/"my": they belong to the query
+        for prefix in ("search for ", "search ", "the web for ", "the internet for ", "for "):
+            if text.startswith(prefix):
+                text = text[len(prefix):]
+        site, query = DEFAULT_SEARCH, text
+        match = re.match(r"^(.+?) (?:on|in) (\w+(?: \w+)?)$", text)
+        if match and self._search_site(match.group(2)):
+            site, query = self._search_site(match.group(2)), match.group(1)
+        else:
+            match = re.match(r"^(\w+) (?:for )?(.+)$", text)
+            if match and self._search_site(match.group(1)):
+                site, query = self._search_site(match.group(1)), match.group(2)
+        if not query:
+            return None
+        return site, query, SEARCH_TEMPLATES[site].format(quote_plus(query))
+
+    @staticmethod
+    def _search_site(name: str):
+        for site, (_, words) in BUILTIN_SITES.items():
+            if site in SEARCH_TEMPLATES and (name == site or name in words):
+                return site
+        return None
+
+    def stats(self) -> dict:
+        return {"names": len(self._by_name), "builds": self.builds, "lookups": self.lookups, "misses": self.misses}
+
+
+website_resolver = WebsiteResolver()
+
+
+def resolve_website(spoken: str, fuzzy: bool = True):
+    return website_resolver.resolve(spoken, fuzzy)
+
+
+def search_url(request: str):
+    return website_resolver.search_url(request)
+
+
+def website_stats() -> dict:
+    return website_resolver.stats()
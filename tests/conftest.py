@@ -0,0 +1,24 @@
+import os
+import sys
+
+import pytest
+
+# Tests import Smriti's packages (core, ui) from the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def dummy_programs(tmp_path, monkeypatch):
+    """make(name, body): a shell script called name on a PATH of its own; returns its path"""
+    if os.name == "nt":
+        pytest.skip("dummy programs are POSIX shell scripts")
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}")
+
+    def make(name: str, body: str) -> str:
+        path = bin_dir / name
+        path.write_text(f"#!/bin/sh\n{body}\n")
+        path.chmod(0o755)
+        return str(path)
+    return make
@@ -0,0 +1,31 @@
+"""App lookup: $PATH tools match only by exact name, system tools never"""
+import pytest
+
+from benchmarks.corpora import NOT_APPS, PATH_TOOLS
+from core.app_index import AppEntry, AppIndex, KIND_DESKTOP, KIND_PATH
+
+
+@pytest.fixture
+def index():
+    index = AppIndex(path="", roots=[])
+    apps = [AppEntry(name, [name.lower()], KIND_DESKTOP, "") for name in ("GNOME Text Editor", "Calculator", "Spotify")]
+    tools = [AppEntry(tool, [f"{directory}/{tool}"], KIND_PATH, f"{directory}/{tool}") for tool, directory in PATH_TOOLS]
+    index.set_entries(apps + tools)
+    return index
+
+
+@pytest.mark.parametrize("spoken", NOT_APPS)
+def test_nothing_installed_matches_nothing(index, spoken):
+    assert index._match(spoken) is None
+
+
+def test_path_tools_match_exactly_or_not_at_all(index):
+    assert index._match("sort").argv == ["/usr/bin/sort"]
+    assert index._match("sorts") is None
+    assert index._match("zic") is None  # /usr/sbin
+
+
+def test_apps_still_match_loosely(index):
+    assert index._match("text editor").name == "GNOME Text Editor"
+    assert index._match("kalkulator").name == "Calculator"
+    assert index._match("spotfy").name == "Spotify"
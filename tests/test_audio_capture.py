@@ -0,0 +1,80 @@
+"""CaptureEngine keeps capturing through bad frames and reports a dead source"""
+import math
+import time
+from array import array
+
+import pytest
+
+from core.audio_capture import CaptureEngine
+
+RATE = 16000
+FRAME = 480
+
+
+class ToneSource:
+    """Silence, then a 1 s tone, then silence; raises after `fail_after` frames if set"""
+
+    sample_rate = RATE
+    frame_samples = FRAME
+
+    def __init__(self, frames: int = 150, fail_after: int = None):
+        self.frames = frames
+        self.fail_after = fail_after
+        self.read_count = 0
+
+    def read(self) -> bytes:
+        self.read_count += 1
+        if self.fail_after is not None and self.read_count > self.fail_after:
+            raise OSError("device unplugged")
+        if self.read_count > self.frames:
+            return b""
+        loud = 50 <= self.read_count < 84
+        amplitude = 6000 if loud else 30
+        start = self.read_count * FRAME
+        return array("h", (int(amplitude * math.sin(2 * math.pi * 220 * (start + i) / RATE)) for i in range(FRAME))).tobytes()
+
+    def close(self):
+        pass
+
+
+def run(engine: CaptureEngine, timeout: float = 5.0):
+    engine.start()
+    deadline = time.monotonic() + timeout
+    while engine._running and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_a_raising_filter_drops_frames_not_the_capture_thread():
+    engine = CaptureEngine(ToneSource())
+    calls = {"n": 0}
+
+    def flaky(frame):
+        calls["n"] += 1
+        if calls["n"] % 10 == 0:
+            raise ValueError("filter glitch")
+        return frame
+
+    engine.frame_filters.append(flaky)
+    run(engine)
+    assert engine.source.read_count == 151  # read to the end of the source
+    assert engine.frame_errors == 15
+    assert not engine.failed
+    assert engine.next_segment(timeout=0, max_age=60) is not None
+
+
+def test_a_broken_source_marks_the_engine_failed():
+    engine = CaptureEngine(ToneSource(fail_after=20))
+    run(engine)
+    assert engine.failed
+    assert not engine._running
+
+
+def test_a_failed_engine_is_replaced_by_the_per_listen_mic():
+    voice_recognition = pytest.importorskip("core.voice_recognition")
+    engine = CaptureEngine(ToneSource(fail_after=5))
+    run(engine)
+    voice_recognition.set_capture_engine(engine)
+    try:
+        assert voice_recognition.get_capture_engine() is None
+    finally:
+        voice_recognition.set_capture_engine(None)
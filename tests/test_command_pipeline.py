@@ -0,0 +1,79 @@
+"""CommandPipeline ordering against a fake TTS that cancels by generation, like VoiceResponder.stop()"""
+import threading
+
+from core.command_pipeline import CommandPipeline
+
+
+class Token:
+    def __init__(self):
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class FakeTTS:
+    def __init__(self):
+        self.generation = Token()
+        self.spoken = []
+        self._threads = []
+
+    def speak_stream(self, chunks, trace=None):
+        token = self.generation
+
+        def drain():
+            for chunk in chunks:
+                if not token.cancelled:
+                    self.spoken.append(chunk)
+
+        thread = threading.Thread(target=drain, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+        return token
+
+    def stop(self):
+        stale, self.generation = self.generation, Token()
+        stale.cancel()
+
+    def join(self):
+        for thread in self._threads:
+            thread.join(timeout=2)
+
+
+def make_pipeline(tts, answer_offline):
+    def interrupt(command):
+        if command == "stop":
+            tts.stop()
+            return "Okay, stopped."
+        return None
+
+    return CommandPipeline(answer_offline, lambda command: iter(["cloud reply."]), tts.speak_stream,
+                           interrupt=interrupt)
+
+
+def test_stop_reply_survives_its_own_stop():
+    tts = FakeTTS()
+    pipeline = make_pipeline(tts, lambda command: None)
+    job = pipeline.submit("stop").result(timeout=2)
+    tts.join()
+    assert job.reply == ["Okay, stopped."]
+    assert tts.spoken == ["Okay, stopped."]
+
+
+def test_stop_silences_the_reply_before_it():
+    tts = FakeTTS()
+    release = threading.Event()
+
+    def slow_offline(command):
+        release.wait(timeout=2)
+        return f"answer to {command}"
+
+    pipeline = make_pipeline(tts, slow_offline)
+    first = pipeline.submit("what is 2 plus 2")
+    stopped = pipeline.submit("stop").result(timeout=2)
+    release.set()
+    first.result(timeout=2)
+    tts.join()
+    assert tts.spoken == ["Okay, stopped."]
+    assert stopped.reply == ["Okay, stopped."]
+    assert pipeline.stats()["submitted"] == 2
@@ -0,0 +1,66 @@
+"""Closing programs Smriti did not start: real sleeper processes found by name"""
+import os
+import signal
+import subprocess
+import time
+
+import pytest
+
+from core.process_inspector import ProcessInfo, close_processes, find_processes
+
+STUBBORN = "trap '' TERM\nwhile :; do sleep 0.05; done"
+
+
+@pytest.fixture
+def spawn(dummy_programs):
+    """spawn(name, body): run a dummy program in its own session; killed with its children afterwards"""
+    started = []
+
+    def start(name: str, body: str = "while :; do sleep 0.05; done") -> subprocess.Popen:
+        dummy_programs(name, body)
+        popen = subprocess.Popen([name], start_new_session=True)
+        started.append(popen)
+        time.sleep(0.2)  # past exec and the trap
+        return popen
+    yield start
+    for popen in started:
+        try:
+            os.killpg(popen.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        popen.wait()
+
+
+def test_term_ignoring_sleeper_is_killed(spawn):
+    sleeper = spawn("rvsleeper", STUBBORN)
+    start = time.monotonic()
+    closed, survivors = close_processes(["rvsleeper"], grace_s=0.3)
+    elapsed = time.monotonic() - start
+    assert [p.pid for p in closed] == [sleeper.pid]
+    assert survivors == []
+    assert sleeper.wait(timeout=1) == -signal.SIGKILL
+    assert elapsed < 1.5
+
+
+def test_polite_sleeper_exits_on_term(spawn):
+    sleeper = spawn("rvpolite")
+    closed, survivors = close_processes(["rvpolite"], grace_s=2.0)
+    assert [p.pid for p in closed] == [sleeper.pid] and survivors == []
+    assert sleeper.wait(timeout=1) == -signal.SIGTERM
+
+
+def test_code_does_not_match_decode(spawn):
+    decoder = spawn("decode")
+    assert decoder.pid not in {p.pid for p in find_processes(["code"])}
+    assert decoder.pid in {p.pid for p in find_processes(["decode"])}
+    assert not ProcessInfo(1, "decode", "/usr/bin/decode").matches("code")
+    assert not ProcessInfo(1, "vscode-helper", "/opt/vscode/vscode-helper").matches("code")
+    assert ProcessInfo(1, "Google Chrome", "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome").matches("google chrome")
+
+
+def test_long_name_found_past_comm_truncation(spawn):
+    # Linux shows this as "gnome-terminal-"; "close terminal" must still find it
+    server = spawn("gnome-terminal-server")
+    assert server.pid in {p.pid for p in find_processes(["gnome-terminal-server"])}
+    assert ProcessInfo(1, "gnome-terminal-", "/usr/libexec/gnome-terminal-server").matches("gnome-terminal-server")
+    assert not ProcessInfo(1, "gnome-terminal", "/usr/bin/gnome-terminal").matches("gnome-terminal-server")
@@ -0,0 +1,61 @@
+"""ProcessLauncher against dummy programs on a temporary PATH"""
+import signal
+import time
+
+import pytest
+
+from core.process_launcher import ProcessLauncher
+
+# exec: the pid Popen reports is the sleeper itself, not a shell waiting on it
+SLEEPER = "exec sleep 30"
+STUBBORN = "trap '' TERM\nsleep 30 &\nwait"
+
+
+def wait_until(condition, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+
+def test_launch_returns_without_waiting(dummy_programs):
+    dummy_programs("rvslow", SLEEPER)
+    launcher = ProcessLauncher()
+    start = time.monotonic()
+    process = launcher.launch("rvslow", ["rvslow"])
+    try:
+        assert time.monotonic() - start < 0.5
+        assert process.running
+        assert launcher.running("close rvslow") == [process]
+    finally:
+        launcher.terminate("rvslow", grace_s=0.5)
+
+
+def test_registry_reaps_programs_that_exit(dummy_programs):
+    dummy_programs("rvquick", "exit 3")
+    launcher = ProcessLauncher()
+    process = launcher.launch("rvquick", ["rvquick"])
+    assert wait_until(lambda: launcher.stats()["exited"] == 1)
+    assert process.popen.returncode == 3
+    assert launcher.running() == []
+    assert launcher.stats()["running"] == 0
+
+
+def test_terminate_escalates_to_kill(dummy_programs):
+    dummy_programs("rvstubborn", STUBBORN)
+    launcher = ProcessLauncher()
+    process = launcher.launch("rvstubborn", ["rvstubborn"])
+    time.sleep(0.2)  # let the shell install its trap
+    start = time.monotonic()
+    closed = launcher.terminate("close rvstubborn", grace_s=0.3)
+    assert closed == [process]
+    assert process.popen.returncode == -signal.SIGKILL
+    assert time.monotonic() - start < 2.0
+    assert wait_until(lambda: launcher.stats()["running"] == 0)
+
+
+def test_missing_program():
+    with pytest.raises(FileNotFoundError):
+        ProcessLauncher().launch("nothing", ["rv-no-such-program"])
@@ -0,0 +1,36 @@
+"""The golden command corpora the routing benchmark scores, as hard checks"""
+import pytest
+
+from benchmarks.corpora import GOLDEN_INTENTS, GOLDEN_KEYWORDS, GOLDEN_SKILLS
+from core.intent_router import route
+from core.keyword_spotter import command_keyword
+from core.local_skills import answer_locally
+from core.website_resolver import resolve_website
+
+
+@pytest.mark.parametrize("command, name, target", GOLDEN_INTENTS)
+def test_intent(command, name, target):
+    intent = route(command)
+    assert ((intent.name, intent.target) if intent else (None, None)) == (name, target)
+
+
+@pytest.mark.parametrize("command, kind", GOLDEN_KEYWORDS)
+def test_shutdown_only_when_meant_for_smriti(command, kind):
+    keyword = command_keyword(command)
+    assert (keyword[0] if keyword else None) == kind
+
+
+@pytest.mark.parametrize("command, local", GOLDEN_SKILLS)
+def test_local_skill_answers_only_its_own_questions(command, local):
+    assert bool(answer_locally(command, count=False)) == local
+
+
+@pytest.mark.parametrize("spoken, url", [
+    ("github.com", "https://github.com"),
+    ("example dot xyz", "https://example.xyz"),
+    ("python 3.11", None),
+    ("notes.txt", None),
+])
+def test_domains_need_a_known_tld_or_a_spoken_dot(spoken, url):
+    site = resolve_website(spoken, fuzzy=False)
+    assert (site.url if site else None) == url
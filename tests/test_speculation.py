@@ -0,0 +1,61 @@
+"""Speculative calls share the command pipeline's cloud cap"""
+import importlib
+import threading
+
+from core.command_pipeline import CloudLimiter
+import core.speculation
+from core.speculation import Speculator
+
+
+def gated_stream(gate):
+    def start_stream(text, on_finish):
+        gate.wait(timeout=2)
+        yield f"answer to {text}."
+        on_finish(text, f"answer to {text}.", True)
+    return start_stream
+
+
+def test_speculation_waits_for_a_free_cloud_slot():
+    limiter = CloudLimiter(1)
+    speculator = Speculator(gated_stream(threading.Event()), commit=lambda *args: None, limiter=limiter)
+    assert limiter.try_acquire()  # a command's generation holds the only slot
+    speculator.propose("tell me a fun fact")
+    assert speculator.stats()["skipped_busy"] == 1
+    assert speculator.claim("tell me a fun fact") is None
+    assert limiter.active == 1
+
+
+def test_claimed_speculation_hands_its_slot_to_the_command():
+    limiter = CloudLimiter(2)
+    gate = threading.Event()
+    committed = []
+    speculator = Speculator(gated_stream(gate), commit=lambda *args: committed.append(args), limiter=limiter)
+    speculator.propose("tell me a fun fact")
+    assert limiter.active == 1
+    reply = speculator.claim("tell me a fun fact")
+    assert limiter.active == 0
+    gate.set()
+    assert list(reply) == ["answer to tell me a fun fact."]
+    assert committed and limiter.active == 0 and limiter.peak == 1
+
+
+def test_discarded_speculation_frees_its_slot():
+    limiter = CloudLimiter(1)
+    gate = threading.Event()
+    freed = threading.Event()
+    speculator = Speculator(gated_stream(gate), commit=lambda *args: None, limiter=limiter)
+    speculator.propose("tell me a fun fact")
+    assert not limiter.try_acquire(on_free=freed.set)
+    speculator.propose("tell me a joke instead")  # replaces it; no slot for the new one yet
+    gate.set()
+    assert freed.wait(timeout=2)
+    assert limiter.active == 0
+
+
+def test_bad_waste_cap_falls_back_to_the_default(monkeypatch):
+    monkeypatch.setenv("SMRITI_SPECULATION_MAX_WASTED", "lots")
+    try:
+        assert importlib.reload(core.speculation).MAX_WASTED_CALLS == 5
+    finally:
+        monkeypatch.delenv("SMRITI_SPECULATION_MAX_WASTED")
+        importlib.reload(core.speculation)
@@ -0,0 +1,36 @@
+"""The offline recognizer loads its model from disk only"""
+import sys
+import types
+
+import pytest
+
+pytest.importorskip("speech_recognition")
+from core.speech_backends import VoskBackend
+
+
+@pytest.fixture
+def fake_vosk(monkeypatch):
+    """A vosk module that records every model it is asked to load"""
+    loads = []
+    vosk = types.ModuleType("vosk")
+    vosk.SetLogLevel = lambda level: None
+    vosk.Model = lambda *args, **kwargs: loads.append((args, kwargs)) or object()
+    monkeypatch.setitem(sys.modules, "vosk", vosk)
+    return loads
+
+
+def test_unset_model_path_never_downloads(fake_vosk, monkeypatch):
+    monkeypatch.delenv("SMRITI_VOSK_MODEL", raising=False)
+    backend = VoskBackend()
+    assert not backend.available()
+    assert fake_vosk == []
+
+
+def test_missing_model_directory_is_unavailable(fake_vosk, tmp_path):
+    assert not VoskBackend(str(tmp_path / "absent")).available()
+    assert fake_vosk == []
+
+
+def test_local_model_directory_loads(fake_vosk, tmp_path):
+    assert VoskBackend(str(tmp_path)).available()
+    assert fake_vosk == [((str(tmp_path),), {})]
@@ -0,0 +1,163 @@
+from PySide6.QtCore import Qt, QTimer, QRectF, QPointF, QSize
+from PySide6.QtGui import QColor, QFont, QPainter, QTextLayout, QTextOption
+from PySide6.QtWidgets import QWidget, QSizePolicy
+import time
+
+
+class CaptionLabel(QWidget):
+    """
+    Caption bubble that types its text out. Each caption is laid out once
+    (QTextLayout) and every tick only paints the revealed part, from a single
+    timer. Captions arriving within one tick collapse into the newest, and
+    spoken captions follow the TTS playback position instead of a fixed pace.
+    """
+
+    TICK_MS = 33
+    CHARS_PER_S = 35.0  # typing pace when there is no playback to follow
+    PLAYBACK_GRACE_S = 0.4  # wait this long for the audio to start before typing at the fixed pace
+    PADDING_X = 20
+    PADDING_Y = 8
+    MARGIN_TOP = 10
+    BACKGROUND = QColor(60, 0, 100, 130)
+
+    def __init__(self, text: str = "", parent=None):
+        super().__init__(parent)
+        font = QFont("Segoe UI")
+        font.setPixelSize(14)
+        font.setBold(True)
+        self.setFont(font)
+        self.setAttribute(Qt.WA_TranslucentBackground)
+        self.setSizePolicy(QSizePolicy.Preferred, QSizePolicy.Fixed)
+        self.progress_source = None  # callable(since) -> fraction (0..1) of audio started after `since`, or None
+        self._text = ""
+        self._layout = None
+        self._layout_width = None
+        self._size = QSize(0, 0)
+        self._revealed = 0
+        self._paced = False
+        self._shown_at = 0.0  # wall clock, to match the playback position
+        self._started = 0.0
+        self._pending = None  # (text, paced, shown_at) of the newest caption not yet laid out
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self._tick)
+        self.setText(text)
+
+    def text(self) -> str:
+        return self._text
+
+    def setText(self, text: str):
+        """Show text at once, without typing"""
+        self._pending = None
+        self.timer.stop()
+        self._set(text, False, time.time())
+        self._revealed = len(text)
+        self.update()
+
+    def show_caption(self, text: str, paced: bool = False, shown_at: float = None):
+        """Type text out; paced captions follow the audio that starts after shown_at"""
+        self._pending = (text, paced, time.time() if shown_at is None else shown_at)
+        if not self.timer.isActive():
+            self.timer.start(self.TICK_MS)
+
+    def _set(self, text: str, paced: bool, shown_at: float):
+        self._text = text
+        self._paced = paced
+        self._shown_at = shown_at
+        self._started = time.monotonic()
+        self._revealed = 0
+        # Sized for the whole caption up front, so the bubble doesn't grow per character
+        self._relayout()
+        self.updateGeometry()
+
+    def _tick(self):
+        if self._pending is not None:
+            self._set(*self._pending)
+            self._pending = None
+        target = min(len(self._text), max(self._revealed, self._target()))
+        if target != self._revealed:
+            self._revealed = target
+            self.update()
+        if self._revealed >= len(self._text):
+            self.timer.stop()
+
+    def _target(self) -> int:
+        elapsed = time.monotonic() - self._started
+        if self._paced and self.progress_source is not None:
+            progress = self.progress_source(self._shown_at)
+            if progress is not None:
+                return int(len(self._text) * progress)
+            if elapsed < self.PLAYBACK_GRACE_S:
+                return 0
+            elapsed -= self.PLAYBACK_GRACE_S
+        return int(elapsed * self.CHARS_PER_S)
+
+    def _line_layout(self, width: float) -> QTextLayout:
+        layout = QTextLayout(self._text, self.font())
+        option = QTextOption(Qt.AlignHCenter)
+        option.setWrapMode(QTextOption.WrapAtWordBoundaryOrAnywhere)
+        layout.setTextOption(option)
+        layout.beginLayout()
+        y = 0.0
+        while True:
+            line = layout.createLine()
+            if not line.isValid():
+                break
+            line.setLineWidth(width)
+            line.setPosition(QPointF(0, y))
+            y += line.height()
+        layout.endLayout()
+        return layout
+
+    def _relayout(self):
+        limit = max(1, min(self.maximumWidth(), 16777215) - 2 * self.PADDING_X)
+        if not self._text:
+            self._layout, self._size = None, QSize(0, 0)
+            return
+        # Wrap at the widest allowed width, then shrink to the longest line so lines centre in the bubble
+        layout = self._line_layout(limit)
+        width = max(layout.lineAt(i).naturalTextWidth() for i in range(layout.lineCount()))
+        self._layout = self._line_layout(min(limit, width + 1))
+        self._layout_width = min(limit, width + 1)
+        height = self._layout.boundingRect().height()
+        self._size = QSize(int(self._layout_width) + 2 * self.PADDING_X,
+                           int(height) + 2 * self.PADDING_Y + self.MARGIN_TOP)
+
+    def setMaximumWidth(self, width: int):
+        super().setMaximumWidth(width)
+        self._relayout()
+        self.updateGeometry()
+        self.update()
+
+    def sizeHint(self) -> QSize:
+        return self._size
+
+    def minimumSizeHint(self) -> QSize:
+        return self._size
+
+    def paintEvent(self, event):
+        if self._layout is None:
+            return
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        bubble = QRectF(0, self.MARGIN_TOP, self.width(), self.height() - self.MARGIN_TOP)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(self.BACKGROUND)
+        painter.drawRoundedRect(bubble, 10, 10)
+
+        painter.setPen(Qt.white)
+        origin = QPointF((self.width() - self._layout_width) / 2, self.MARGIN_TOP + self.PADDING_Y)
+        for i in range(self._layout.lineCount()):
+            line = self._layout.lineAt(i)
+            start = line.textStart()
+            if self._revealed <= start:
+                break
+            if self._revealed >= start + line.textLength():
+                line.draw(painter, origin)
+                continue
+            # Partly revealed line: clip at the cursor position of the last revealed character
+            x = line.cursorToX(self._revealed)
+            x = x[0] if isinstance(x, tuple) else x
+            painter.setClipRect(QRectF(origin.x(), origin.y() + line.y(), x, line.height()))
+            line.draw(painter, origin)
+            painter.setClipping(False)
+            break
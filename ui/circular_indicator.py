@@ -1,42 +1,154 @@
-from PySide6.QtCore import Qt, QTimer, QRectF, QPointF
-from PySide6.QtGui import QColor, QPainter, QRadialGradient, QPainterPath
+from PySide6.QtCore import Qt, QTimer, QRectF, QPointF, QEvent
+from PySide6.QtGui import QColor, QPainter, QRadialGradient, QPainterPath, QPixmap
 from PySide6.QtWidgets import QWidget
 import math
+import time
+
+# Assistant states the animation follows
+STATE_IDLE = "idle"
+STATE_LISTENING = "listening"
+STATE_SPEAKING = "speaking"
 
 
 class CircularIndicator(QWidget):
+    """
+    Breathing orb. Each animation phase is drawn with gradients once, cached
+    as a pixmap and blitted on later ticks; the cache is dropped on resize.
+
+    The frame rate follows the assistant state: slow breathing while idle,
+    live mic / voice level while listening or speaking, and no timer at all
+    while the window is minimized, hidden or covered.
+    """
+
+    # Phases per 360° cycle kept in the frame cache (a 220 px frame is ~190 KB)
+    FRAME_COUNT = 72
+    FRAME_RATES = {STATE_IDLE: 10, STATE_LISTENING: 30, STATE_SPEAKING: 30}
+    IDLE_SPEED = 60.0  # degrees of breathing phase per second
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.phase = 0.0
         self.active = True
+        self.shown = False  # on screen: visible, not minimized, not covered
+        self.state = STATE_IDLE
+        self.state_source = None  # callable() -> state, polled every tick
+        self.level_sources = {}  # state -> callable() -> level (0..1) driving the pulse
+        self._level = 0.0
+        self._last_tick = time.monotonic()
+        self._painted_index = None
+        self._watched_window = None
+        self._frames = {}  # frame index -> QPixmap
+        self._frames_key = None  # (size, device pixel ratio) the cache was rendered for
 
         # Make the orb smaller and translucent background
         self.setAttribute(Qt.WA_TranslucentBackground)
         self.setFixedSize(220, 220)  # reduced from 260
 
-        # 60 FPS animation timer
+        # Animation timer, started once the widget is on screen
         self.timer = QTimer(self)
         self.timer.timeout.connect(self.update_indicator)
-        self.timer.start(16)
 
     def update_indicator(self):
-        if self.active:
-            self.phase = (self.phase + 2.5) % 360.0
+        now = time.monotonic()
+        elapsed, self._last_tick = now - self._last_tick, now
+        if self.state_source is not None:
+            state = self.state_source()
+            if state != self.state:
+                self.state = state
+                self._reschedule()
+
+        level_source = self.level_sources.get(self.state)
+        if level_source is None:
+            self.phase = (self.phase + self.IDLE_SPEED * elapsed) % 360.0
+        else:
+            level = min(1.0, max(0.0, level_source()))
+            # Jump up, decay slowly, like a VU meter
+            self._level = level if level > self._level else 0.7 * self._level + 0.3 * level
+            # The cached frames already span every pulse size: use the phase whose pulse matches
+            self.phase = math.degrees(math.asin(2.0 * self._level - 1.0)) % 360.0
+
+        # Repaint only when a different cached frame would be shown
+        if self.frame_index(self.phase) != self._painted_index:
             self.update()
 
     def set_active(self, active: bool):
         self.active = active
-        if active:
-            self.timer.start(16)
+        self._reschedule()
+        if not active:
+            self.update()
+
+    def set_shown(self, shown: bool):
+        if shown != self.shown:
+            self.shown = shown
+            self._reschedule()
+
+    def _reschedule(self):
+        if self.active and self.shown:
+            if not self.timer.isActive():
+                self._last_tick = time.monotonic()
+            self.timer.start(1000 // self.FRAME_RATES[self.state])
         else:
             self.timer.stop()
-            self.update()
+
+    def _check_shown(self):
+        window = self._watched_window
+        self.set_shown(self.isVisible() and window is not None and window.isExposed()
+                       and not window.windowStates() & Qt.WindowMinimized)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        window = self.window().windowHandle()
+        if window is not None and window is not self._watched_window:
+            # Expose events tell when the window is covered or uncovered
+            self._watched_window = window
+            window.installEventFilter(self)
+            window.windowStateChanged.connect(lambda state: self._check_shown())
+        self._check_shown()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.set_shown(False)
+
+    def eventFilter(self, obj, event):
+        if obj is self._watched_window and event.type() == QEvent.Expose:
+            QTimer.singleShot(0, self._check_shown)
+        return False
+
+    def resizeEvent(self, event):
+        self._frames.clear()
+        super().resizeEvent(event)
+
+    def frame_index(self, phase: float) -> int:
+        return int(phase / 360.0 * self.FRAME_COUNT) % self.FRAME_COUNT
+
+    def frame(self, phase: float) -> QPixmap:
+        """Cached pixmap of the orb at this phase, rendered on first use"""
+        ratio = self.devicePixelRatioF()
+        key = (self.size(), ratio)
+        if key != self._frames_key:
+            self._frames.clear()
+            self._frames_key = key
+        index = self.frame_index(phase)
+        pixmap = self._frames.get(index)
+        if pixmap is None:
+            pixmap = QPixmap(self.size() * ratio)
+            pixmap.setDevicePixelRatio(ratio)
+            pixmap.fill(Qt.transparent)
+            painter = QPainter(pixmap)
+            self.draw_orb(painter, QRectF(self.rect()), index * 360.0 / self.FRAME_COUNT)
+            painter.end()
+            self._frames[index] = pixmap
+        return pixmap
 
     def paintEvent(self, event):
         painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
+        painter.drawPixmap(0, 0, self.frame(self.phase))
+        self._painted_index = self.frame_index(self.phase)
 
-        rectf = QRectF(self.rect())
+    @staticmethod
+    def draw_orb(painter: QPainter, rectf: QRectF, phase: float):
+        """Draw the orb with gradients (used to fill the frame cache)"""
+        painter.setRenderHint(QPainter.Antialiasing)
 
         # Smooth circle clipping (no hard square edges)
         clip_path = QPainterPath()
@@ -44,7 +156,7 @@ class CircularIndicator(QWidget):
         painter.setClipPath(clip_path)
 
         # Breathing animation phase (0..1)
-        pulse = (math.sin(math.radians(self.phase)) + 1.0) / 2.0
+        pulse = (math.sin(math.radians(phase)) + 1.0) / 2.0
 
         # Radius and pulse scaling
         base_radius = min(rectf.width(), rectf.height()) * 0.38
@@ -80,7 +192,7 @@ class CircularIndicator(QWidget):
 
         # 🌙 Soft inner moving sheen for realism
         sheen_radius = radius * 0.8
-        sheen_angle = math.radians(self.phase * 0.8)
+        sheen_angle = math.radians(phase * 0.8)
         sx = center.x() + math.cos(sheen_angle) * (radius * 0.1)
         sy = center.y() + math.sin(sheen_angle) * (radius * 0.1)
         sheen_grad = QRadialGradient(QPointF(sx, sy), sheen_radius)
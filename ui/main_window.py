@@ -1,14 +1,29 @@
 from PySide6.QtCore import Qt, QTimer, QPoint, QThread, Signal
 from PySide6.QtGui import QColor, QPainter
 from PySide6.QtWidgets import QWidget, QLabel, QPushButton, QVBoxLayout, QHBoxLayout, QLineEdit
-from ui.circular_indicator import CircularIndicator
+from ui.caption_label import CaptionLabel
+from ui.circular_indicator import CircularIndicator, STATE_IDLE, STATE_LISTENING, STATE_SPEAKING
 
-# Fixed imports - use core. prefix since files are in core folder
-from core.voice_response import speak, set_caption_callback, stop as stop_speaking, is_speaking
-from core.voice_recognition import listen_command
-from core.brain import process_command
+# Light modules only; voice, recognition and the Gemini SDK load in the background
+from core.services import services, STARTUP_ORDER
+from core.keyword_spotter import command_keyword, KIND_STOP, APP_COMMAND_WORDS
+from core.replies import SMRITI_IDENTITY, STOPPED_REPLY, FALLBACK_REPLY, GLITCH_REPLY
+from core.command_pipeline import submit_command, cancel_commands, pipeline_stats
+from core.speculation import propose_speculation, cancel_speculation, speculation_stats
+from core.local_skills import skill_stats
+from core.tracing import begin_trace, log, trace_summary
 import time
 
+voice = services.proxy("voice")
+recognition = services.proxy("recognition")
+gemini = services.proxy("gemini")
+
+WELCOME_TEXT = "Hello Sumit! Smriti system is now activated!"
+ERROR_TEXT = "Sorry, I encountered an error. Please try again."
+
+# Phrases spoken verbatim again and again - keep their audio ready
+PREWARM_PHRASES = [WELCOME_TEXT, STOPPED_REPLY, FALLBACK_REPLY, ERROR_TEXT, GLITCH_REPLY, SMRITI_IDENTITY]
+
 
 class TitleBar(QWidget):
     def __init__(self, parent=None):
@@ -135,10 +150,30 @@ class TitleBar(QWidget):
 
 
 class SmritiListener(QThread):
+    shutdownRequested = Signal()
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self._is_running = True
         self._mic_active = False  # Mic is off by default
+        self._spotter = None
+        self._echo_canceller = None
+        self._audio_helpers_started = False
+        if parent is not None:
+            self.shutdownRequested.connect(parent.close)
+
+    def _on_keyword(self, kind, phrase):
+        """Fast path from the keyword spotter (runs on the capture thread)"""
+        print(f"⚡ Keyword spotted during speech: {phrase}")
+        cancel_speculation()
+        cancel_commands()
+        voice.stop()
+        if kind == KIND_STOP:
+            if hasattr(self.parent(), "captionSignal"):
+                self.parent().captionSignal.emit(STOPPED_REPLY)
+        elif phrase not in APP_COMMAND_WORDS:
+            self.shutdownRequested.emit()
+        # "close"/"exit" may go on with an app name: the full transcript decides
 
     def run(self):
         while self._is_running:
@@ -147,16 +182,26 @@ class SmritiListener(QThread):
                 if not self._mic_active:
                     time.sleep(0.5)
                     continue
+
+                if not self._audio_helpers_started:
+                    self._audio_helpers_started = True
+                    # Remove Smriti's own voice from the mic before anything listens to it
+                    self._echo_canceller = recognition.start_echo_canceller(voice.add_playback_listener)
+                    # Local keyword spotting runs only while Smriti is talking
+                    self._spotter = recognition.start_keyword_spotter(self._on_keyword, is_active=voice.is_speaking)
+                    # Start Gemini on a stable partial transcript while the user is still talking
+                    recognition.start_partial_transcriber(propose_speculation, is_active=lambda: not voice.is_speaking())
                 
                 # If TTS is currently speaking, listen briefly for ANY user speech; if heard, stop and process it immediately
                 command = None
-                if is_speaking():
-                    print("🔇 Smriti is speaking... listening for your voice to interrupt")
+                trace = begin_trace("voice")
+                if voice.is_speaking():
+                    log("🔇 Smriti is speaking... listening for your voice to interrupt")
                     try:
-                        interrupt = listen_command(timeout=1, phrase_time_limit=3)
+                        interrupt = recognition.listen_command(timeout=1, phrase_time_limit=3, trace=trace)
                         if interrupt and interrupt.strip():
-                            print(f"🛑 User spoke during TTS: {interrupt}")
-                            stop_speaking()
+                            log(f"🛑 User spoke during TTS: {interrupt}")
+                            voice.stop()
                             command = interrupt
                         else:
                             time.sleep(0.2)
@@ -166,72 +211,57 @@ class SmritiListener(QThread):
                         continue
                     
                 if command is None:
-                    print("🎤 Listening for command... (quick mode)")
-                    command = listen_command(timeout=4, phrase_time_limit=4)
+                    log("🎤 Listening for command... (quick mode)")
+                    command = recognition.listen_command(timeout=4, phrase_time_limit=4, trace=trace)
                 
                 if command and command.strip():
-                    print(f"🎯 Command received: {command}")
+                    log(f"🎯 Command received: {command}")
                     
+                    # "close notepad" / "close spotify" are app commands for the brain, not a shutdown
+                    keyword = command_keyword(command)
+
                     # Check if user wants to stop current speech
-                    stop_keywords = ["stop", "ruko", "chup", "mute", "bas", "shut up", "wait", "wait stop"]
-                    if any(k in command.lower() for k in stop_keywords):
-                        print("🛑 User requested to stop speaking")
-                        stop_speaking()
+                    if keyword and keyword[0] == KIND_STOP:
+                        log("🛑 User requested to stop speaking")
+                        cancel_speculation()
+                        cancel_commands()
+                        voice.stop()
                         if hasattr(self.parent(), "captionSignal"):
-                            self.parent().captionSignal.emit("Okay, I stopped speaking.")
+                            self.parent().captionSignal.emit(STOPPED_REPLY)
                         # Don't continue, wait for next command
                         time.sleep(1)
                         continue
 
                     # Immediate SHUTDOWN handling
-                    shutdown_keywords = [
-                        "shutdown", "shut down", "exit", "close", "band hojao", 
-                        "band ho jao", "band ho", "band karo", "goodbye", "bye"
-                    ]
-                    if any(k in command.lower() for k in shutdown_keywords):
-                        print("🔌 User requested shutdown")
-                        stop_speaking()
-                        QTimer.singleShot(0, self.parent().close)
+                    if keyword:
+                        log("🔌 User requested shutdown")
+                        voice.stop()
+                        self.shutdownRequested.emit()
                         continue
 
                     # Process command and SPEAK the response
                     try:
-                        print("🧠 Processing command with brain...")
+                        log("🧠 Processing command with brain...")
                         
                         # Show "Thinking..." message
                         if hasattr(self.parent(), "captionSignal"):
                             self.parent().captionSignal.emit("💭 Thinking...")
                         
-                        response = process_command(command, speak_out=False)
-                        
-                        if response and response.strip():
-                            print(f"💬 Response from Gemini: {response}")
-                            
-                            # Update UI caption
-                            if hasattr(self.parent(), "captionSignal"):
-                                self.parent().captionSignal.emit(response)
-                            
-                            # SPEAK THE RESPONSE
-                            print(f"🔊 Speaking response...")
-                            speak(response)
-                            
-                        else:
-                            fallback = "I'm here, Sumit. How can I help you?"
-                            if hasattr(self.parent(), "captionSignal"):
-                                self.parent().captionSignal.emit(fallback)
-                            print("🔊 Speaking fallback response")
-                            speak(fallback)
+                        # Route, generate and speak on the command pipeline; a newer
+                        # command supersedes this one (captions follow the speech)
+                        log(f"🔊 Streaming response...")
+                        submit_command(command, trace)
                             
                     except Exception as e:
                         print(f"❌ Error processing command: {e}")
-                        error_msg = "Sorry, I encountered an error. Please try again."
+                        error_msg = ERROR_TEXT
                         if hasattr(self.parent(), "captionSignal"):
                             self.parent().captionSignal.emit(error_msg)
-                        speak(error_msg)
+                        voice.speak(error_msg, voice.PRIORITY_URGENT)
                 
                 else:
                     # No command detected, continue listening
-                    print("🔁 No command detected, continuing to listen...")
+                    log("🔁 No command detected, continuing to listen...")
                     time.sleep(0.5)
                             
             except Exception as e:
@@ -241,6 +271,7 @@ class SmritiListener(QThread):
     def set_mic_active(self, active: bool):
         """Enable or disable microphone listening"""
         self._mic_active = active
+        recognition.set_listening(active)
         print(f"🎤 Microphone {'activated' if active else 'deactivated'}")
     
     def stop(self):
@@ -251,6 +282,9 @@ class SmritiListener(QThread):
 
 class SmritiWindow(QWidget):
     captionSignal = Signal(str)
+    spokenCaptionSignal = Signal(str, float)  # text, wall-clock time its audio was queued to play
+    startupSignal = Signal(str)
+    servicesReady = Signal(list)
     
     def __init__(self):
         super().__init__()
@@ -265,21 +299,10 @@ class SmritiWindow(QWidget):
         layout.addWidget(self.title_bar)
 
         self.indicator = CircularIndicator(self)
+        self.indicator.state_source = self.indicator_state
         layout.addWidget(self.indicator, alignment=Qt.AlignCenter)
 
-        self.caption_label = QLabel("", self)
-        self.caption_label.setAlignment(Qt.AlignCenter)
-        self.caption_label.setStyleSheet("""
-            color: white;
-            background: rgba(60, 0, 100, 130);
-            border-radius: 10px;
-            font-family: 'Segoe UI', sans-serif;
-            font-size: 14px;
-            font-weight: bold;
-            padding: 8px 20px;
-            margin-top: 10px;
-        """)
-        self.caption_label.setWordWrap(True)
+        self.caption_label = CaptionLabel("", self)
         layout.addWidget(self.caption_label, alignment=Qt.AlignCenter)
 
         # Text input field with glassmorphism
@@ -352,7 +375,9 @@ class SmritiWindow(QWidget):
 
         # Live caption hookup
         self.captionSignal.connect(self.on_caption)
-        set_caption_callback(lambda text: self.captionSignal.emit(text))
+        self.spokenCaptionSignal.connect(self.on_spoken_caption)
+        self.startupSignal.connect(self.caption_label.setText)
+        self.servicesReady.connect(self.on_services_ready)
 
         # Show loading message immediately
         self.caption_label.setText("Please Wait Smriti System Booting...")
@@ -360,60 +385,89 @@ class SmritiWindow(QWidget):
         # Defer heavy initialization until after window is shown
         self.listener = None
         self.mic_active = False
-        QTimer.singleShot(100, self.initialize_background_services)
+        self._pending_text = []  # typed before the brain finished loading
+        self._failed_services = []
+        QTimer.singleShot(0, self.initialize_background_services)
 
     def initialize_background_services(self):
-        """Initialize heavy services after window is shown for faster launch"""
+        """Import the heavy subsystems on a background thread so the window paints at once"""
+        print("🔧 Initializing background services...")
+        services.warm_up(
+            STARTUP_ORDER,
+            on_progress=lambda label, i, total: self.startupSignal.emit(f"⏳ Loading {label} ({i}/{total})..."),
+            on_done=lambda failed: self.servicesReady.emit(failed),
+        )
+
+    def on_services_ready(self, failed):
+        """Runs on the UI thread once every startup service has loaded (or failed)"""
+        self._failed_services = list(failed)
         try:
-            print("🔧 Initializing background services...")
-            # Start listener thread
-            self.listener = SmritiListener(self)
-            self.listener.start()
-            print("✅ Listener thread started")
-            
-            # Start welcome message - typing and speech simultaneously
-            QTimer.singleShot(500, self.start_welcome_message)
+            print(f"⏱️ Services loaded (ms): {services.stats()}")
+            if failed:
+                labels = ", ".join(services.label(name) for name in failed)
+                self.captionSignal.emit(f"⚠️ Couldn't start {labels}")
+
+            if "voice" not in failed:
+                voice.set_caption_callback(lambda text: self.spokenCaptionSignal.emit(text, time.time()))
+                voice.enable_meter()
+                self.caption_label.progress_source = voice.playback_progress
+                # Fill the voice cache with fixed phrases so they play without synthesis
+                voice.prewarm(PREWARM_PHRASES)
+
+            # The listener hears with recognition, answers through the brain and talks with voice
+            if not {"voice", "recognition", "brain"} & set(failed):
+                self.listener = SmritiListener(self)
+                self.listener.start()
+                if self.mic_active:
+                    self.listener.set_mic_active(True)
+                print("✅ Listener thread started")
+
+            if self._pending_text:
+                # A newer command supersedes older ones anyway: only the last one typed is answered
+                text, self._pending_text = self._pending_text[-1], []
+                if "brain" not in failed:  # otherwise the caption already says why
+                    submit_command(text, begin_trace("text"))
+            elif not failed:
+                # Start welcome message - typing and speech simultaneously
+                self.start_welcome_message()
+
+            # Let the orb pulse with the live voice and mic levels
+            levels = {}
+            if "voice" not in failed:
+                levels[STATE_SPEAKING] = voice.speech_level
+            if "recognition" not in failed:
+                levels[STATE_LISTENING] = recognition.mic_level
+            self.indicator.level_sources = levels
         except Exception as e:
             print(f"❌ Error initializing background services: {e}")
     
+    def indicator_state(self):
+        """What the orb animation should show right now (polled on every frame)"""
+        if services.is_ready("voice") and voice.is_speaking():
+            return STATE_SPEAKING
+        if self.mic_active and self.listener:
+            return STATE_LISTENING
+        return STATE_IDLE
+
     def start_welcome_message(self):
         """Start welcome message with simultaneous typing and speech"""
         try:
             print("🔊 Starting welcome message...")
-            welcome_text = "Hello Sumit! Smriti system is now activated!"
+            welcome_text = WELCOME_TEXT
             
             # Start speaking - this will trigger caption callback which starts typing automatically
             # Both will happen simultaneously
-            speak(welcome_text)
+            voice.speak(welcome_text)
             print("✅ Welcome message started (typing + speech simultaneously)")
         except Exception as e:
             print(f"❌ Welcome message error: {e}")
 
-    def start_typing_animation(self, text):
-        self.full_text = text
-        self.caption_label.setText("")
-        self.current_index = 0
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_text)
-        self.typing_interval = 28
-        self.timer.start(self.typing_interval)
-
-    def update_text(self):
-        if self.current_index < len(self.full_text):
-            ch = self.full_text[self.current_index]
-            self.caption_label.setText(self.caption_label.text() + ch)
-            self.current_index += 1
-            if ch in ".!?":
-                self.timer.setInterval(120)
-            elif ch in ",;":
-                self.timer.setInterval(80)
-            else:
-                self.timer.setInterval(self.typing_interval)
-        else:
-            self.timer.stop()
-
     def on_caption(self, text: str):
-        self.start_typing_animation(text)
+        self.caption_label.show_caption(text)
+
+    def on_spoken_caption(self, text: str, shown_at: float):
+        # Typed out in step with the audio
+        self.caption_label.show_caption(text, paced=True, shown_at=shown_at)
 
     def resizeEvent(self, event):
         inner_width = max(200, self.width() - 32)
@@ -431,6 +485,16 @@ class SmritiWindow(QWidget):
         """Properly clean up threads when closing the window"""
         if hasattr(self, 'listener') and self.listener:
             self.listener.stop()
+        # Only report on subsystems that were actually loaded
+        if services.is_ready("voice"):
+            print(f"📊 Voice cache: {voice.audio_cache_stats()}")
+        if services.is_ready("gemini"):
+            print(f"📊 Response cache: {gemini.cache_stats()}")
+            print(f"📊 Gemini API: {gemini.api_stats()}")
+        print(f"📊 Local skills: {skill_stats()}")
+        print(f"📊 Command pipeline: {pipeline_stats()}")
+        print(f"📊 Speculation: {speculation_stats()}")
+        print(f"📊 Latency (p50/p95): {trace_summary()}")
         super().closeEvent(event)
     
     def toggle_mic(self):
@@ -493,37 +557,28 @@ class SmritiWindow(QWidget):
         # Show user's command instantly (no typing animation)
         self.caption_label.setText(f"You: {text}")
         
-        # Process command in a separate thread to avoid blocking UI
-        def process_in_thread():
-            try:
-                print(f"📝 Processing text command: {text}")
-                
-                # Show thinking message with typing animation
-                self.captionSignal.emit("💭 Thinking...")
-                
-                # Process command
-                response = process_command(text, speak_out=False)
-                
-                if response and response.strip():
-                    print(f"💬 Response: {response}")
-                    # Update UI with response
-                    self.captionSignal.emit(response)
-                    # Speak the response
-                    speak(response)
-                else:
-                    fallback = "I'm here, Sumit. How can I help you?"
-                    self.captionSignal.emit(fallback)
-                    speak(fallback)
-            except Exception as e:
-                print(f"❌ Error processing text command: {e}")
-                error_msg = "Sorry, I encountered an error. Please try again."
-                self.captionSignal.emit(error_msg)
-                speak(error_msg)
-        
-        # Run in thread to avoid blocking
-        import threading
-        thread = threading.Thread(target=process_in_thread, daemon=True)
-        thread.start()
+        try:
+            print(f"📝 Processing text command: {text}")
+
+            # Show thinking message with typing animation
+            self.captionSignal.emit("💭 Thinking...")
+
+            if "brain" in self._failed_services:
+                self.captionSignal.emit(ERROR_TEXT)
+                return
+
+            # Still starting up: answer as soon as the brain has loaded
+            if not services.is_ready("brain"):
+                self._pending_text.append(text)
+                return
+
+            # Non-blocking: the pipeline cancels older replies still in flight
+            submit_command(text, begin_trace("text"))
+        except Exception as e:
+            print(f"❌ Error processing text command: {e}")
+            error_msg = ERROR_TEXT
+            self.captionSignal.emit(error_msg)
+            voice.speak(error_msg, voice.PRIORITY_URGENT)
     
     def showEvent(self, event):
         """Ensure window is focused when shown"""